@@ -0,0 +1,33 @@
+"""Add retention timestamp indexes
+
+Revision ID: b41f7e2d9c10
+Revises: cc8ac8cce839
+Create Date: 2026-10-19 18:12:05.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41f7e2d9c10'
+down_revision: Union[str, Sequence[str], None] = 'cc8ac8cce839'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Retention jobs walk these columns in (timestamp, id) order; InnoDB appends the PK to secondary indexes
+    op.create_index('ix_move_requests_created_at', 'move_requests', ['created_at'])
+    op.create_index('ix_chat_messages_created_at', 'chat_messages', ['created_at'])
+    op.create_index('ix_notification_outbox_created_at', 'notification_outbox', ['created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notification_outbox_created_at', table_name='notification_outbox')
+    op.drop_index('ix_chat_messages_created_at', table_name='chat_messages')
+    op.drop_index('ix_move_requests_created_at', table_name='move_requests')
@@ -0,0 +1,29 @@
+"""Add move request history keyset index
+
+Revision ID: cc8ac8cce839
+Revises: 92ff59c6a9e4
+Create Date: 2026-10-19 10:03:47.118254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cc8ac8cce839'
+down_revision: Union[str, Sequence[str], None] = '92ff59c6a9e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite index for keyset pagination of history (target_user_id, created_at DESC, id DESC)
+    op.create_index('ix_move_requests_target_user_history', 'move_requests', ['target_user_id', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_move_requests_target_user_history', table_name='move_requests')
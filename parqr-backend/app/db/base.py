@@ -1,12 +1,71 @@
-from sqlalchemy.orm import declarative_base
-from app.db.session import SessionLocal
+from fastapi import Depends, Request, Response
+from sqlalchemy.orm import Session, declarative_base
+from app.db.session import SessionLocal, read_your_writes
+from app.tracing import span
 
 Base = declarative_base()
 
-# Dependency for FastAPI routes
-def get_db():
+# Methods whose sessions may be served by the read replica
+READ_ONLY_METHODS = {"GET", "HEAD"}
+
+# Scope key set by /api/batch on its sub-requests (app/services/batch_service.py)
+BATCH_SCOPE_KEY = "parqr.batch"
+
+def open_request_session(request: Request, response: Response, method: str) -> Session:
+    """Session for one request: replica reads unless the client just wrote, RYW cookie on write"""
+    client_key = request.headers.get("x-user-code")
+    read_only = (
+        method in READ_ONLY_METHODS
+        and not read_your_writes.is_recent(client_key, request.cookies.get(read_your_writes.COOKIE_NAME))
+    )
+
     db = SessionLocal()
+    db.info["read_only"] = read_only
+
+    def on_write():
+        # Pin this client's follow-up reads to the primary until the replica catches up
+        until = read_your_writes.mark(client_key)
+        response.set_cookie(
+            read_your_writes.COOKIE_NAME,
+            f"{until:.3f}",
+            max_age=int(read_your_writes.window_seconds) + 1,
+            httponly=True
+        )
+    db.info["on_write"] = on_write
+    return db
+
+async def batch_session_turn(request: Request):
+    """
+    Take the shared session's lock for a batch sub-request until its endpoint returns.
+
+    A Session is not thread-safe, so sub-requests of one batch take turns on it.
+    The lock is awaited on the event loop rather than inside get_db, so waiting
+    sub-requests never hold threadpool workers the lock holder may need.
+    """
+    batch = request.scope.get(BATCH_SCOPE_KEY)
+    if batch is None:
+        yield
+        return
+    async with batch.session_lock:
+        yield
+
+# Dependency for FastAPI routes
+def get_db(request: Request, response: Response, _turn: None = Depends(batch_session_turn)):
+    batch = request.scope.get(BATCH_SCOPE_KEY)
+    if batch is not None:
+        # Owned by /api/batch, which closes it after the last sub-request
+        try:
+            yield batch.db
+        except Exception:
+            # Keep the shared session usable for the remaining sub-requests
+            batch.db.rollback()
+            raise
+        return
+
+    # Only the setup is timed; the session stays open until the response is sent
+    with span("dep.get_db"):
+        db = open_request_session(request, response, request.method)
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -0,0 +1,37 @@
+"""
+Named locks that keep a background job to one instance at a time.
+
+On MySQL the lock is GET_LOCK/RELEASE_LOCK, held by a dedicated session for
+as long as the job runs (the lock belongs to that session's connection).
+Other dialects (SQLite in development) run a single process, so the lock is
+always granted.
+"""
+
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+@contextmanager
+def named_lock(session_factory: Callable[[], Session], name: str) -> Iterator[bool]:
+    """
+    Try to take the named lock without waiting.
+
+    Yields:
+        True if this instance holds the lock, False if another one does
+    """
+    db = session_factory()
+    try:
+        connection = db.connection()
+        if connection.dialect.name != "mysql":
+            yield True
+            return
+        acquired = connection.execute(text("SELECT GET_LOCK(:name, 0)"), {"name": name}).scalar() == 1
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": name})
+    finally:
+        db.close()
@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from typing import Optional
+import logging
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Pool presets per deployment profile (DB_POOL_PROFILE); individual DB_POOL_* env vars override them.
+# Cloud Run: small per-instance pools (many instances share one MySQL), recycle below the
+# managed MySQL/proxy idle timeout and pre-ping so connections dropped while idle are replaced.
+POOL_PROFILES = {
+    "development": {"pool_size": 5, "max_overflow": 5, "pool_timeout": 30, "pool_recycle": 3600, "pool_pre_ping": True},
+    "cloud_run": {"pool_size": 5, "max_overflow": 10, "pool_timeout": 10, "pool_recycle": 1800, "pool_pre_ping": True},
+    "batch": {"pool_size": 2, "max_overflow": 0, "pool_timeout": 60, "pool_recycle": 3600, "pool_pre_ping": True},
+}
+
+def get_pool_settings(profile: Optional[str] = None) -> dict:
+    """
+    Resolve engine pool kwargs from DB_POOL_PROFILE and DB_POOL_* overrides.
+
+    Env variables:
+        DB_POOL_PROFILE: development | cloud_run | batch (default: development)
+        DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+    """
+    profile = (profile or os.getenv("DB_POOL_PROFILE", "development")).lower()
+    if profile not in POOL_PROFILES:
+        raise ValueError(f"Unknown DB_POOL_PROFILE: {profile}")
+    settings = dict(POOL_PROFILES[profile])
+
+    overrides = {
+        "pool_size": ("DB_POOL_SIZE", int),
+        "max_overflow": ("DB_MAX_OVERFLOW", int),
+        "pool_timeout": ("DB_POOL_TIMEOUT", float),
+        "pool_recycle": ("DB_POOL_RECYCLE", int),
+        "pool_pre_ping": ("DB_POOL_PRE_PING", lambda v: v.lower() == "true"),
+    }
+    for key, (env_name, cast) in overrides.items():
+        value = os.getenv(env_name)
+        if value is not None:
+            settings[key] = cast(value)
+    return settings
+
+class PoolMetrics:
+    """Thread-safe counters for connection checkout waits"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts_total": self.checkouts,
+                "checkout_timeouts_total": self.timeouts,
+                "wait_ms_avg": round(self.wait_seconds_total / attempts * 1000, 3) if attempts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3)
+            }
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection"""
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            logger.warning("Connection pool exhausted: %s", self.status())
+            raise
+        self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # Keep metrics across pool recreation (e.g. after engine.dispose())
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+def get_pool_stats(pool) -> dict:
+    """Live pool gauges plus checkout wait metrics for the readiness endpoint"""
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow
+        })
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(pool.metrics.snapshot())
+    return stats
+
+def warm_pool(engine, connections: int) -> threading.Thread:
+    """
+    Open up to `connections` pooled connections in a background thread.
+
+    Runs off the startup path so a cold instance can accept traffic immediately;
+    the first requests then find established connections in the pool instead of
+    paying TCP/TLS/auth setup. Failures are logged and otherwise ignored.
+    """
+    def run():
+        started = time.perf_counter()
+        opened = []
+        try:
+            for _ in range(connections):
+                opened.append(engine.connect())
+        except Exception as e:
+            logger.warning(f"Connection pool warm-up stopped after {len(opened)} connections: {str(e)}")
+        finally:
+            for connection in opened:
+                connection.close()
+        logger.info("Warmed %d pooled connections in %.1f ms", len(opened), (time.perf_counter() - started) * 1000)
+
+    thread = threading.Thread(target=run, name="db-pool-warmup", daemon=True)
+    thread.start()
+    return thread
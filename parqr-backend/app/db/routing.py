@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+import logging
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Delete, Insert, Update
+
+logger = logging.getLogger(__name__)
+
+class ReplicaLagMonitor:
+    """
+    Cached replica lag check used to fall back to the primary when the replica is behind.
+
+    probe returns the replica lag in seconds, or None if unknown. The result is cached for
+    check_interval seconds so the probe never runs on every request.
+    """
+
+    def __init__(
+        self,
+        probe: Optional[Callable[[], Optional[float]]] = None,
+        max_lag_seconds: Optional[float] = None,
+        check_interval: Optional[float] = None
+    ):
+        self.probe = probe
+        self.max_lag_seconds = max_lag_seconds if max_lag_seconds is not None else float(os.getenv("DB_REPLICA_MAX_LAG", "2.0"))
+        self.check_interval = check_interval if check_interval is not None else float(os.getenv("DB_REPLICA_LAG_CHECK_INTERVAL", "5.0"))
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._healthy = True
+        self.last_lag_seconds: Optional[float] = None
+
+    def replica_usable(self) -> bool:
+        if self.probe is None:
+            return True
+
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._healthy
+
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return self._healthy
+            try:
+                lag = self.probe()
+                self.last_lag_seconds = lag
+                # Unknown lag (replication stopped / not configured) counts as unusable
+                self._healthy = lag is not None and lag <= self.max_lag_seconds
+            except Exception as e:
+                logger.warning(f"Replica lag probe failed, routing reads to primary: {str(e)}")
+                self._healthy = False
+            self._checked_at = now
+            if not self._healthy:
+                logger.info("Replica lag %s exceeds %ss; reads fall back to primary", self.last_lag_seconds, self.max_lag_seconds)
+            return self._healthy
+
+def mysql_replica_lag_probe(replica_engine: Engine) -> Callable[[], Optional[float]]:
+    """Lag probe reading Seconds_Behind_Source from SHOW REPLICA STATUS (MySQL 8.0.22+)"""
+    def probe() -> Optional[float]:
+        with replica_engine.connect() as connection:
+            row = connection.execute(text("SHOW REPLICA STATUS")).mappings().first()
+        if row is None:
+            return None
+        lag = row.get("Seconds_Behind_Source")
+        return float(lag) if lag is not None else None
+    return probe
+
+class ReadYourWritesTracker:
+    """
+    Remembers clients that wrote recently so their follow-up reads go to the primary.
+
+    Clients are identified by the X-User-Code header; anonymous clients get a
+    short-lived cookie instead. Both expire after window_seconds, which should
+    exceed typical replication lag.
+    """
+
+    COOKIE_NAME = "parqr_primary_until"
+
+    def __init__(self, window_seconds: Optional[float] = None):
+        self.window_seconds = window_seconds if window_seconds is not None else float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5.0"))
+        self._lock = threading.Lock()
+        self._recent: Dict[str, float] = {}
+
+    def mark(self, client_key: Optional[str]) -> float:
+        until = time.time() + self.window_seconds
+        if client_key:
+            with self._lock:
+                self._recent[client_key] = until
+                # Opportunistic cleanup keeps the map bounded by active writers
+                if len(self._recent) > 10000:
+                    now = time.time()
+                    self._recent = {k: v for k, v in self._recent.items() if v > now}
+        return until
+
+    def is_recent(self, client_key: Optional[str], cookie_value: Optional[str] = None) -> bool:
+        now = time.time()
+        if cookie_value:
+            try:
+                if float(cookie_value) > now:
+                    return True
+            except ValueError:
+                pass
+        if client_key:
+            with self._lock:
+                until = self._recent.get(client_key)
+            return until is not None and until > now
+        return False
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to a replica and everything else to the primary.
+
+    A session only uses the replica when it was opened with info['read_only'] = True
+    and the lag monitor reports the replica usable. Any flush switches the session to
+    the primary for the rest of its life so it reads its own writes.
+    """
+
+    def __init__(self, *args, replica_bind: Optional[Engine] = None, lag_monitor: Optional[ReplicaLagMonitor] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica_bind = replica_bind
+        self.lag_monitor = lag_monitor or ReplicaLagMonitor()
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if (
+            self.replica_bind is None
+            or not self.info.get("read_only", False)
+            or self._flushing
+            or isinstance(clause, (Insert, Update, Delete))
+        ):
+            return primary
+        if not self.lag_monitor.replica_usable():
+            return primary
+        return self.replica_bind
+
+    @property
+    def routed_to_replica(self) -> bool:
+        return self.replica_bind is not None and self.info.get("read_only", False)
+
+@event.listens_for(RoutingSession, "after_flush")
+def _switch_to_primary_after_write(session: RoutingSession, flush_context) -> None:
+    session.info["read_only"] = False
+    on_write = session.info.pop("on_write", None)
+    if on_write is not None:
+        on_write()
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _route_bulk_writes_to_primary(orm_execute_state) -> None:
+    # Query.update()/delete() bypass flush; treat them as writes too
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        session = orm_execute_state.session
+        session.info["read_only"] = False
+        on_write = session.info.pop("on_write", None)
+        if on_write is not None:
+            on_write()
@@ -1,24 +1,98 @@
+import os
+import threading
+from typing import Optional
+import logging
+
+from dotenv import load_dotenv, find_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv, find_dotenv
-import os
 
-dotenv_path = find_dotenv()
-print("📄 .env path resolved to:", dotenv_path)
-load_dotenv(dotenv_path, override= True)
+from app.db.pool import InstrumentedQueuePool, get_pool_settings
+from app.db.routing import RoutingSession, ReplicaLagMonitor, ReadYourWritesTracker, mysql_replica_lag_probe
 
-load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Single .env load for the whole process; everything imported after this module sees it
+load_dotenv(find_dotenv(), override=True)
 
 DB_USER=os.getenv("DB_USER")
 DB_PASSWORD=os.getenv("DB_PASSWORD")
 DB_NAME=os.getenv("DB_NAME")
 DB_HOST=os.getenv("DB_HOST")
 DB_PORT=os.getenv("DB_PORT")
-print(f"Sanity Check: {DB_USER=:}")
 
-DATABASE_URL=f"mysql+mysqldb://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# DB_* parts take precedence; DATABASE_URL (as used by alembic) is the fallback, e.g. sqlite for local runs
+if DB_HOST or not os.getenv("DATABASE_URL"):
+    DATABASE_URL=f"mysql+mysqldb://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+else:
+    DATABASE_URL=os.getenv("DATABASE_URL")
+
+# Optional read replica for GET traffic
+DB_REPLICA_HOST=os.getenv("DB_REPLICA_HOST")
+if DB_REPLICA_HOST:
+    DATABASE_REPLICA_URL=f"mysql+mysqldb://{DB_USER}:{DB_PASSWORD}@{DB_REPLICA_HOST}:{os.getenv('DB_REPLICA_PORT', DB_PORT)}/{DB_NAME}"
+else:
+    DATABASE_REPLICA_URL=os.getenv("DATABASE_REPLICA_URL")
+
+replica_lag_monitor = ReplicaLagMonitor()
+read_your_writes = ReadYourWritesTracker()
+
+# Engines are created on first use so importing the app (cold start) does no DB driver setup
+_engine_lock = threading.Lock()
+_engine: Optional[Engine] = None
+_replica_engine: Optional[Engine] = None
+
+def _create_engines() -> None:
+    global _engine, _replica_engine
+    pool_settings = get_pool_settings()
+    engine = create_engine(DATABASE_URL, poolclass=InstrumentedQueuePool, **pool_settings)
+    logger.info("Database engine created for %s with pool settings %s", make_url(DATABASE_URL).render_as_string(hide_password=True), pool_settings)
+
+    replica_engine = None
+    if DATABASE_REPLICA_URL:
+        replica_engine = create_engine(DATABASE_REPLICA_URL, poolclass=InstrumentedQueuePool, **pool_settings)
+        if os.getenv("DB_REPLICA_LAG_PROBE", "none").lower() == "mysql":
+            replica_lag_monitor.probe = mysql_replica_lag_probe(replica_engine)
+        logger.info("Read replica enabled: %s", make_url(DATABASE_REPLICA_URL).render_as_string(hide_password=True))
+
+    _replica_engine = replica_engine
+    _engine = engine
+
+def get_engine() -> Engine:
+    """Primary engine, created on first call"""
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _create_engines()
+    return _engine
+
+def get_replica_engine() -> Optional[Engine]:
+    """Read replica engine, or None when no replica is configured"""
+    get_engine()
+    return _replica_engine
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker that binds to the engines the first time a session is opened"""
+
+    _bound = False
+
+    def __call__(self, **local_kw):
+        if not self._bound:
+            self.configure(bind=get_engine(), replica_bind=get_replica_engine(), lag_monitor=replica_lag_monitor)
+            self._bound = True
+        return super().__call__(**local_kw)
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = _LazySessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False
+)
 
-print("✅ Using DATABASE_URL:", DATABASE_URL)
\ No newline at end of file
+def __getattr__(name: str):
+    # Backwards compatible `from app.db.session import engine` (scripts); creates the engine on access
+    if name == "engine":
+        return get_engine()
+    if name == "replica_engine":
+        return get_replica_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import DateTime
+from sqlalchemy.types import TypeDecorator
+
+class UTCDateTime(TypeDecorator):
+    """
+    DATETIME column that always holds UTC and always returns aware datetimes.
+
+    MySQL DATETIME has no time zone, so aware values are converted to UTC and
+    stored naive; naive values are assumed to already be UTC. Values read back
+    get tzinfo=UTC attached in the result processor, so routes no longer patch
+    tzinfo on every row before serializing.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[datetime], dialect) -> Optional[datetime]:
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value: Optional[datetime], dialect) -> Optional[datetime]:
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
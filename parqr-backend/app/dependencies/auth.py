@@ -1,28 +1,47 @@
-from fastapi import Depends, HTTPException, Header
+from fastapi import Depends, HTTPException, Header, Request
 from sqlalchemy.orm import Session
-from app.db.base import get_db
+from app.db.base import BATCH_SCOPE_KEY, get_db
 from app.models.user import User
 from app.models.car import Car
+from app.tracing import span
+import hmac
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
 def get_current_user(
+    request: Request,
     db: Session = Depends(get_db),
     x_user_code: str = Header(..., description="User code for authentication")
 ) -> User:
-    logger.info(f"Authenticating user with code: {x_user_code}")
+    batch = request.scope.get(BATCH_SCOPE_KEY)
+    if batch is not None and batch.user is not None and batch.user.user_code == x_user_code:
+        # /api/batch already resolved this user once on the shared session
+        return batch.user
+
+    logger.info("Authenticating user with code: %s", x_user_code)
     
-    user = db.query(User).filter(User.user_code == x_user_code).first()
+    with span("dep.get_current_user"):
+        user = db.query(User).filter(User.user_code == x_user_code).first()
     if not user:
         logger.warning(f"User not found for code: {x_user_code}")
         raise HTTPException(status_code=404, detail="User not found")
     
-    logger.info(f"User authenticated: ID {user.id}, code {user.user_code}")
+    logger.info("User authenticated: ID %s, code %s", user.id, user.user_code)
     return user
 
 def get_current_car(db: Session = Depends(get_db)) -> Car:
-    car = db.query(Car).filter(Car.id == 1).first()  # Hardcoded for now
+    with span("dep.get_current_car"):
+        car = db.query(Car).filter(Car.id == 1).first()  # Hardcoded for now
     if not car:
         raise HTTPException(status_code=404, detail="Car not found")
-    return car
\ No newline at end of file
+    return car
+
+def require_admin_token(
+    x_admin_token: str = Header(..., description="Admin API token for partner/ops endpoints")
+) -> None:
+    expected_token = os.getenv("ADMIN_API_TOKEN")
+    if not expected_token or not hmac.compare_digest(x_admin_token.encode(), expected_token.encode()):
+        logger.warning("Rejected admin request with invalid token")
+        raise HTTPException(status_code=403, detail="Invalid admin token")
@@ -0,0 +1,150 @@
+"""
+Structured, non-blocking logging.
+
+Request threads only build a LogRecord and put it on an in-memory queue;
+a QueueListener thread does the JSON encoding and the write to stdout.
+High-volume INFO logs can be sampled per route.
+
+Env variables:
+    LOG_LEVEL: Root level (default: INFO)
+    LOG_FORMAT: json | text (default: json)
+    LOG_SAMPLE_RATES: Per-route INFO sampling, e.g.
+        "/api/v01/chat/conversations=0.1,/api/v01/user/public/{user_code}=0.25"
+    LOG_INFO_SAMPLE_RATE: Sampling for routes not listed above (default: 1.0)
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.middleware.query_instrumentation import route_path
+
+_current_scope: ContextVar[Optional[dict]] = ContextVar("log_scope", default=None)
+
+# Attributes every LogRecord has; anything else was passed via extra= and is emitted as a field
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; fields from extra= are included as-is"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "severity": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+def parse_sample_rates(raw: str) -> Dict[str, float]:
+    rates = {}
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        route, _, rate = item.rpartition("=")
+        rates[route] = float(rate)
+    return rates
+
+class RouteSamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of INFO-and-below records per route template; WARNING and
+    above always pass. Also tags records with the request's method and route.
+    """
+
+    def __init__(self, rates: Dict[str, float], default_rate: float = 1.0):
+        super().__init__()
+        self.rates = rates
+        self.default_rate = default_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        scope = _current_scope.get()
+        if scope is None:
+            return True
+        route = route_path(scope)
+        record.http_method = scope["method"]
+        record.route = route
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(route, self.default_rate)
+        return rate >= 1.0 or random.random() < rate
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for an in-process queue.
+
+    The stock prepare() runs the full formatter on the calling thread. Here only
+    the message is interpolated (so later mutation of args cannot change it and
+    ORM objects are never touched off-thread) and tracebacks are rendered; JSON
+    encoding and I/O happen on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class LogContextMiddleware:
+    """Makes the current request scope (method, matched route) visible to log filters"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def configure_logging(stream=None) -> None:
+    """Install the queue handler on the root logger and start the listener thread (idempotent)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(stream or sys.stdout)
+    if os.getenv("LOG_FORMAT", "json").lower() == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = LocalQueueHandler(log_queue)
+    queue_handler.addFilter(RouteSamplingFilter(
+        parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", "")),
+        float(os.getenv("LOG_INFO_SAMPLE_RATE", "1.0"))
+    ))
+
+    root = logging.getLogger()
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
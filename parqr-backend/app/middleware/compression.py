@@ -0,0 +1,297 @@
+"""
+Negotiated gzip/brotli response compression.
+
+The encoding is picked from the request's Accept-Encoding (brotli preferred
+when the Brotli package is installed, then gzip). Only compressible content
+types are touched: JSON, text, XML and SVG. QR PNGs and other binary assets
+are already compressed and pass through unchanged. Bodies smaller than
+COMPRESSION_MIN_SIZE, responses that already carry a Content-Encoding, and
+results that would not get smaller are sent as-is.
+
+Bodies of at least COMPRESSION_THREAD_THRESHOLD bytes are compressed in a
+worker thread, so one large history page does not stall the event loop.
+Streaming responses are compressed chunk by chunk.
+
+Metrics (per route and encoding): bytes in, bytes out and compression CPU
+seconds, so the bandwidth saved can be weighed against the CPU spent.
+
+Env variables:
+    COMPRESSION_ENABLED: Compress responses (default: true)
+    COMPRESSION_MIN_SIZE: Smallest body in bytes worth compressing (default: 1024)
+    COMPRESSION_THREAD_THRESHOLD: Compress bodies this large off the event loop (default: 65536)
+    COMPRESSION_GZIP_LEVEL: zlib level 1-9 (default: 5)
+    COMPRESSION_BROTLI_QUALITY: Brotli quality 0-11 (default: 4, tuned for dynamic responses)
+"""
+
+import os
+import time
+import zlib
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import logging
+
+import anyio
+from prometheus_client import Counter
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.middleware.query_instrumentation import route_path
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; without it only gzip is offered
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "application/xml", "image/svg+xml")
+
+COMPRESSION_INPUT_BYTES = Counter(
+    "parqr_http_compression_input_bytes_total",
+    "Response bytes before compression",
+    ["route", "encoding"]
+)
+COMPRESSION_OUTPUT_BYTES = Counter(
+    "parqr_http_compression_output_bytes_total",
+    "Response bytes after compression",
+    ["route", "encoding"]
+)
+COMPRESSION_CPU_SECONDS = Counter(
+    "parqr_http_compression_cpu_seconds_total",
+    "CPU time spent compressing responses",
+    ["route", "encoding"]
+)
+COMPRESSION_SKIPPED = Counter(
+    "parqr_http_compression_skipped_total",
+    "Responses sent uncompressed to a client that accepts compression",
+    ["reason"]
+)
+
+# Labelled children are cached so the hot path is a dict lookup (same approach as metrics.py)
+_children: Dict[Tuple[str, str], Tuple[Counter, Counter, Counter]] = {}
+
+def _metrics(route: str, encoding: str) -> Tuple[Counter, Counter, Counter]:
+    key = (route, encoding)
+    children = _children.get(key)
+    if children is None:
+        children = _children[key] = (
+            COMPRESSION_INPUT_BYTES.labels(route, encoding),
+            COMPRESSION_OUTPUT_BYTES.labels(route, encoding),
+            COMPRESSION_CPU_SECONDS.labels(route, encoding),
+        )
+    return children
+
+@lru_cache(maxsize=256)
+def negotiate_encoding(accept_encoding: str, brotli_available: bool = brotli is not None) -> Optional[str]:
+    """
+    Pick 'br' or 'gzip' from an Accept-Encoding header, or None for identity.
+
+    Clients send a handful of distinct header values, so results are cached.
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            weights[name.strip()] = quality
+
+    candidates = (("br", "gzip") if brotli_available else ("gzip",))
+    best, best_quality = None, 0.0
+    for encoding in candidates:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        # Ties go to the earlier (better) encoding
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith("+json")
+        or media_type.endswith("+xml")
+    )
+
+class _Compressor:
+    """Incremental gzip or brotli encoder with CPU-time accounting"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        self.cpu_seconds = 0.0
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality, mode=brotli.MODE_TEXT)
+        else:
+            # wbits=31: zlib stream with a gzip header and trailer
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        # thread_time counts only this thread, so it is right on the loop and in a worker
+        started = time.thread_time()
+        if self.encoding == "br":
+            output = self._brotli.process(data)
+            if final:
+                output += self._brotli.finish()
+        else:
+            output = self._zlib.compress(data)
+            if final:
+                output += self._zlib.flush()
+        self.cpu_seconds += time.thread_time() - started
+        return output
+
+class CompressionMiddleware:
+    """ASGI middleware compressing compressible responses for clients that accept it"""
+
+    def __init__(
+        self,
+        app,
+        enabled: Optional[bool] = None,
+        minimum_size: Optional[int] = None,
+        thread_threshold: Optional[int] = None,
+        gzip_level: Optional[int] = None,
+        brotli_quality: Optional[int] = None
+    ):
+        self.app = app
+        # Read in __init__ (not as default args) so .env values loaded at startup apply
+        self.enabled = enabled if enabled is not None else os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+        self.minimum_size = minimum_size if minimum_size is not None else int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+        self.thread_threshold = thread_threshold if thread_threshold is not None else int(os.getenv("COMPRESSION_THREAD_THRESHOLD", "65536"))
+        self.gzip_level = gzip_level if gzip_level is not None else int(os.getenv("COMPRESSION_GZIP_LEVEL", "5"))
+        self.brotli_quality = brotli_quality if brotli_quality is not None else int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, scope, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+class _CompressionResponder:
+    """Per-response state: holds http.response.start until the first body chunk decides the encoding"""
+
+    def __init__(self, middleware: CompressionMiddleware, scope, encoding: str, send):
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self.downstream = send
+        self.start_message = None
+        self.mode = None  # "identity" or "compress", decided on the first body chunk
+        self.compressor: Optional[_Compressor] = None
+        self.input_bytes = 0
+        self.output_bytes = 0
+
+    async def send(self, message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            return
+        if message_type != "http.response.body":
+            if self.mode is None and self.start_message is not None:
+                # e.g. http.response.pathsend: the server sends the file, nothing to compress
+                self.mode = "identity"
+                COMPRESSION_SKIPPED.labels("pathsend").inc()
+                await self.downstream(self.start_message)
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.mode is None:
+            self.mode = self._choose_mode(body, more_body)
+            if self.mode == "identity":
+                await self.downstream(self.start_message)
+            elif not more_body:
+                await self._send_whole(body)
+                return
+            else:
+                self._start_stream()
+                await self.downstream(self.start_message)
+
+        if self.mode == "identity":
+            await self.downstream(message)
+            return
+
+        chunk = await self._compress(body, final=not more_body)
+        await self.downstream({"type": "http.response.body", "body": chunk, "more_body": more_body})
+        if not more_body:
+            self._record()
+
+    def _choose_mode(self, body: bytes, more_body: bool) -> str:
+        headers = Headers(raw=self.start_message["headers"])
+        status = self.start_message["status"]
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            reason = "encoded" if "content-encoding" in headers else "status"
+        elif not is_compressible(headers.get("content-type", "")):
+            reason = "content_type"
+        else:
+            declared = headers.get("content-length")
+            size = int(declared) if declared is not None and declared.isdigit() else None
+            if size is None and not more_body:
+                size = len(body)
+            if size is not None and size < self.middleware.minimum_size:
+                reason = "below_threshold"
+            else:
+                return "compress"
+        COMPRESSION_SKIPPED.labels(reason).inc()
+        return "identity"
+
+    def _new_compressor(self) -> _Compressor:
+        return _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+
+    async def _compress(self, data: bytes, final: bool) -> bytes:
+        self.input_bytes += len(data)
+        if len(data) >= self.middleware.thread_threshold:
+            output = await anyio.to_thread.run_sync(self.compressor.compress, data, final)
+        else:
+            output = self.compressor.compress(data, final)
+        self.output_bytes += len(output)
+        return output
+
+    async def _send_whole(self, body: bytes) -> None:
+        self.compressor = self._new_compressor()
+        compressed = await self._compress(body, final=True)
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if len(compressed) >= len(body):
+            COMPRESSION_SKIPPED.labels("not_smaller").inc()
+            await self.downstream(self.start_message)
+            await self.downstream({"type": "http.response.body", "body": body})
+            return
+        self._set_encoding_headers(headers)
+        headers["Content-Length"] = str(len(compressed))
+        await self.downstream(self.start_message)
+        await self.downstream({"type": "http.response.body", "body": compressed})
+        self._record()
+
+    def _start_stream(self) -> None:
+        self.compressor = self._new_compressor()
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        self._set_encoding_headers(headers)
+        if "content-length" in headers:
+            del headers["Content-Length"]
+
+    def _set_encoding_headers(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        # The encoded bytes differ from the identity representation, so a strong validator no longer applies
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+    def _record(self) -> None:
+        input_bytes, output_bytes, cpu_seconds = _metrics(route_path(self.scope), self.encoding)
+        input_bytes.inc(self.input_bytes)
+        output_bytes.inc(self.output_bytes)
+        cpu_seconds.inc(self.compressor.cpu_seconds)
@@ -92,7 +92,10 @@ class FeatureGate:
         return wrapper
     
 # Function for FastAPI Depends()
-def require_premium():
+def require_premium(
+        user: User = Depends(get_current_user),
+        db: Session = Depends(get_db)
+) -> None:
     """
     Dependency function for premium feature gating.
     
@@ -104,17 +107,13 @@ def require_premium():
             db: Session = Depends(get_db)
         ):
             pass
-    """
-    def _check_premium(
-            user: User = Depends(get_current_user),
-            db: Session = Depends(get_db)
-    ):
-        user_tier = FeatureGate.check_user_tier(user.user_code, db)
-        if user_tier != "premium":
-            raise HTTPException(
-                status_code=403,
-                detail="Premium subscription required for this feature"
-            )
-        return None
     
-    return _check_premium()
\ No newline at end of file
+    Raises:
+        HTTPException: 403 if the current user is not on the premium tier
+    """
+    user_tier = FeatureGate.check_user_tier(user.user_code, db)
+    if user_tier != "premium":
+        raise HTTPException(
+            status_code=403,
+            detail="Premium subscription required for this feature"
+        )
@@ -0,0 +1,138 @@
+"""
+Per-route HTTP metrics exported in Prometheus format.
+
+Latency, response size and status are labelled by route template
+('/api/v01/user/public/{user_code}'), never the raw path, so label
+cardinality stays bounded by the number of routes.
+
+Multiple uvicorn/gunicorn workers: set PROMETHEUS_MULTIPROC_DIR to an empty,
+writable directory shared by the workers (before the app is imported). Each
+worker then writes its samples to mmap files and /metrics aggregates all of
+them; without it every worker reports only its own numbers.
+"""
+
+import os
+import time
+from typing import Dict, Tuple
+import logging
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+
+from app.middleware.query_instrumentation import route_path
+
+logger = logging.getLogger(__name__)
+
+MULTIPROCESS_MODE = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+# Most API calls are single-row lookups; the upper buckets catch QR renders and bulk imports
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 500, 1_000, 5_000, 10_000, 50_000, 100_000, 500_000, 1_000_000)
+
+REQUEST_LATENCY = Histogram(
+    "parqr_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+RESPONSE_SIZE = Histogram(
+    "parqr_http_response_size_bytes",
+    "HTTP response body size by route template",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "parqr_http_requests_in_flight",
+    "Requests currently being handled",
+    ["method"],
+    multiprocess_mode="livesum"
+)
+REQUEST_EXCEPTIONS = Counter(
+    "parqr_http_request_exceptions_total",
+    "Requests that raised instead of returning a response",
+    ["method", "route"]
+)
+
+# Labelled children are cached so the hot path is a dict lookup, not MetricWrapper.labels()
+# (which validates labels and takes the metric's lock). Metrics are observed from the event
+# loop thread only, so the per-value locks inside prometheus_client are never contended.
+_latency_children: Dict[Tuple[str, str, str], Histogram] = {}
+_size_children: Dict[Tuple[str, str], Histogram] = {}
+_in_flight_children: Dict[str, Gauge] = {}
+
+def _latency(method: str, route: str, status: str) -> Histogram:
+    key = (method, route, status)
+    child = _latency_children.get(key)
+    if child is None:
+        child = _latency_children[key] = REQUEST_LATENCY.labels(method, route, status)
+    return child
+
+def _size(method: str, route: str) -> Histogram:
+    key = (method, route)
+    child = _size_children.get(key)
+    if child is None:
+        child = _size_children[key] = RESPONSE_SIZE.labels(method, route)
+    return child
+
+def _in_flight(method: str) -> Gauge:
+    child = _in_flight_children.get(method)
+    if child is None:
+        child = _in_flight_children[method] = REQUESTS_IN_FLIGHT.labels(method)
+    return child
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status, response size and in-flight requests per route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = "500"
+        size = 0
+        declared_size = 0
+        in_flight = _in_flight(method)
+
+        async def send_and_measure(message):
+            nonlocal status, size, declared_size
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"content-length" and value.isdigit():
+                        declared_size = int(value)
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            elif message["type"] == "http.response.pathsend":
+                # The server sends the file; its size is the declared Content-Length
+                size += declared_size
+            await send(message)
+
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_and_measure)
+        except Exception:
+            REQUEST_EXCEPTIONS.labels(method, route_path(scope)).inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            route = route_path(scope)
+            _latency(method, route, status).observe(elapsed)
+            _size(method, route).observe(size)
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Exposition payload and content type; aggregates all workers in multiprocess mode"""
+    if MULTIPROCESS_MODE:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the shared directory on shutdown"""
+    if MULTIPROCESS_MODE:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,140 @@
+import asyncio
+import os
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Optional
+import logging
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+from app.services.profiling_service import (
+    PROFILE_HEADER, ProfileSignatureError, RequestProfiler, profile_store, profiling_toggle, verify_profile_header
+)
+
+logger = logging.getLogger(__name__)
+
+class _PendingProfile:
+    def __init__(self, mode: str, method: str, path: str):
+        self.mode = mode
+        self.method = method
+        self.path = path
+        self.profile_id: Optional[str] = None
+
+_pending_profile: ContextVar[Optional[_PendingProfile]] = ContextVar("pending_profile", default=None)
+
+# One profiled request per process: cProfile/tracemalloc are process-wide and would mix requests
+_profiling_slot = threading.Lock()
+
+def _finish(pending: _PendingProfile, profiler: RequestProfiler, started: float) -> None:
+    try:
+        data = profiler.stop()
+        entry = profile_store.save(pending.mode, pending.method, pending.path, (time.perf_counter() - started) * 1000, data)
+        pending.profile_id = entry["id"]
+    except Exception as e:
+        logger.error(f"Failed to store {pending.mode} profile for {pending.path}: {str(e)}")
+
+def _profiled(call: Callable) -> Callable:
+    # Endpoints are wrapped (rather than profiled from the middleware) because sync endpoints
+    # run in a threadpool worker, and cProfile/the sampler only see the thread they run on.
+    if asyncio.iscoroutinefunction(call):
+        @wraps(call)
+        async def async_wrapper(*args, **kwargs):
+            pending = _pending_profile.get()
+            if pending is None:
+                return await call(*args, **kwargs)
+            profiler = RequestProfiler(pending.mode)
+            started = time.perf_counter()
+            profiler.start()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                _finish(pending, profiler, started)
+        return async_wrapper
+
+    @wraps(call)
+    def sync_wrapper(*args, **kwargs):
+        pending = _pending_profile.get()
+        if pending is None:
+            return call(*args, **kwargs)
+        profiler = RequestProfiler(pending.mode)
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            _finish(pending, profiler, started)
+    return sync_wrapper
+
+def install_profiling(app: FastAPI) -> None:
+    """
+    Enable on-demand profiling for every API route registered on app.
+
+    Call after all routers are included. Does nothing unless PROFILING_ENABLED=true,
+    so there is no per-request cost by default.
+
+    Env variables:
+        PROFILING_ENABLED: Install the profiling hooks (default: false)
+        PROFILING_SECRET: HMAC key for signed X-Profile headers (see scripts/profile_token.py);
+            without it only the admin toggle can trigger profiles
+    """
+    if os.getenv("PROFILING_ENABLED", "false").lower() != "true":
+        return
+
+    # FastAPI reads dependant.call at request time (run_endpoint_function); whether it is
+    # awaited was decided at route creation, which the wrapper preserves.
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            route.dependant.call = _profiled(route.dependant.call)
+    app.add_middleware(ProfilingMiddleware, secret=os.getenv("PROFILING_SECRET"))
+    profiling_toggle.installed = True
+    logger.info("Request profiling hooks installed")
+
+class ProfilingMiddleware:
+    """
+    Selects requests for profiling and reports the stored profile id in X-Profile-Id.
+
+    A request is selected by a valid X-Profile header ('<mode>:<expires_at>:<signature>')
+    or by the admin toggle's sampling rate. Invalid headers are logged and ignored.
+    """
+
+    def __init__(self, app, secret: Optional[str] = None):
+        self.app = app
+        self.secret = secret
+
+    def _select_mode(self, scope) -> Optional[str]:
+        if self.secret:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER.encode():
+                    try:
+                        return verify_profile_header(value.decode("latin-1"), self.secret)
+                    except ProfileSignatureError as e:
+                        logger.warning(f"Ignoring X-Profile header on {scope['path']}: {str(e)}")
+                        return None
+        return profiling_toggle.pick(scope["path"])
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        mode = self._select_mode(scope)
+        if mode is None or not _profiling_slot.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        pending = _PendingProfile(mode, scope["method"], scope["path"])
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start" and pending.profile_id:
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"x-profile-id", pending.profile_id.encode())]}
+            await send(message)
+
+        token = _pending_profile.set(pending)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            _pending_profile.reset(token)
+            _profiling_slot.release()
@@ -0,0 +1,219 @@
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Identical statement shapes executed at least this many times in one request are reported as N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "5"))
+
+# Requests issuing more statements than this are logged even without an N+1 pattern
+QUERY_COUNT_WARNING = int(os.getenv("DB_QUERY_COUNT_WARNING", "30"))
+
+# Bound parameters are already placeholders in the SQL text; only IN-lists vary in length per call
+_IN_LIST = re.compile(r"\(\s*(?:%s|\?|:\w+)(?:\s*,\s*(?:%s|\?|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+    """Normalize a SQL statement so repeated executions of the same query compare equal"""
+    return _IN_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+class RequestQueryStats:
+    """Statements and DB time collected for one request (or one query_budget block)"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    def n_plus_one(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+        """Statement shapes repeated at least threshold times, most repeated first"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def summary(self) -> str:
+        return f"{self.count} queries in {self.seconds * 1000:.1f} ms"
+
+_current_stats: ContextVar[Optional[List[RequestQueryStats]]] = ContextVar("query_stats", default=None)
+
+@contextmanager
+def collect_queries() -> Iterator[RequestQueryStats]:
+    """
+    Collect every statement executed in the current context (request task and the
+    threadpool workers it calls into) into a RequestQueryStats. Blocks may nest.
+    """
+    stats = RequestQueryStats()
+    active = _current_stats.get() or []
+    token = _current_stats.set(active + [stats])
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() and context is not None:
+        # Kept on the execution context, which is discarded with the statement: a failed
+        # statement (no after_cursor_execute) leaves nothing behind on the pooled connection
+        context._parqr_query_started_at = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    active = _current_stats.get()
+    if not active:
+        return
+    started = getattr(context, "_parqr_query_started_at", None)
+    elapsed = time.perf_counter() - started if started is not None else 0.0
+    for stats in active:
+        stats.record(statement, elapsed)
+
+class QueryMetrics:
+    """Thread-safe per-route aggregates of statements per request and DB time"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, dict] = {}
+
+    def observe(self, route: str, stats: RequestQueryStats, n_plus_one: bool) -> None:
+        with self._lock:
+            entry = self._routes.setdefault(route, {
+                "requests": 0, "queries_total": 0, "db_seconds_total": 0.0, "queries_max": 0, "n_plus_one_requests": 0
+            })
+            entry["requests"] += 1
+            entry["queries_total"] += stats.count
+            entry["db_seconds_total"] += stats.seconds
+            entry["queries_max"] = max(entry["queries_max"], stats.count)
+            if n_plus_one:
+                entry["n_plus_one_requests"] += 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                route: {
+                    "requests": entry["requests"],
+                    "queries_avg": round(entry["queries_total"] / entry["requests"], 2),
+                    "queries_max": entry["queries_max"],
+                    "db_ms_avg": round(entry["db_seconds_total"] / entry["requests"] * 1000, 3),
+                    "n_plus_one_requests": entry["n_plus_one_requests"]
+                }
+                for route, entry in sorted(self._routes.items())
+            }
+
+query_metrics = QueryMetrics()
+
+# Callbacks receiving (route, stats) after every instrumented request; used by query_budget
+_request_observers: List[Callable[[str, RequestQueryStats], None]] = []
+_observers_lock = threading.Lock()
+
+def route_path(scope) -> str:
+    """'/api/v01/user/public/{user_code}' for a matched route; unmatched paths share one label"""
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+
+def route_template(scope) -> str:
+    """Method plus route path, e.g. 'GET /api/v01/user/public/{user_code}'"""
+    return f"{scope['method']} {route_path(scope)}"
+
+class QueryInstrumentationMiddleware:
+    """
+    ASGI middleware counting SQL statements and DB time per request.
+
+    Requests that repeat a statement shape N_PLUS_ONE_THRESHOLD times, or exceed
+    QUERY_COUNT_WARNING statements, are logged with the offending SQL. Per-route
+    aggregates are kept in query_metrics. With debug_headers (DEBUG=true) every
+    response carries X-DB-Query-Count, X-DB-Query-Time-Ms and X-DB-N-Plus-One.
+    """
+
+    def __init__(self, app, debug_headers: Optional[bool] = None):
+        self.app = app
+        self.debug_headers = debug_headers if debug_headers is not None else os.getenv("DEBUG", "false").lower() == "true"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with collect_queries() as stats:
+            async def send_with_headers(message):
+                if message["type"] == "http.response.start" and self.debug_headers:
+                    headers = list(message.get("headers", []))
+                    headers.extend([
+                        (b"x-db-query-count", str(stats.count).encode()),
+                        (b"x-db-query-time-ms", f"{stats.seconds * 1000:.1f}".encode()),
+                        (b"x-db-n-plus-one", str(len(stats.n_plus_one())).encode()),
+                    ])
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_headers if self.debug_headers else send)
+            finally:
+                self._report(scope, stats)
+
+    def _report(self, scope, stats: RequestQueryStats) -> None:
+        route = route_template(scope)
+        repeated = stats.n_plus_one()
+        query_metrics.observe(route, stats, bool(repeated))
+
+        if repeated:
+            shape, count = repeated[0]
+            logger.warning("Possible N+1 on %s: %s; statement repeated %dx: %s", route, stats.summary(), count, shape[:300])
+        elif stats.count > QUERY_COUNT_WARNING:
+            logger.warning("High query count on %s: %s", route, stats.summary())
+
+        with _observers_lock:
+            observers = list(_request_observers)
+        for observer in observers:
+            observer(route, stats)
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by query_budget when a request issues more statements than allowed"""
+
+@contextmanager
+def query_budget(max_queries: int, allow_n_plus_one: bool = False) -> Iterator[List[Tuple[str, RequestQueryStats]]]:
+    """
+    Assert that every request handled inside the block stays within max_queries statements.
+
+    Works with TestClient (requests run on another thread) because requests are
+    observed through the middleware rather than the caller's context.
+
+    Usage:
+        with query_budget(3):
+            client.get("/api/v01/user/public/ABCD1234")
+
+    Raises:
+        QueryBudgetExceeded: On leaving the block, if any request exceeded the budget
+            or (unless allow_n_plus_one) showed an N+1 pattern
+    """
+    observed: List[Tuple[str, RequestQueryStats]] = []
+    observer = lambda route, stats: observed.append((route, stats))
+    with _observers_lock:
+        _request_observers.append(observer)
+    try:
+        yield observed
+    finally:
+        with _observers_lock:
+            _request_observers.remove(observer)
+
+    failures = []
+    for route, stats in observed:
+        if stats.count > max_queries:
+            failures.append(f"{route}: {stats.summary()} (budget {max_queries})")
+        repeated = stats.n_plus_one()
+        if repeated and not allow_n_plus_one:
+            failures.append(f"{route}: N+1 - statement repeated {repeated[0][1]}x: {repeated[0][0][:300]}")
+    if failures:
+        raise QueryBudgetExceeded("Query budget exceeded:\n" + "\n".join(failures))
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.types import UTCDateTime
 from datetime import datetime, timezone
 
 class Car(Base):
@@ -11,6 +12,6 @@ class Car(Base):
     license_plate = Column(String(20), unique=True, nullable=False)
     car_brand = Column(String(50))
     car_model = Column(String(50))
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    created_at = Column(UTCDateTime, default=datetime.now(timezone.utc))
 
     owner = relationship('User', back_populates='cars')
\ No newline at end of file
@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.types import UTCDateTime
+from app.tracing import traced
 from datetime import datetime, timezone
 import base64
 import secrets
@@ -21,14 +23,15 @@ class ChatMessage(Base):
 
     # Metadata
     is_read = Column(Boolean, default=False, nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
-    read_at = Column(DateTime, nullable=True)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
+    read_at = Column(UTCDateTime, nullable=True)
 
     # Relationships
     sender = relationship("User", foreign_keys=[sender_id], backref="sent_messages")
     recipient = relationship("User", foreign_keys=[recipient_id], backref="received_messages")
 
     @staticmethod
+    @traced("crypto.encrypt")
     def simple_encrypt(message: str) -> tuple[str, str]:
         """
         Simple encryption for MVP - generates key and encrypts message
@@ -48,6 +51,7 @@ class ChatMessage(Base):
         return encrypted_message, key
 
     @staticmethod
+    @traced("crypto.decrypt")
     def simple_decrypt(encrypted_message: str, encryption_key: str) -> str:
         """
         Simple decryption for MVP
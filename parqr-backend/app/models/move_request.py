@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.db.base import Base
+from app.db.types import UTCDateTime
 
 class MoveRequest(Base):
     __tablename__ = "move_requests"
@@ -11,12 +12,17 @@ class MoveRequest(Base):
     # sender_user_id = Column(Integer, ForeignKey("users.id"), nullable=True) # If the sender is a ParQR user, simplified to anon for MVP
     # message = Column(Text, nullable=True) # Optional custom message (not available on MVP rollout; likely freemium linked with the whole chat function)
     ip_address = Column(String(45), nullable=False) #IPv6
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
-    viewed_at = Column(DateTime, nullable=True)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
+    viewed_at = Column(UTCDateTime, nullable=True)
     license_plate = Column(String(20), nullable=False) # Required for parkout
     is_read = Column(Boolean, default=False, nullable=False) # For Notification Badging 
     requester_info = Column(String(100), nullable=True) # Anonymous Requester identifier
 
+    # Keyset pagination for history: (target_user_id, created_at, id)
+    __table_args__ = (
+        Index("ix_move_requests_target_user_history", "target_user_id", "created_at", "id"),
+    )
+
     # Relationships
     target_user = relationship("User", back_populates="move_requests")
 
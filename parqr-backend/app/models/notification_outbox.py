@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
+from app.db.base import Base
+from app.db.types import UTCDateTime
+
+class NotificationOutbox(Base):
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    recipient_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    event_type = Column(String(50), nullable=False) # 'move_request'
+    payload = Column(Text, nullable=False) # JSON-encoded event body
+    status = Column(String(20), default="pending", nullable=False) # 'pending', 'sent', 'failed'
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    last_error = Column(String(255), nullable=True)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
+    sent_at = Column(UTCDateTime, nullable=True)
+
+    # Dispatcher polls pending rows that are due, oldest first
+    __table_args__ = (
+        Index("ix_notification_outbox_status_due", "status", "next_attempt_at"),
+    )
+
+    # Relationships
+    recipient = relationship("User")
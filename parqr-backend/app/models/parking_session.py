@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, Float
+from sqlalchemy import Column, Integer, ForeignKey, String, Float
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.types import UTCDateTime
 from datetime import datetime, timezone
 
 class ParkingSession(Base):
@@ -9,8 +10,8 @@ class ParkingSession(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
     car_id = Column(Integer, ForeignKey('cars.id'), nullable=False, index=True)
-    start_time = Column(DateTime, default=datetime.now(timezone.utc), index=True)
-    end_time = Column(DateTime, nullable=True, index=True)
+    start_time = Column(UTCDateTime, default=datetime.now(timezone.utc), index=True)
+    end_time = Column(UTCDateTime, nullable=True, index=True)
     note_location = Column(String(100), nullable=True)
     public_message = Column(String(200), nullable=True)
     longitude = Column(Float, nullable=True)
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, Text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.types import UTCDateTime
 from datetime import datetime, timezone
 import uuid
 
@@ -16,7 +17,7 @@ class User(Base):
     profile_display_name = Column(String(100), nullable=True)  # Optional display name
     qr_code_id = Column(String(50), unique=True, default=lambda: str(uuid.uuid4()))
     qr_image_path = Column(String(500), nullable=True)  # Path to generated QR image file
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    created_at = Column(UTCDateTime, default=datetime.now(timezone.utc))
 
     cars = relationship("Car", back_populates="owner")
     user_tier = relationship("UserTier", back_populates="user", uselist=False)
@@ -0,0 +1,69 @@
+"""
+Fast JSON responses.
+
+FastJSONResponse renders with orjson, which encodes dicts, lists, datetimes
+and UUIDs natively. A list endpoint can return FastJSONResponse(rows) built
+from projected columns; FastAPI then skips response_model validation and
+jsonable_encoder, which are most of the cost of a 200-item page. Those
+endpoints keep response_model for the OpenAPI schema only.
+
+The output matches the Pydantic path: UTC datetimes end in 'Z' and
+microseconds are kept.
+
+PathSendFileResponse hands local files to the server instead of streaming
+them through the event loop, when the server supports it.
+"""
+
+from typing import Any, Optional
+
+import orjson
+from fastapi.responses import FileResponse, ORJSONResponse
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson-rendered JSON; also the app's default response class"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+PATHSEND_EXTENSION = "http.response.pathsend"
+
+class PathSendFileResponse(FileResponse):
+    """
+    FileResponse using the ASGI pathsend extension when the server advertises it.
+
+    With pathsend the server sends the file itself (sendfile on Granian, for
+    example) instead of the app reading and forwarding it in 64 KB chunks.
+    Servers without the extension (uvicorn) and Range/HEAD requests get
+    FileResponse's regular chunked path.
+    """
+
+    _pathsend = False
+
+    async def __call__(self, scope, receive, send) -> None:
+        self._pathsend = PATHSEND_EXTENSION in scope.get("extensions", {})
+        await super().__call__(scope, receive, send)
+
+    async def _handle_simple(self, send, send_header_only: bool) -> None:
+        if not self._pathsend or send_header_only:
+            await super()._handle_simple(send, send_header_only)
+            return
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        await send({"type": PATHSEND_EXTENSION, "path": str(self.path)})
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak If-None-Match comparison (RFC 9110 13.1.2).
+
+    CompressionMiddleware turns strong ETags into weak ones on compressed
+    responses, so clients revalidate with W/"..." and must still get a 304.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+import mimetypes
+import logging
+
+from app.responses import PathSendFileResponse, etag_matches
+from app.services.asset_storage import get_asset_storage, IMMUTABLE_CACHE_CONTROL
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/v01/assets", tags=["assets"])
+
+@router.get("/{key:path}")
+def get_asset(key: str, request: Request) -> Response:
+    """
+    Serve a content-addressed asset from the configured storage backend.
+
+    Local files are never read into memory. Servers that advertise the ASGI
+    pathsend extension send the file themselves (zero-copy where the server
+    uses sendfile); others get FileResponse's chunked streaming.
+
+    Args:
+        key: Hashed asset key, e.g. 'qr/3f2a...e1.png'
+
+    Returns:
+        Asset bytes with a strong ETag and immutable Cache-Control
+
+    Raises:
+        HTTPException: 404 if the asset does not exist
+    """
+    storage = get_asset_storage()
+    etag = storage.etag_for(key)
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    media_type = mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+    try:
+        local_path = storage.local_path(key)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Asset not found")
+
+    if local_path is not None:
+        return PathSendFileResponse(local_path, media_type=media_type, headers=headers)
+
+    content = storage.read(key)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return Response(content=content, media_type=media_type, headers=headers)
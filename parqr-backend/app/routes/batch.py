@@ -0,0 +1,58 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+from starlette.concurrency import run_in_threadpool
+import logging
+
+from app.db.base import open_request_session
+from app.models.user import User
+from app.responses import FastJSONResponse
+from app.schemas.batch_schema import BatchRequest, BatchResponse
+from app.services.batch_service import BatchContext, batch_executor
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+@router.post("", response_model=BatchResponse)
+async def run_batch(batch: BatchRequest, request: Request, response: Response):
+    """
+    Run several GET requests to existing /api routes in one round trip.
+
+    Sub-requests get the batch's headers (X-User-Code, cookies), share one
+    resolved user and one DB session, and run with bounded concurrency.
+    Responses come back in request order with their own status codes; one
+    failing item does not fail the batch.
+
+    Args:
+        batch: Sub-requests, each with an optional client id and a path (query string allowed)
+
+    Returns:
+        One {id, status, body} per sub-request; body is the decoded JSON (or text)
+
+    Raises:
+        HTTPException: 422 if the batch has more than BATCH_MAX_REQUESTS items
+    """
+    if len(batch.requests) > batch_executor.max_requests:
+        raise HTTPException(
+            status_code=422,
+            detail=f"A batch can hold at most {batch_executor.max_requests} requests"
+        )
+
+    # Sub-requests are GETs, so the shared session may read from the replica
+    db = open_request_session(request, response, "GET")
+    try:
+        context = BatchContext(db)
+        user_code = request.headers.get("x-user-code")
+        if user_code:
+            context.user = await run_in_threadpool(
+                lambda: db.query(User).filter(User.user_code == user_code).first()
+            )
+        results = await batch_executor.run(request.app, request.scope, context, batch.requests)
+    finally:
+        await run_in_threadpool(db.close)
+
+    logger.info("Batch of %d requests: statuses %s", len(results), [result["status"] for result in results])
+    # Bodies are already plain JSON values; render them directly instead of re-validating
+    reply = FastJSONResponse({"responses": results})
+    # Keep the read-your-writes cookie a sub-request may have set on the shared session
+    reply.raw_headers.extend(header for header in response.raw_headers if header[0] == b"set-cookie")
+    return reply
@@ -1,16 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.db.base import get_db
 from app.models.car import Car
 from app.models.user import User
 from app.schemas.car_schema import CarRegisterRequest, CarResponse, CarOwnerResponse, CarPublicResponse
 from app.dependencies.auth import get_current_user
+from app.responses import FastJSONResponse
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/v01/car", tags=["car"])
 
+# Columns projected for /my-cars, in CarOwnerResponse field order
+OWNER_CAR_COLUMNS = [getattr(Car, name) for name in CarOwnerResponse.model_fields]
+
 @router.post("/register", response_model=CarOwnerResponse)
 def register_car(
     car_data: CarRegisterRequest,
@@ -35,8 +40,8 @@ def register_car(
         model_data = car_data.model_dump()
         model_data['owner_id'] = current_user.id
 
-        logger.info(f"Car registration data: {model_data}")
-        logger.info(f"Creating car for user_id: {current_user.id}")
+        logger.info("Car registration data: %s", model_data)
+        logger.info("Creating car for user_id: %s", current_user.id)
 
         new_car = Car(**model_data)
 
@@ -44,7 +49,7 @@ def register_car(
         db.commit()
         db.refresh(new_car)
 
-        logger.info(f"Car registered successfully with ID: {new_car.id}, license_plate: {new_car.license_plate}")
+        logger.info("Car registered successfully with ID: %s, license_plate: %s", new_car.id, new_car.license_plate)
         return new_car
 
     except Exception as e:
@@ -60,7 +65,7 @@ def edit_user_car(
     db: Session = Depends(get_db)
 ):
     """Edit current user's car details with ownership verification"""
-    logger.info(f"Update car request: car_id={car_id}, user_id={current_user.id}")
+    logger.info("Update car request: car_id=%s, user_id=%s", car_id, current_user.id)
 
     # Find car and verify ownership
     car = db.query(Car).filter(
@@ -91,7 +96,7 @@ def edit_user_car(
         db.commit()
         db.refresh(car)
 
-        logger.info(f"Car updated successfully: {car.license_plate}")
+        logger.info("Car updated successfully: %s", car.license_plate)
         return car
     except Exception as e:
         db.rollback()
@@ -105,12 +110,15 @@ def get_user_cars(
     db: Session = Depends(get_db)
 ):
     """Get current user's cars - includes license plates since owner is accessing their own data"""
-    logger.info(f"Fetching cars for user_id: {current_user.id}")
+    logger.info("Fetching cars for user_id: %s", current_user.id)
     
-    cars = db.query(Car).filter(Car.owner_id == current_user.id).all()
+    cars = [dict(row) for row in db.execute(
+        select(*OWNER_CAR_COLUMNS).where(Car.owner_id == current_user.id)
+    ).mappings()]
     
-    logger.info(f"Found {len(cars)} cars for user_id: {current_user.id}")
-    return cars
+    logger.info("Found %s cars for user_id: %s", len(cars), current_user.id)
+    # Rows are already shaped like CarOwnerResponse; skip response_model revalidation
+    return FastJSONResponse(cars)
 
 @router.get("/public/{car_id}", response_model=CarPublicResponse)
 def get_public_car_info(
@@ -118,14 +126,14 @@ def get_public_car_info(
     db: Session = Depends(get_db)
 ):
     """Get minimal public car information"""
-    logger.info(f"Public car info request for car_id: {car_id}")
+    logger.info("Public car info request for car_id: %s", car_id)
     
     car = db.query(Car).filter(Car.id == car_id).first()
     if not car:
         logger.warning(f"Car not found: {car_id}")
         raise HTTPException(status_code=404, detail="Car not found")
     
-    logger.info(f"Returning public info for car: {car.license_plate}")
+    logger.info("Returning public info for car: %s", car.license_plate)
     return CarPublicResponse.from_car(car)
 
 @router.delete("/remove/{car_id}", response_model=dict)
@@ -135,7 +143,7 @@ def remove_car(
     current_user: User = Depends(get_current_user)
 ):
     """Remove user's car - with ownership verification"""
-    logger.info(f"Remove car requests: {car_id=:}, user_id={current_user.id}")
+    logger.info("Remove car requests: car_id=%s, user_id=%s", car_id, current_user.id)
 
     # Find car and verify ownership
     car = db.query(Car).filter(
@@ -164,7 +172,7 @@ def remove_car(
         db.delete(car)
         db.commit()
 
-        logger.info(f"Car removed successfully: {license_plate}")
+        logger.info("Car removed successfully: %s", license_plate)
         return {
             "message": f"Car {license_plate} removed successfully!"
         }
@@ -14,6 +14,7 @@ from app.schemas.chat_schema import (
 )
 from app.dependencies.auth import get_current_user
 from app.middleware.feature_gate import require_premium
+from app.responses import FastJSONResponse
 from datetime import datetime, timezone
 import logging
 
@@ -22,14 +23,14 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/v01/chat", tags=["chat"])
 
 @router.post("/send", response_model=ChatMessageResponse)
-async def send_message(
+def send_message(
     message_data: ChatMessageCreate,
     _: None = Depends(require_premium),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> ChatMessageResponse:
     """Send a message to another user"""
-    logger.info(f"Message send request from {current_user.user_code} to {message_data.recipient_user_code}")
+    logger.info("Message send request from %s to %s", current_user.user_code, message_data.recipient_user_code)
     
     # Find recipient by user_code
     recipient = db.query(User).filter(User.user_code == message_data.recipient_user_code).first()
@@ -76,7 +77,7 @@ async def send_message(
         read_at=new_message.read_at
     )
     
-    logger.info(f"Message sent successfully: ID {new_message.id}")
+    logger.info("Message sent successfully: ID %s", new_message.id)
     return response
 
 @router.get("/conversations", response_model=List[ChatConversationResponse])
@@ -86,7 +87,7 @@ def get_conversations(
     _: None = Depends(require_premium)
 ) -> List[ChatConversationResponse]:
     """Get all conversations for current user"""
-    logger.info(f"Fetching conversations for user {current_user.user_code}")
+    logger.info("Fetching conversations for user %s", current_user.user_code)
     
     # Get all unique conversation participants
     # Using a union to get both senders and recipients who have chatted with current user
@@ -128,21 +129,22 @@ def get_conversations(
         if not latest_message:
             continue
             
-        # Debug: Show all messages in this conversation for comparison
-        all_messages = db.query(ChatMessage).filter(
-            or_(
-                and_(ChatMessage.sender_id == current_user.id, ChatMessage.recipient_id == participant_id),
-                and_(ChatMessage.sender_id == participant_id, ChatMessage.recipient_id == current_user.id)
-            )
-        ).order_by(desc(ChatMessage.id)).all()
-        
-        logger.info(f"=== ALL MESSAGES for conversation with {other_user.user_code} ===")
-        for i, msg in enumerate(all_messages[:5]):  # Show top 5 most recent
-            sender_code = msg.sender.user_code if msg.sender else "Unknown"
-            logger.info(f"Message {i+1}: ID={msg.id}, created_at={msg.created_at}, sender={sender_code}, content: {msg.message_content[:30]}...")
-        
-        # Debug: Log the selected latest message
-        logger.info(f"SELECTED as latest: ID={latest_message.id}, created_at={latest_message.created_at}, content preview: {latest_message.message_content[:20]}...")
+        # Debug: Show the most recent messages in this conversation for comparison.
+        # Gated on the level so production never runs the extra query or the per-message sender loads.
+        if logger.isEnabledFor(logging.DEBUG):
+            recent_messages = db.query(ChatMessage).filter(
+                or_(
+                    and_(ChatMessage.sender_id == current_user.id, ChatMessage.recipient_id == participant_id),
+                    and_(ChatMessage.sender_id == participant_id, ChatMessage.recipient_id == current_user.id)
+                )
+            ).order_by(desc(ChatMessage.id)).limit(5).all()
+
+            logger.debug("=== RECENT MESSAGES for conversation with %s ===", other_user.user_code)
+            for i, msg in enumerate(recent_messages):
+                sender_code = msg.sender.user_code if msg.sender else "Unknown"
+                logger.debug("Message %s: ID=%s, created_at=%s, sender=%s, content: %s...", i+1, msg.id, msg.created_at, sender_code, msg.message_content[:30])
+
+            logger.debug("SELECTED as latest: ID=%s, created_at=%s, content preview: %s...", latest_message.id, latest_message.created_at, latest_message.message_content[:20])
             
         # Count unread messages from this participant to current user
         unread_count = db.query(ChatMessage).filter(
@@ -179,7 +181,7 @@ def get_conversations(
     # Sort by last activity
     conversations.sort(key=lambda x: x.last_activity, reverse=True)
     
-    logger.info(f"Found {len(conversations)} conversations for user {current_user.user_code}")
+    logger.info("Found %s conversations for user %s", len(conversations), current_user.user_code)
     return conversations
 
 @router.get("/messages/{user_code}", response_model=List[ChatMessageResponse])
@@ -192,40 +194,48 @@ def get_conversation_messages(
     _: None = Depends(require_premium)
 ):
     """Get messages in conversation with specific user"""
-    logger.info(f"Fetching messages between {current_user.user_code} and {user_code}")
+    logger.info("Fetching messages between %s and %s", current_user.user_code, user_code)
     
     # Find the other user
     other_user = db.query(User).filter(User.user_code == user_code).first()
     if not other_user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Get messages between these two users
-    messages = db.query(ChatMessage).filter(
+    # Get messages between these two users; only the needed columns, no per-row sender/recipient loads
+    messages = db.query(
+        ChatMessage.id,
+        ChatMessage.sender_id,
+        ChatMessage.message_content,
+        ChatMessage.encryption_key,
+        ChatMessage.message_type,
+        ChatMessage.is_read,
+        ChatMessage.created_at,
+        ChatMessage.read_at
+    ).filter(
         or_(
             and_(ChatMessage.sender_id == current_user.id, ChatMessage.recipient_id == other_user.id),
             and_(ChatMessage.sender_id == other_user.id, ChatMessage.recipient_id == current_user.id)
         )
     ).order_by(desc(ChatMessage.created_at)).offset(offset).limit(limit).all()
     
-    # Decrypt and format messages
+    # Decrypt and format messages (dicts in ChatMessageResponse field order)
     formatted_messages = []
     for message in messages:
-        decrypted_content = ChatMessage.simple_decrypt(message.message_content, message.encryption_key)
-        
-        formatted_message = ChatMessageResponse(
-            id=message.id,
-            sender_user_code=message.sender.user_code,
-            recipient_user_code=message.recipient.user_code,
-            message_content=decrypted_content,
-            message_type=message.message_type,
-            is_read=message.is_read,
-            created_at=message.created_at,
-            read_at=message.read_at
-        )
-        formatted_messages.append(formatted_message)
+        sent_by_me = message.sender_id == current_user.id
+        formatted_messages.append({
+            "id": message.id,
+            "sender_user_code": current_user.user_code if sent_by_me else other_user.user_code,
+            "recipient_user_code": other_user.user_code if sent_by_me else current_user.user_code,
+            "message_content": ChatMessage.simple_decrypt(message.message_content, message.encryption_key),
+            "message_type": message.message_type,
+            "is_read": message.is_read,
+            "created_at": message.created_at,
+            "read_at": message.read_at
+        })
     
-    logger.info(f"Retrieved {len(formatted_messages)} messages")
-    return formatted_messages
+    logger.info("Retrieved %s messages", len(formatted_messages))
+    # Shaped like ChatMessageResponse; skip response_model revalidation
+    return FastJSONResponse(formatted_messages)
 
 @router.post("/mark-read")
 def mark_messages_as_read(
@@ -235,7 +245,7 @@ def mark_messages_as_read(
     _: None = Depends(require_premium)
 ):
     """Mark messages as read"""
-    logger.info(f"Marking {len(request.message_ids)} messages as read for user {current_user.user_code}")
+    logger.info("Marking %s messages as read for user %s", len(request.message_ids), current_user.user_code)
     
     # Update messages that belong to current user as recipient
     updated_count = db.query(ChatMessage).filter(
@@ -251,5 +261,5 @@ def mark_messages_as_read(
     
     db.commit()
     
-    logger.info(f"Marked {updated_count} messages as read")
+    logger.info("Marked %s messages as read", updated_count)
     return {"marked_as_read": updated_count}
@@ -1,7 +1,54 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from app.db.session import get_engine
+from app.db.pool import get_pool_stats
+from app.middleware.query_instrumentation import query_metrics
+from app.services.qr_render_queue import qr_render_queue
+from app.services.parking_archive import parking_archive
+from app.services.retention_service import retention_runner
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 @router.get("/health")
 def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@router.get("/health/ready")
+def readiness_check():
+    """Readiness probe: verifies a DB round trip and reports live connection pool metrics"""
+    engine = get_engine()
+    pool_stats = get_pool_stats(engine.pool)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.error(f"Readiness check failed: {str(e)}")
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "database": "unreachable", "pool": pool_stats}
+        )
+    return {"status": "ok", "database": "ok", "pool": get_pool_stats(engine.pool)}
+
+@router.get("/health/qr_queue")
+def qr_queue_health():
+    """QR render queue depth and render latency"""
+    return {"status": "ok", "qr_render_queue": qr_render_queue.stats()}
+
+@router.get("/health/queries")
+def query_stats():
+    """Per-route SQL statements per request, DB time and N+1 occurrences since process start"""
+    return {"status": "ok", "routes": query_metrics.snapshot()}
+
+@router.get("/health/retention")
+def retention_stats():
+    """Retention policies and the rows processed by their last run in this process"""
+    return {"status": "ok", "retention": retention_runner.stats()}
+
+@router.get("/health/parking_archive")
+def parking_archive_stats():
+    """Cold archive partitions of ended parking sessions"""
+    return {"status": "ok", "parking_archive": parking_archive.stats()}
@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+from app.middleware.metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint: per-route latency, status, response size and in-flight requests"""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
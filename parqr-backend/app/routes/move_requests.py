@@ -1,7 +1,9 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc, func
+from sqlalchemy import and_, or_, case, desc, func
+from datetime import datetime
+import base64
 import logging
 
 from app.db.base import get_db
@@ -12,17 +14,31 @@ from app.schemas.move_request_schema import (
     MoveRequestResponse,
     MoveRequestPreviewItem,
     MoveRequestPreview,
-    MoveRequestHistoryItem,
     MoveRequestHistoryResponse,
     UnreadCountResponse,
     MarkAsReadRequest
 )
 from app.dependencies.auth import get_current_user
+from app.responses import FastJSONResponse
+from app.services.notification_service import NotificationService, notification_dispatcher
 
 router = APIRouter(prefix="/v01/move_requests", tags=["move_requests"])
 
+# Row cap used when approximate history totals are requested
+HISTORY_COUNT_CAP = 1000
+
+# Columns projected for history pages, in MoveRequestHistoryItem field order
+HISTORY_ITEM_COLUMNS = (
+    MoveRequest.id,
+    MoveRequest.license_plate,
+    MoveRequest.requester_info,
+    MoveRequest.is_read,
+    MoveRequest.created_at,
+    MoveRequest.viewed_at.label("read_at")
+)
+
 @router.get("/unread_count/{user_code}", response_model=UnreadCountResponse)
-async def get_unread_move_requests_count(
+def get_unread_move_requests_count(
     user_code: str,
     db: Session = Depends(get_db)
 ) -> UnreadCountResponse:
@@ -58,7 +74,7 @@ async def get_unread_move_requests_count(
     return UnreadCountResponse(unread_count=unread_count)
 
 @router.get("/preview/{user_code}", response_model=MoveRequestPreview)
-async def get_move_requests_preview(
+def get_move_requests_preview(
     user_code: str,
     limit: int = Query(3, ge=1, le=10),
     db: Session = Depends(get_db)
@@ -105,7 +121,7 @@ async def get_move_requests_preview(
     )
 
 @router.post("/create", response_model=MoveRequestResponse)
-async def create_move_request(
+def create_move_request(
     request: MoveRequestCreate,
     client_request: Request,
     db: Session = Depends(get_db)
@@ -151,13 +167,37 @@ async def create_move_request(
     )
 
     db.add(db_request)
+    db.flush() # Assign the request ID before writing the outbox row
+
+    # Outbox row is committed atomically with the move request; delivery happens in the background dispatcher
+    NotificationService.enqueue(
+        db,
+        recipient_user_id=target_user.id,
+        event_type="move_request",
+        payload={
+            "move_request_id": db_request.id,
+            "license_plate": db_request.license_plate,
+            "requester_info": db_request.requester_info,
+            "created_at": db_request.created_at
+        }
+    )
+
     db.commit()
     db.refresh(db_request)
+    notification_dispatcher.wake()
 
-    return MoveRequestResponse.model_validate(db_request)
+    return MoveRequestResponse(
+        id=db_request.id,
+        target_user_code=target_user.user_code,
+        license_plate=db_request.license_plate,
+        requester_info=db_request.requester_info,
+        is_read=db_request.is_read,
+        created_at=db_request.created_at,
+        read_at=db_request.viewed_at
+    )
 
 @router.put("/{request_id}/mark_read", response_model= dict)
-async def mark_move_reqeust_as_read(
+def mark_move_reqeust_as_read(
     request_id: int,
     db: Session = Depends(get_db)
 ) -> dict:
@@ -191,63 +231,121 @@ async def mark_move_reqeust_as_read(
     return {"message": f"Move request {request_id} marked as read"}
 
 @router.get("/history/{user_code}", response_model=MoveRequestHistoryResponse)
-async def get_move_request_history(
+def get_move_request_history(
     user_code: str,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     unread_only: bool = Query(False),
+    approximate_total: bool = Query(False),
     db: Session = Depends(get_db)
-) -> MoveRequestHistoryResponse:
+):
     """
     Get full move request history for user.
     
     This endpoint provides paginated access to all move requests received
     by a user, with optional filtering for unread requests only.
+
+    Pagination is keyset-based on (created_at, id): pass the `next_cursor`
+    from the previous page as `cursor` to fetch the next page. `offset` is
+    still accepted for older clients but is ignored when a cursor is given.
     
     Args:
         user_code: 8-character user code
         limit: Number of requests to return (1-200, default 50)
-        offset: Number of requests to skip (default 0)
+        offset: Number of requests to skip (default 0, legacy pagination)
+        cursor: Opaque cursor returned as next_cursor by the previous page
         unread_only: If True, only return unread requests
+        approximate_total: If True, stop counting the total after HISTORY_COUNT_CAP rows (unread_count stays exact)
         db: Database session
     
     Returns:
-        MoveRequestHistoryResponse with user info, requests list, and counts
+        MoveRequestHistoryResponse with user info, requests list, counts and next_cursor
     
     Raises:
         HTTPException: 404 if user not found
+        HTTPException: 400 if cursor is malformed
     """
     # User verification
     user = db.query(User).filter(User.user_code == user_code).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Optional unread filter
-    if unread_only == False:
-        query = db.query(MoveRequest).filter(MoveRequest.target_user_id == user.id)
-    elif unread_only == True:
-        query = db.query(MoveRequest).filter(
-            and_(
-                MoveRequest.target_user_id == user.id,
-                MoveRequest.is_read == False
+    base_filter = MoveRequest.target_user_id == user.id
+
+    if approximate_total:
+        # Only the total is capped (large histories report a lower bound); the unread
+        # badge is counted exactly, since old unread requests must not disappear from it
+        capped = db.query(MoveRequest.id).filter(base_filter).order_by(
+            desc(MoveRequest.created_at)
+        ).limit(HISTORY_COUNT_CAP).subquery()
+        all_count = db.query(func.count()).select_from(capped).scalar()
+        unread_count = db.query(func.count(MoveRequest.id)).filter(
+            base_filter, MoveRequest.is_read == False
+        ).scalar()
+        total_is_estimate = all_count >= HISTORY_COUNT_CAP
+    else:
+        # Total and unread counts in a single statement via conditional aggregation
+        unread_case = case((MoveRequest.is_read == False, 1), else_=0)
+        all_count, unread_count = db.query(
+            func.count(MoveRequest.id), func.coalesce(func.sum(unread_case), 0)
+        ).filter(base_filter).one()
+        total_is_estimate = False
+
+    unread_count = int(unread_count)
+    if unread_only:
+        # The unread count is exact in both modes
+        total_count, total_is_estimate = unread_count, False
+    else:
+        total_count = all_count
+
+    # Optional unread filter; only the columns the page needs, no ORM identity map
+    query = db.query(*HISTORY_ITEM_COLUMNS).filter(base_filter)
+    if unread_only:
+        query = query.filter(MoveRequest.is_read == False)
+
+    # Keyset pagination on (created_at, id), newest first
+    if cursor:
+        cursor_created_at, cursor_id = _decode_history_cursor(cursor)
+        query = query.filter(
+            or_(
+                MoveRequest.created_at < cursor_created_at,
+                and_(MoveRequest.created_at == cursor_created_at, MoveRequest.id < cursor_id)
             )
         )
-    
-    # Get total counts
-    total_count = query.count()
-    unread_count = db.query(MoveRequest).filter(
-            and_(
-                MoveRequest.target_user_id == user.id,
-                MoveRequest.is_read == False
-            )
-        ).count()
+    elif offset:
+        query = query.offset(offset)
 
-    # Apply pagination and ordering
-    requests = query.order_by(desc(MoveRequest.created_at)).offset(offset).limit(limit).all()
+    # One extra row tells whether another page exists, so a full last page gets no cursor
+    requests = [row._asdict() for row in query.order_by(
+        desc(MoveRequest.created_at), desc(MoveRequest.id)
+    ).limit(limit + 1).all()]
 
-    return MoveRequestHistoryResponse(
-        target_user_code=user.user_code,
-        requests=[MoveRequestHistoryItem.from_attributes(req) for req in requests],
-        total_count=total_count,
-        unread_count=unread_count
-    )
+    next_cursor = None
+    if len(requests) > limit:
+        requests = requests[:limit]
+        next_cursor = _encode_history_cursor(requests[-1]["created_at"], requests[-1]["id"])
+
+    # Shaped like MoveRequestHistoryResponse; skip response_model revalidation
+    return FastJSONResponse({
+        "target_user_code": user.user_code,
+        "requests": requests,
+        "total_count": total_count,
+        "unread_count": unread_count,
+        "total_is_estimate": total_is_estimate,
+        "next_cursor": next_cursor
+    })
+
+def _encode_history_cursor(created_at: datetime, request_id: int) -> str:
+    """Encode the (created_at, id) position of the last returned row as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{request_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("utf-8")
+
+def _decode_history_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by _encode_history_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("utf-8")).decode("utf-8")
+        created_at_raw, request_id_raw = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at_raw), int(request_id_raw)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid history cursor")
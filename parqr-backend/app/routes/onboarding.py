@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from sqlalchemy.orm import Session
+import logging
+
+from app.db.base import get_db
+from app.dependencies.auth import require_admin_token
+from app.services.onboarding_service import BulkOnboardingService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/v01/onboarding", tags=["onboarding"])
+
+@router.post("/bulk_import", response_model=dict)
+def bulk_import(
+    file: UploadFile = File(..., description="CSV with phone_number, signup_country_iso, license_plate, car_brand, car_model"),
+    chunk_size: int = Query(500, ge=1, le=5000),
+    _: None = Depends(require_admin_token),
+    db: Session = Depends(get_db)
+) -> dict:
+    """
+    Bulk-onboard residents/fleet drivers with their cars from a partner CSV.
+
+    The upload is read as a stream and processed in chunks; each chunk is
+    validated, de-duplicated against existing phone numbers and plates with one
+    set query per table, bulk-inserted and committed before the next is read.
+
+    Args:
+        file: CSV upload (UTF-8, header row required)
+        chunk_size: Rows per validation/insert transaction (1-5000, default 500)
+        db: Database session
+
+    Returns:
+        Summary counts and a per-row report with status created/duplicate/invalid/failed
+
+    Raises:
+        HTTPException: 400 if required CSV columns are missing
+        HTTPException: 403 if the admin token is invalid
+    """
+    logger.info("Bulk onboarding upload received: %s", file.filename)
+
+    try:
+        rows = BulkOnboardingService.iter_csv_rows(file.file)
+        return BulkOnboardingService.import_rows(db, rows, chunk_size=chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
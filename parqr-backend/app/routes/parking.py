@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 from app.schemas.parking_schema import ParkingSessionCreate, ParkingSessionOut, ParkingSessionEnd
@@ -7,6 +8,8 @@ from app.models.parking_session import ParkingSession
 from app.db.base import get_db
 from app.dependencies.auth import get_current_user
 from app.models.car import Car
+from app.responses import FastJSONResponse
+from app.services.parking_archive import get_parking_history as read_parking_history
 from fastapi import HTTPException
 import logging
 
@@ -14,13 +17,16 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/v01/parking")
 
+# Columns projected for list responses, in ParkingSessionOut field order
+SESSION_COLUMNS = [getattr(ParkingSession, name) for name in ParkingSessionOut.model_fields]
+
 @router.post("/start", response_model=ParkingSessionOut)
 def start_parking(
     session_data: ParkingSessionCreate, 
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    logger.info(f"Starting parking session for user_id: {current_user.id}, car_id: {session_data.car_id}")
+    logger.info("Starting parking session for user_id: %s, car_id: %s", current_user.id, session_data.car_id)
     
     # Verify car ownership
     car = db.query(Car).filter(
@@ -33,7 +39,7 @@ def start_parking(
         raise HTTPException(status_code=404, detail="Car not found")
     
     parking_data = session_data.model_dump()
-    logger.info(f"Parking session data: {parking_data}")
+    logger.info("Parking session data: %s", parking_data)
     
     start_time = datetime.now(timezone.utc)
     new_session = ParkingSession(
@@ -46,17 +52,13 @@ def start_parking(
         longitude=session_data.longitude
     )
     
-    logger.info(f"Creating parking session at {start_time}")
+    logger.info("Creating parking session at %s", start_time)
     
     db.add(new_session)
     db.commit()
     db.refresh(new_session)
     
-    # Ensure timezone is included in the response
-    if new_session.start_time.tzinfo is None:
-        new_session.start_time = new_session.start_time.replace(tzinfo=timezone.utc)
-    
-    logger.info(f"Parking session started successfully with ID: {new_session.id}")
+    logger.info("Parking session started successfully with ID: %s", new_session.id)
     return new_session
 
 @router.post("/end", response_model=ParkingSessionOut)
@@ -65,7 +67,7 @@ def end_parking(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    logger.info(f"Ending parking session request for session_id: {data.session_id}, user_id: {current_user.id}")
+    logger.info("Ending parking session request for session_id: %s, user_id: %s", data.session_id, current_user.id)
     
     # Verify session exists and belongs to current user
     session = db.query(ParkingSession).filter(
@@ -80,21 +82,14 @@ def end_parking(
     end_time = datetime.now(timezone.utc)
     session.end_time = end_time
     
-    # Ensure both datetimes are timezone-aware for calculation
-    start_time_aware = session.start_time.replace(tzinfo=timezone.utc) if session.start_time.tzinfo is None else session.start_time
-    duration = end_time - start_time_aware
-    logger.info(f"Ending parking session {data.session_id} at {end_time}, duration: {duration}")
+    # start_time is loaded as an aware UTC datetime (UTCDateTime)
+    duration = end_time - session.start_time
+    logger.info("Ending parking session %s at %s, duration: %s", data.session_id, end_time, duration)
     
     db.commit()
     db.refresh(session)
     
-    # Ensure timezone is included in the response
-    if session.start_time.tzinfo is None:
-        session.start_time = session.start_time.replace(tzinfo=timezone.utc)
-    if session.end_time and session.end_time.tzinfo is None:
-        session.end_time = session.end_time.replace(tzinfo=timezone.utc)
-    
-    logger.info(f"Parking session ended successfully: {data.session_id}")
+    logger.info("Parking session ended successfully: %s", data.session_id)
     return session
 
 @router.get("/active")
@@ -102,24 +97,19 @@ def get_active_sessions(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    logger.info(f"Getting active parking sessions for user_id: {current_user.id}")
+    logger.info("Getting active parking sessions for user_id: %s", current_user.id)
     
-    # Get active sessions (end_time is null) for the current user
-    active_sessions = db.query(ParkingSession).filter(
-        ParkingSession.user_id == current_user.id,
-        ParkingSession.end_time.is_(None)
-    ).all()
+    # Get active sessions (end_time is null) for the current user, as plain rows
+    active_sessions = [dict(row) for row in db.execute(
+        select(*SESSION_COLUMNS).where(
+            ParkingSession.user_id == current_user.id,
+            ParkingSession.end_time.is_(None)
+        )
+    ).mappings()]
     
-    # Ensure timezone is included in the response for all sessions
-    for session in active_sessions:
-        if session.start_time.tzinfo is None:
-            session.start_time = session.start_time.replace(tzinfo=timezone.utc)
-        if session.end_time and session.end_time.tzinfo is None:
-            session.end_time = session.end_time.replace(tzinfo=timezone.utc)
+    logger.info("Found %s active sessions for user %s", len(active_sessions), current_user.id)
     
-    logger.info(f"Found {len(active_sessions)} active sessions for user {current_user.id}")
-    
-    return {"active_sessions": active_sessions}
+    return FastJSONResponse({"active_sessions": active_sessions})
 
 @router.get("/history", response_model=List[ParkingSessionOut])
 def get_parking_history(
@@ -128,15 +118,12 @@ def get_parking_history(
     current_user = Depends(get_current_user)
 ):
     """
-        Get user's parking history with optional limit
+        Get user's parking history with optional limit (recent sessions from MySQL, older ones from the cold archive)
     """
-    logger.info(f"Getting parking history for user: {current_user.id}, limit: {limit}")
+    logger.info("Getting parking history for user: %s, limit: %s", current_user.id, limit)
 
-    sessions = db.query(ParkingSession).filter(
-        ParkingSession.user_id == current_user.id
-    ).order_by(
-        ParkingSession.start_time.desc()
-    ).limit(limit).all()
+    sessions = read_parking_history(db, current_user.id, limit)
 
-    logger.info(f"Found {len(sessions)} parking sessions")
-    return sessions
\ No newline at end of file
+    logger.info("Found %s parking sessions", len(sessions))
+    # Rows are already shaped like ParkingSessionOut; skip response_model revalidation
+    return FastJSONResponse(sessions)
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+import logging
+
+from app.dependencies.auth import require_admin_token
+from app.schemas.profiling_schema import ProfilingToggleRequest
+from app.services.profiling_service import profile_store, profiling_toggle
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/v01/admin/profiling", tags=["profiling"], dependencies=[Depends(require_admin_token)])
+
+def require_profiling_installed() -> None:
+    """The toggle only works when install_profiling added the hooks (PROFILING_ENABLED=true)"""
+    if not profiling_toggle.installed:
+        raise HTTPException(status_code=409, detail="Profiling disabled on this instance (PROFILING_ENABLED is not true)")
+
+@router.get("/toggle", response_model=dict, dependencies=[Depends(require_profiling_installed)])
+def get_profiling_toggle() -> dict:
+    """Current sampled-profiling state of this instance"""
+    return profiling_toggle.status()
+
+@router.put("/toggle", response_model=dict, dependencies=[Depends(require_profiling_installed)])
+def arm_profiling(request: ProfilingToggleRequest) -> dict:
+    """
+    Profile a sample of requests on this instance for a limited time.
+
+    Args:
+        request: Mode (cprofile/sampling/memory), sample rate, duration and optional path prefix
+
+    Returns:
+        The armed toggle state
+
+    Raises:
+        HTTPException: 403 if the admin token is invalid
+        HTTPException: 409 if profiling is not enabled on this instance
+    """
+    profiling_toggle.arm(request.mode, request.sample_rate, request.duration_seconds, request.route_prefix)
+    return profiling_toggle.status()
+
+@router.delete("/toggle", response_model=dict, dependencies=[Depends(require_profiling_installed)])
+def disarm_profiling() -> dict:
+    profiling_toggle.disarm()
+    return profiling_toggle.status()
+
+@router.get("/results", response_model=dict)
+def list_profiles() -> dict:
+    """Stored profiles on this instance, newest first"""
+    return {"profiles": profile_store.list()}
+
+@router.get("/results/{profile_id}")
+def download_profile(profile_id: str) -> FileResponse:
+    """
+    Download a stored profile.
+
+    .prof files load with pstats/snakeviz, .folded with speedscope or flamegraph.pl,
+    .txt (memory) is a plain tracemalloc diff.
+
+    Raises:
+        HTTPException: 404 if the profile does not exist (or was rotated out)
+    """
+    path = profile_store.path_for(profile_id)
+    if path is None or not path.exists():
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
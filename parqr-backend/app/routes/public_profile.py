@@ -8,13 +8,14 @@ from app.models.user import User
 from app.models.car import Car
 from app.models.parking_session import ParkingSession
 from app.schemas.public_profile_schema import PublicProfileResponse
+from app.services.parking_archive import get_parking_history
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/v01/public_profile", tags=["public_profile"])
 
 @router.get("/{user_code}", response_model=PublicProfileResponse)
-async def get_public_profile(
+def get_public_profile(
     user_code: str,
     db: Session = Depends(get_db)
 ) -> PublicProfileResponse:
@@ -82,7 +83,7 @@ async def get_public_profile(
     )
 
 @router.get("/parking_history/{user_code}", response_model=list)
-async def get_public_parking_history(
+def get_public_parking_history(
     user_code: str,
     limit: int=10,
     db: Session = Depends(get_db)
@@ -101,27 +102,24 @@ async def get_public_parking_history(
     Returns:
         List of anonymized parking session data
     """
-    logger.info(f"Getting public parking history for user_code: {user_code}")
+    logger.info("Getting public parking history for user_code: %s", user_code)
 
     user = db.query(User).filter(User.user_code == user_code).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Return anonymized parking data without location info
-    recent_sessions = db.query(ParkingSession).filter(
-        ParkingSession.user_id == user.id,
-        ParkingSession.end_time.isnot(None)
-    ).order_by(ParkingSession.start_time.desc()).limit(limit).all()
+    recent_sessions = get_parking_history(db, user.id, limit, ended_only=True)
 
     anonymized_sessions = []
     for session in recent_sessions:
         anonymized_sessions.append({
-            "id": session.id,
-            "start_time": session.start_time,
-            "end_time": session.end_time,
-            "public_message": session.public_message
+            "id": session["id"],
+            "start_time": session["start_time"],
+            "end_time": session["end_time"],
+            "public_message": session["public_message"]
         })
     
-    logger.info(f"Returning {len(anonymized_sessions)} public parking sessions")
+    logger.info("Returning %s public parking sessions", len(anonymized_sessions))
 
     return anonymized_sessions
\ No newline at end of file
@@ -0,0 +1,104 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session
+import logging
+
+from app.db.base import get_db
+from app.models.user import User
+from app.responses import etag_matches
+from app.services.qr_render_service import QRRenderService, qr_render_cache, MEDIA_TYPES
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/v01/qr", tags=["qr"])
+
+# Content-keyed URLs never change meaning, so clients and CDNs may cache them indefinitely
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# The payload behind a user_code URL can change; caches revalidate with the ETag (cheap 304)
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+@router.get("/{user_code}")
+def get_qr_image(
+    user_code: str,
+    request: Request,
+    fmt: str = Query("png", pattern="^(png|svg)$"),
+    size: int = Query(300, ge=64, le=2048),
+    ec: str = Query("M", pattern="^[LMQH]$"),
+    db: Session = Depends(get_db)
+) -> Response:
+    """
+    Render a user's profile QR code on demand.
+
+    Output is cached by content key (payload + render params) in memory and on
+    disk; repeated requests for the same user and params skip the database and
+    renderer entirely. This URL must be revalidated (ETag); Content-Location
+    points to the immutable content-keyed URL of the same image.
+
+    Args:
+        user_code: 8-character user code
+        fmt: Image format, 'png' or 'svg'
+        size: Target edge length in pixels (64-2048, default 300)
+        ec: Error correction level L/M/Q/H (default M)
+        db: Database session
+
+    Returns:
+        Image response with ETag, no-cache and Content-Location headers
+
+    Raises:
+        HTTPException: 404 if user not found
+    """
+    alias = (user_code, fmt, size, ec)
+    key = qr_render_cache.resolve_alias(alias)
+    content = qr_render_cache.get(key, fmt) if key else None
+
+    if content is None:
+        user = db.query(User.profile_deep_link).filter(User.user_code == user_code).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        payload = user.profile_deep_link or f"https://parqr.app/profile/{user_code}"
+        box_size = QRRenderService.box_size(payload, size, ec)
+        key = QRRenderService.content_key(payload, fmt, box_size, ec)
+        content = qr_render_cache.get(key, fmt)
+        if content is None:
+            content = QRRenderService.render(payload, fmt=fmt, size=size, error_correction=ec)
+            logger.info("Rendered QR for %s: %s %spx EC=%s", user_code, fmt, size, ec)
+        qr_render_cache.put(key, fmt, content, alias=alias)
+
+    etag = f'"{key}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": REVALIDATE_CACHE_CONTROL,
+        "Content-Location": request.app.url_path_for("get_qr_image_by_key", key=key, fmt=fmt)
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=content, media_type=MEDIA_TYPES[fmt], headers=headers)
+
+@router.get("/by-key/{key}.{fmt}")
+def get_qr_image_by_key(key: str, fmt: str, request: Request) -> Response:
+    """
+    Serve a cached render by its content key (see Content-Location of GET /v01/qr/{user_code}).
+
+    Args:
+        key: Content key (SHA-256 hex of payload and render params)
+        fmt: Image format, 'png' or 'svg'
+
+    Returns:
+        Image response with ETag and immutable Cache-Control headers
+
+    Raises:
+        HTTPException: 404 if no render with that key is cached
+    """
+    if fmt not in MEDIA_TYPES or len(key) != 64 or not all(c in "0123456789abcdef" for c in key):
+        raise HTTPException(status_code=404, detail="QR image not found")
+
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    content = qr_render_cache.get(key, fmt)
+    if content is None:
+        raise HTTPException(status_code=404, detail="QR image not found")
+    return Response(content=content, media_type=MEDIA_TYPES[fmt], headers=headers)
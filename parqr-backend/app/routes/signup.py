@@ -4,19 +4,12 @@ from app.db.base import get_db
 from app.models.user import User
 from app.schemas.user_schema import UserRegisterRequest, UserResponse, UserPublicResponse
 from app.dependencies.auth import get_current_user
+from scripts.country_codes import get_servicing_countries_list
 import secrets
 import string
 import hashlib
 import uuid
 import logging
-import sys
-from pathlib import Path
-
-# Add scripts directory to path for imports
-scripts_dir = Path(__file__).parent.parent.parent / "scripts"
-sys.path.insert(0, str(scripts_dir))
-
-from country_codes import get_servicing_countries_list, is_valid_country_iso
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +22,7 @@ def get_servicing_countries():
     
     try:
         countries = get_servicing_countries_list()
-        logger.info(f"Returning {len(countries)} servicing countries")
+        logger.info("Returning %s servicing countries", len(countries))
         return {"countries": countries}
     except Exception as e:
         logger.error(f"Error fetching servicing countries: {e}")
@@ -1,139 +1,89 @@
-from dotenv import load_dotenv
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from app.db.base import get_db
 from app.models.user import User
 from app.models.car import Car
 from app.models.parking_session import ParkingSession
 from app.schemas.user_schema import UserRegisterRequest, UserResponse, UserPublicResponse, UserWithCarsResponse
 from app.dependencies.auth import get_current_user
-from app.services.qr_service import QRCodeService
-import secrets
-import string
-import hashlib
-import uuid
+from app.services.qr_render_queue import qr_render_queue
+from app.services.user_code_service import generate_user_code, generate_qr_code_id, build_profile_deep_link
+from app.services.phone_validation import normalize_phone_number, PhoneValidationError
+from scripts.country_codes import is_valid_country_iso
 import logging
-import sys
-from pathlib import Path
-import os
 
-load_dotenv(override=True)
-
-# Add scripts directory to path for imports
-scripts_dir = Path(__file__).parent.parent.parent / "scripts"
-sys.path.insert(0, str(scripts_dir))
-
-from country_codes import get_servicing_countries_list, is_valid_country_iso
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/v01/user", tags=["user"])
 
-def generate_user_code() -> str:
-    """Generate 8-character alphanumeric user code"""
-    return ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(8))
-
-def generate_qr_code_id(user_code: str, phone_number: str) -> str:
-    """
-    Generate unique QR code ID based on user data
-    Format: QR_[8-char-hash] for easy identification
-    """
-    # Create unique string from user data + timestamp
-    unique_string = f"{user_code}_{phone_number}_{uuid.uuid4().hex[:8]}"
-    
-    # Generate SHA-256 hash and take first 8 characters
-    hash_object = hashlib.sha256(unique_string.encode())
-    short_hash = hash_object.hexdigest()[:8].upper()
-    
-    return f"QR_{short_hash}"
+# Unique-constraint retries before giving up; collisions are vanishingly rare (see scripts/bench_code_allocation.py)
+MAX_CODE_ALLOCATION_ATTEMPTS = 5
 
 @router.post("/register", response_model=UserResponse)
 def register_user(
     user_data: UserRegisterRequest,
     db: Session = Depends(get_db)
 ):
-    logger.info(f"User registration attempt for phone: {user_data.phone_number}, country: {user_data.signup_country_iso}")
+    logger.info("User registration attempt for phone: %s, country: %s", user_data.phone_number, user_data.signup_country_iso)
     
     # Validate country ISO code
     if not is_valid_country_iso(user_data.signup_country_iso):
         raise HTTPException(status_code=400, detail="Invalid country code - country not serviced")
     
-    # Basic validation for Korean mobile format (assuming South Korea for now)
-    if user_data.signup_country_iso.upper() == "KR":
-        if len(user_data.phone_number) != 11:
-            raise HTTPException(status_code=400, detail="Phone number must be 11 digits")
-        
-        if not user_data.phone_number.isdigit():
-            raise HTTPException(status_code=400, detail="Phone number must contain only digits")
-        
-        if not user_data.phone_number.startswith("010"):
-            raise HTTPException(status_code=400, detail="Invalid mobile phone number format")
-        
-        # Transform to international format
-        phone_number_parse = user_data.phone_number[1:]
-        phone_number_clean = f"+82{phone_number_parse}"
-    else:
-        # For other countries, basic validation for now
-        if not user_data.phone_number.replace("+", "").replace("-", "").replace(" ", "").isdigit():
-            raise HTTPException(status_code=400, detail="Phone number must contain only digits and valid separators")
-        
-        # Store as-is for other countries (will enhance later)
-        phone_number_clean = user_data.phone_number
-    
-    # Check if phone number already exists
-    existing_user = db.query(User).filter(User.phone_number == phone_number_clean).first()
-    if existing_user:
-        logger.warning(f"Registration failed - phone number already exists: {user_data.phone_number}")
-        raise HTTPException(status_code=400, detail="Phone number already registered")
+    try:
+        phone_number_clean = normalize_phone_number(user_data.phone_number, user_data.signup_country_iso)
+    except PhoneValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Generate unique user_code
-    user_code = generate_user_code()
-    while db.query(User).filter(User.user_code == user_code).first():
-        logger.debug(f"User code collision, regenerating: {user_code}")
+    # Insert-and-retry on the unique constraints instead of SELECT-ing for collisions:
+    # a fresh code almost never collides, so the common path is a single INSERT
+    for attempt in range(1, MAX_CODE_ALLOCATION_ATTEMPTS + 1):
         user_code = generate_user_code()
-    
-    # Generate QR code ID 
-    qr_code_id = generate_qr_code_id(user_code, phone_number_clean)
+        qr_code_id = generate_qr_code_id(user_code, phone_number_clean)
+        profile_deep_link = build_profile_deep_link(user_code)
+
+        new_user = User(
+            phone_number=phone_number_clean,
+            user_code=user_code,
+            qr_code_id=qr_code_id,
+            signup_country_iso=user_data.signup_country_iso.upper(),
+            profile_deep_link=profile_deep_link,
+            profile_display_name=user_code,
+            profile_bio=None,
+            qr_image_path=None # Set by the render queue once the image is written
+        )
 
-    # Generate profile deep link URL
-    if os.getenv("DEV_MODE", "false").lower() == "true":
-        profile_deep_link = f"exp://192.168.1.39:19006/--/profile/{user_code}"
+        db.add(new_user)
+        try:
+            db.commit()
+            break
+        except IntegrityError as e:
+            db.rollback()
+            if "phone_number" in str(e.orig):
+                logger.warning(f"Registration failed - phone number already exists: {user_data.phone_number}")
+                raise HTTPException(status_code=400, detail="Phone number already registered")
+            logger.debug("Code collision on attempt %s, regenerating: %s / %s", attempt, user_code, qr_code_id)
     else:
-        # production deep link when ready. Placeholder for now.
-        profile_deep_link = f"https://parqr.app/profile/{user_code}"
-    
-    logger.info(f"Generated user_code: {user_code}, qr_code_id: {qr_code_id}")
+        logger.error("Failed to allocate unique user codes after retries")
+        raise HTTPException(status_code=500, detail="Failed to allocate user code, please retry")
+
+    db.refresh(new_user)
+    logger.info("Generated user_code: %s, qr_code_id: %s", user_code, qr_code_id)
 
-    # Generate QR code image for physical card before saving user
+    # Render QR image for physical card off the request path - don't block user registration
     try:
-        qr_image_path = QRCodeService.generate_profile_qr_image(
+        qr_render_queue.submit(
+            user_id=new_user.id,
             user_code=user_code,
             qr_code_id=qr_code_id,
-            profile_url=profile_deep_link,
-            display_name=user_code  # Using user_code as default display name
+            profile_url=profile_deep_link
         )
-        logger.info(f"Generated QR image: {qr_image_path}")
     except Exception as e:
-        logger.error(f"Failed to generate QR image for {user_code}: {str(e)}")
-        # Set to None if QR generation fails - don't block user registration
-        qr_image_path = None
+        logger.error(f"Failed to queue QR image for {user_code}: {str(e)}")
     
-    new_user = User(
-        phone_number=phone_number_clean,
-        user_code=user_code,
-        qr_code_id=qr_code_id,
-        signup_country_iso=user_data.signup_country_iso.upper(),
-        profile_deep_link=profile_deep_link,
-        profile_display_name=user_code,
-        profile_bio=None,
-        qr_image_path=qr_image_path
-    )
-    
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    
-    logger.info(f"User registered successfully with ID: {new_user.id}")
+    logger.info("User registered successfully with ID: %s", new_user.id)
     return new_user
 
 @router.get("/profile", response_model=UserResponse)
@@ -166,7 +116,7 @@ def lookup_user(
     db: Session = Depends(get_db)
 ):
     """Look up user by user_code or QR code ID for sign-in flow"""
-    logger.info(f"User lookup request for identifier: {lookup_code}")
+    logger.info("User lookup request for identifier: %s", lookup_code)
     
     # Check if it's a QR code ID format (starts with QR_)
     if lookup_code.startswith("QR_"):
@@ -225,7 +175,7 @@ def lookup_user(
         public_message = active_parking_sessions.public_message if active_parking_sessions else None
     )
     
-    logger.info(f"User lookup successful: {user.user_code} with {len(cars_data)} cars")
+    logger.info("User lookup successful: %s with %s cars", user.user_code, len(cars_data))
     return response_data
 
 @router.post("/regenerate-qr", response_model=UserResponse)
@@ -234,22 +184,25 @@ def regenerate_user_qr_code(
     db: Session = Depends(get_db)
 ):
     """Regenerate QR code for existing user"""
-    logger.info(f"QR code regeneration requested for user_id: {current_user.id}")
+    logger.info("QR code regeneration requested for user_id: %s", current_user.id)
     
     old_qr_code = current_user.qr_code_id
     
-    # Generate new QR code ID
-    qr_code_id = generate_qr_code_id(current_user.user_code, current_user.phone_number)
-    
-    # Ensure uniqueness
-    while db.query(User).filter(User.qr_code_id == qr_code_id).first():
-        logger.debug(f"QR code collision during regeneration: {qr_code_id}")
+    # Insert-and-retry on the qr_code_id unique constraint (no SELECT per candidate)
+    for attempt in range(1, MAX_CODE_ALLOCATION_ATTEMPTS + 1):
         qr_code_id = generate_qr_code_id(current_user.user_code, current_user.phone_number)
-    
-    # Update user with new QR code
-    current_user.qr_code_id = qr_code_id
-    db.commit()
+        current_user.qr_code_id = qr_code_id
+        try:
+            db.commit()
+            break
+        except IntegrityError:
+            db.rollback()
+            logger.debug("QR code collision during regeneration: %s", qr_code_id)
+    else:
+        logger.error(f"Failed to allocate unique QR code for user_id: {current_user.id}")
+        raise HTTPException(status_code=500, detail="Failed to regenerate QR code, please retry")
+
     db.refresh(current_user)
     
-    logger.info(f"QR code regenerated: {old_qr_code} -> {qr_code_id}")
+    logger.info("QR code regenerated: %s -> %s", old_qr_code, qr_code_id)
     return current_user
\ No newline at end of file
@@ -0,0 +1,32 @@
+from typing import Any, List, Literal, Optional
+from pydantic import BaseModel, Field, field_validator
+
+class BatchItem(BaseModel):
+    '''
+    One sub-request of a batch: a GET to an existing /api route
+    '''
+    id: Optional[str] = Field(None, max_length=64)  # Echoed back so clients can match responses
+    method: Literal["GET"] = "GET"
+    path: str = Field(..., max_length=2048)  # May include a query string
+
+    @field_validator('path')
+    def validate_path(cls, v):
+        if not v.startswith("/api/"):
+            raise ValueError("Path must start with /api/")
+        if v.split("?", 1)[0].rstrip("/") == "/api/batch":
+            raise ValueError("Batches cannot be nested")
+        return v
+
+class BatchRequest(BaseModel):
+    '''
+    Schema for POST /api/batch
+    '''
+    requests: List[BatchItem] = Field(..., min_length=1)
+
+class BatchItemResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    body: Any = None
+
+class BatchResponse(BaseModel):
+    responses: List[BatchItemResponse]
@@ -87,6 +87,8 @@ class MoveRequestHistoryResponse(BaseModel):
     requests: List[MoveRequestHistoryItem]
     total_count: int
     unread_count: int
+    total_is_estimate: bool = False # True when total_count is a capped lower bound
+    next_cursor: Optional[str] = None # Pass as cursor to fetch the next page
 
     model_config = {"from_attributes": True}
 
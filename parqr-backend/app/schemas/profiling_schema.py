@@ -0,0 +1,19 @@
+from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+
+from app.services.profiling_service import PROFILE_MODES
+
+class ProfilingToggleRequest(BaseModel):
+    '''
+    Schema for arming sampled request profiling
+    '''
+    mode: str = "cprofile"
+    sample_rate: float = Field(0.01, gt=0, le=1)
+    duration_seconds: int = Field(300, ge=1, le=3600)
+    route_prefix: Optional[str] = None
+
+    @field_validator('mode')
+    def validate_mode(cls, v):
+        if v not in PROFILE_MODES:
+            raise ValueError(f"Mode must be one of: {', '.join(PROFILE_MODES)}")
+        return v
@@ -14,7 +14,7 @@ class PublicProfileResponse(BaseModel):
     active_car: Optional[Dict[str, Any]] = None
 
     # Current Parking status
-    parking_status: Dict[str, Any]
+    parking_status: str  # "active" or "notParked"
 
     # Public message (if any)
     public_message: Optional[str] = None
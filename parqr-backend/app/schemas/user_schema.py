@@ -40,6 +40,6 @@ class UserWithCarsResponse(BaseModel):
     user_tier: str = "basic"  # User tier for feature gating
     cars: list[dict] = [] # populated with car data
     parking_status: Literal["active", "not_parked"] = "not_parked"
-    public_message = Optional[str] = None
+    public_message: Optional[str] = None
 
     model_config = {"from_attributes": True}
\ No newline at end of file
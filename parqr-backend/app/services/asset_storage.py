@@ -0,0 +1,194 @@
+import hashlib
+import os
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Asset keys are content hashes, so a stored object never changes once written
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Public URL prefix the assets route is mounted under
+ASSET_ROUTE_PREFIX = "/api/v01/assets"
+
+class AssetStorage(ABC):
+    """
+    Interface for QR/asset storage backends.
+
+    Assets are stored under content-hashed keys (e.g. 'qr/3f2a...e1.png'), which
+    makes them immutable and safe to cache forever at every layer.
+    """
+
+    name = "base"
+
+    def __init__(self, public_base_url: Optional[str] = None):
+        self.public_base_url = public_base_url.rstrip("/") if public_base_url else None
+
+    @staticmethod
+    def hashed_key(content: bytes, prefix: str, extension: str) -> str:
+        """Build the immutable content-addressed key for an asset"""
+        digest = hashlib.sha256(content).hexdigest()[:32]
+        return f"{prefix}/{digest}.{extension}"
+
+    @staticmethod
+    def etag_for(key: str) -> str:
+        """Strong ETag derived from the content hash embedded in the key"""
+        return f'"{Path(key).stem}"'
+
+    def save(self, content: bytes, prefix: str, extension: str, content_type: str) -> str:
+        """Store content under its hashed key and return the key"""
+        key = self.hashed_key(content, prefix, extension)
+        if not self.exists(key):
+            self._write(key, content, content_type)
+        return key
+
+    def url_for(self, key: str) -> str:
+        """Public URL for a stored asset (CDN/bucket URL if configured, else the API route)"""
+        if self.public_base_url:
+            return f"{self.public_base_url}/{key}"
+        return f"{ASSET_ROUTE_PREFIX}/{key}"
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Filesystem path of the asset when it is served from local disk, else None"""
+        return None
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Whether an asset is stored under key"""
+
+    @abstractmethod
+    def read(self, key: str) -> Optional[bytes]:
+        """Asset bytes, or None if nothing is stored under key"""
+
+    @abstractmethod
+    def _write(self, key: str, content: bytes, content_type: str) -> None:
+        """Store content under key; called by save() only for keys not stored yet"""
+
+class LocalAssetStorage(AssetStorage):
+    """Stores assets on the local filesystem (single instance / development)"""
+
+    name = "local"
+
+    def __init__(self, root: Optional[Path] = None, public_base_url: Optional[str] = None):
+        super().__init__(public_base_url)
+        self.root = Path(root or os.getenv("ASSET_STORAGE_DIR") or Path(__file__).parent.parent.parent / "assets")
+
+    def _resolve(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        # Reject keys that escape the storage root (e.g. '../')
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Invalid asset key: {key}")
+        return path
+
+    def local_path(self, key: str) -> Optional[Path]:
+        path = self._resolve(key)
+        return path if path.is_file() else None
+
+    def exists(self, key: str) -> bool:
+        return self._resolve(key).is_file()
+
+    def read(self, key: str) -> Optional[bytes]:
+        path = self.local_path(key)
+        return path.read_bytes() if path else None
+
+    def _write(self, key: str, content: bytes, content_type: str) -> None:
+        path = self._resolve(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+
+class InMemoryObjectStoreClient:
+    """Fake object-store client with the subset of the API used by ObjectStoreAssetStorage"""
+
+    def __init__(self):
+        self._objects: Dict[tuple[str, str], tuple[bytes, dict]] = {}
+        self._lock = threading.Lock()
+
+    def put_object(self, bucket: str, key: str, body: bytes, content_type: str, cache_control: str) -> None:
+        with self._lock:
+            self._objects[(bucket, key)] = (body, {"content_type": content_type, "cache_control": cache_control})
+
+    def get_object(self, bucket: str, key: str) -> Optional[bytes]:
+        with self._lock:
+            stored = self._objects.get((bucket, key))
+        return stored[0] if stored else None
+
+    def head_object(self, bucket: str, key: str) -> bool:
+        with self._lock:
+            return (bucket, key) in self._objects
+
+class GCSObjectStoreClient:
+    """Google Cloud Storage adapter (requires the google-cloud-storage package)"""
+
+    def __init__(self):
+        from google.cloud import storage  # Imported lazily; only needed when this backend is selected
+        self._client = storage.Client()
+
+    def put_object(self, bucket: str, key: str, body: bytes, content_type: str, cache_control: str) -> None:
+        blob = self._client.bucket(bucket).blob(key)
+        blob.cache_control = cache_control
+        blob.upload_from_string(body, content_type=content_type)
+
+    def get_object(self, bucket: str, key: str) -> Optional[bytes]:
+        blob = self._client.bucket(bucket).blob(key)
+        return blob.download_as_bytes() if blob.exists() else None
+
+    def head_object(self, bucket: str, key: str) -> bool:
+        return self._client.bucket(bucket).blob(key).exists()
+
+class ObjectStoreAssetStorage(AssetStorage):
+    """Stores assets in an object store bucket shared by all API instances"""
+
+    name = "object"
+
+    def __init__(self, client, bucket: str, public_base_url: Optional[str] = None):
+        super().__init__(public_base_url)
+        self.client = client
+        self.bucket = bucket
+
+    def exists(self, key: str) -> bool:
+        return self.client.head_object(self.bucket, key)
+
+    def read(self, key: str) -> Optional[bytes]:
+        return self.client.get_object(self.bucket, key)
+
+    def _write(self, key: str, content: bytes, content_type: str) -> None:
+        self.client.put_object(self.bucket, key, content, content_type, IMMUTABLE_CACHE_CONTROL)
+
+_asset_storage: Optional[AssetStorage] = None
+
+def get_asset_storage() -> AssetStorage:
+    """
+    Return the process-wide asset storage configured by ASSET_STORAGE_BACKEND.
+
+    Backends:
+        local  - filesystem under ASSET_STORAGE_DIR (default)
+        memory - in-memory fake object store (tests only; not shared across processes)
+        gcs    - Google Cloud Storage bucket ASSET_STORAGE_BUCKET
+    """
+    global _asset_storage
+    if _asset_storage is None:
+        backend = os.getenv("ASSET_STORAGE_BACKEND", "local").lower()
+        public_base_url = os.getenv("ASSET_PUBLIC_BASE_URL")
+        if backend == "local":
+            _asset_storage = LocalAssetStorage(public_base_url=public_base_url)
+        elif backend == "memory":
+            _asset_storage = ObjectStoreAssetStorage(InMemoryObjectStoreClient(), "parqr-assets", public_base_url)
+        elif backend == "gcs":
+            _asset_storage = ObjectStoreAssetStorage(
+                GCSObjectStoreClient(), os.environ["ASSET_STORAGE_BUCKET"], public_base_url
+            )
+        else:
+            raise ValueError(f"Unknown asset storage backend: {backend}")
+        logger.info("Using asset storage backend: %s", backend)
+    return _asset_storage
+
+def set_asset_storage(storage: Optional[AssetStorage]) -> None:
+    """Override the process-wide storage (tests, scripts)"""
+    global _asset_storage
+    _asset_storage = storage
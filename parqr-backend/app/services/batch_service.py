@@ -0,0 +1,148 @@
+"""
+In-process execution of /api/batch sub-requests.
+
+Mobile screens that fire several independent GETs can send them as one
+batch and pay for TLS, auth and session setup once. Each sub-request is
+dispatched through the full ASGI app (middleware, routing, validation), so
+it behaves and is measured exactly like the standalone call, but:
+
+- the user named by X-User-Code is resolved once and reused by
+  get_current_user in every sub-request;
+- all sub-requests share one SQLAlchemy session (replica-eligible like any
+  GET). A Session is not thread-safe, so sub-requests take turns on it
+  (app/db/base.py: batch_session_turn) while everything else, such as
+  middleware and JSON rendering, overlaps up to BATCH_CONCURRENCY;
+- a failing sub-request only fails its own item; every item carries its own
+  status code.
+
+Only GETs are batched, so a retried batch is always safe.
+
+Env variables:
+    BATCH_MAX_REQUESTS: Most sub-requests accepted in one batch (default: 10)
+    BATCH_CONCURRENCY: Sub-requests in flight at once per batch (default: 4)
+"""
+
+import os
+from typing import List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+import logging
+
+import anyio
+import orjson
+from prometheus_client import Histogram
+from sqlalchemy.orm import Session
+
+from app.db.base import BATCH_SCOPE_KEY
+from app.models.user import User
+from app.schemas.batch_schema import BatchItem
+
+logger = logging.getLogger(__name__)
+
+# Parent headers that describe the batch body or its encoding, not the sub-requests
+EXCLUDED_HEADERS = {b"content-length", b"content-type", b"accept-encoding", b"transfer-encoding", b"expect"}
+
+BATCH_SIZE = Histogram(
+    "parqr_batch_requests",
+    "Sub-requests per /api/batch call",
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10, 15, 20)
+)
+
+class BatchContext:
+    """State shared by the sub-requests of one batch, stored in their ASGI scope"""
+
+    def __init__(self, db: Session, user: Optional[User] = None):
+        self.db = db
+        self.user = user
+        self.session_lock = anyio.Lock()
+
+class BatchExecutor:
+    """Runs batch items through the app with bounded concurrency, keeping request order"""
+
+    def __init__(self, max_requests: Optional[int] = None, concurrency: Optional[int] = None):
+        # Read in __init__ (not as default args) so .env values loaded at startup apply
+        self.max_requests = max_requests if max_requests is not None else int(os.getenv("BATCH_MAX_REQUESTS", "10"))
+        self.concurrency = concurrency if concurrency is not None else int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+    async def run(self, app, parent_scope, context: BatchContext, items: List[BatchItem]) -> List[dict]:
+        BATCH_SIZE.observe(len(items))
+        limiter = anyio.CapacityLimiter(max(1, self.concurrency))
+        results: List[Optional[dict]] = [None] * len(items)
+
+        async def run_item(index: int, item: BatchItem):
+            async with limiter:
+                status, body = await self._dispatch(app, parent_scope, context, item)
+            results[index] = {"id": item.id, "status": status, "body": body}
+
+        async with anyio.create_task_group() as task_group:
+            for index, item in enumerate(items):
+                task_group.start_soon(run_item, index, item)
+        return results
+
+    async def _dispatch(self, app, parent_scope, context: BatchContext, item: BatchItem) -> Tuple[int, object]:
+        url = urlsplit(item.path)
+        scope = {
+            "type": "http",
+            "asgi": parent_scope.get("asgi", {"version": "3.0"}),
+            "http_version": parent_scope.get("http_version", "1.1"),
+            "method": item.method,
+            "scheme": parent_scope.get("scheme", "http"),
+            "server": parent_scope.get("server"),
+            "client": parent_scope.get("client"),
+            "root_path": parent_scope.get("root_path", ""),
+            "path": unquote(url.path),
+            "raw_path": url.path.encode("latin-1", "replace"),
+            "query_string": url.query.encode("latin-1", "replace"),
+            "headers": [(name, value) for name, value in parent_scope["headers"] if name not in EXCLUDED_HEADERS],
+            "state": dict(parent_scope.get("state", {})),
+            BATCH_SCOPE_KEY: context,
+        }
+
+        request_sent = False
+        never = anyio.Event()
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Sub-requests have no body and no client to disconnect
+            await never.wait()
+            return {"type": "http.disconnect"}
+
+        status = None
+        content_type = b""
+        chunks = []
+
+        async def send(message):
+            nonlocal status, content_type
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"content-type":
+                        content_type = value.lower()
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await app(scope, receive, send)
+        except Exception:
+            # The error middleware has already logged it and usually sent a 500
+            logger.exception("Batch sub-request failed: GET %s", url.path)
+            if status is None:
+                return 500, {"detail": "Internal Server Error"}
+        return status, _decode_body(content_type, b"".join(chunks))
+
+def _decode_body(content_type: bytes, body: bytes):
+    if not body:
+        return None
+    if b"json" in content_type:
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return body.decode("utf-8", "replace")
+    if content_type.startswith(b"text/"):
+        return body.decode("utf-8", "replace")
+    # Binary bodies (QR PNGs) cannot be embedded; fetch them directly
+    return None
+
+batch_executor = BatchExecutor()
@@ -0,0 +1,243 @@
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Type
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.notification_outbox import NotificationOutbox
+
+logger = logging.getLogger(__name__)
+
+class NotificationProvider(ABC):
+    """Interface for notification delivery backends (push, SMS, ...)"""
+
+    name = "base"
+
+    @abstractmethod
+    def send(self, recipient_user_id: int, notification: dict) -> None:
+        """
+        Deliver one coalesced notification to a recipient.
+
+        Args:
+            recipient_user_id: ID of the user being notified
+            notification: Coalesced notification body built by the dispatcher
+
+        Raises:
+            Exception: Any exception marks the delivery as failed and schedules a retry
+        """
+
+class LocalNotificationProvider(NotificationProvider):
+    """In-process provider that records deliveries instead of sending them (dev and tests)"""
+
+    name = "local"
+
+    def __init__(self, fail_times: int = 0):
+        self.delivered: List[tuple[int, dict]] = []
+        self._fail_times = fail_times  # Simulate flaky delivery for retry testing
+
+    def send(self, recipient_user_id: int, notification: dict) -> None:
+        if self._fail_times > 0:
+            self._fail_times -= 1
+            raise RuntimeError("Simulated delivery failure")
+
+        self.delivered.append((recipient_user_id, notification))
+        logger.info("Local notification for user_id %s: %s", recipient_user_id, notification["summary"])
+
+NOTIFICATION_PROVIDERS: Dict[str, Type[NotificationProvider]] = {
+    LocalNotificationProvider.name: LocalNotificationProvider,
+}
+
+def register_notification_provider(provider_cls: Type[NotificationProvider]) -> None:
+    """Make a provider selectable through the NOTIFICATION_PROVIDER env variable"""
+    NOTIFICATION_PROVIDERS[provider_cls.name] = provider_cls
+
+def get_notification_provider() -> NotificationProvider:
+    """Instantiate the provider configured by NOTIFICATION_PROVIDER (default: local)"""
+    provider_name = os.getenv("NOTIFICATION_PROVIDER", "local").lower()
+    if provider_name not in NOTIFICATION_PROVIDERS:
+        raise ValueError(f"Unknown notification provider: {provider_name}")
+    return NOTIFICATION_PROVIDERS[provider_name]()
+
+class NotificationService:
+
+    @staticmethod
+    def enqueue(
+        db: Session,
+        recipient_user_id: int,
+        event_type: str,
+        payload: dict
+    ) -> NotificationOutbox:
+        """
+        Add a notification to the outbox within the caller's transaction.
+
+        The row is only visible to the dispatcher once the caller commits, so the
+        notification is written atomically with the domain change that produced it.
+        """
+        outbox_row = NotificationOutbox(
+            recipient_user_id=recipient_user_id,
+            event_type=event_type,
+            payload=json.dumps(payload, default=str),
+            status="pending",
+            attempts=0,
+            next_attempt_at=datetime.now(timezone.utc)
+        )
+        db.add(outbox_row)
+        return outbox_row
+
+    @staticmethod
+    def coalesce(recipient_user_id: int, rows: List[NotificationOutbox]) -> dict:
+        """Collapse all pending rows for one recipient into a single notification"""
+        counts: Dict[str, int] = {}
+        for row in rows:
+            counts[row.event_type] = counts.get(row.event_type, 0) + 1
+
+        latest = rows[-1]
+        if counts.get("move_request", 0) > 1:
+            summary = f"You have {counts['move_request']} new move requests"
+        elif counts.get("move_request"):
+            summary = "Someone has requested you to move your car"
+        else:
+            summary = f"You have {len(rows)} new notifications"
+
+        return {
+            "recipient_user_id": recipient_user_id,
+            "summary": summary,
+            "counts": counts,
+            "latest_event_type": latest.event_type,
+            "latest_payload": json.loads(latest.payload),
+            "outbox_ids": [row.id for row in rows]
+        }
+
+class NotificationDispatcher:
+    """
+    Background worker that drains the notification outbox.
+
+    Pending rows are fetched in batches, grouped per recipient and delivered as one
+    coalesced notification. Failed deliveries are retried with exponential backoff
+    until max_attempts is reached, after which the rows are marked 'failed'.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        provider: Optional[NotificationProvider] = None,
+        poll_interval: float = float(os.getenv("NOTIFICATION_POLL_INTERVAL", "2.0")),
+        batch_size: int = int(os.getenv("NOTIFICATION_BATCH_SIZE", "200")),
+        max_attempts: int = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "5")),
+        base_backoff_seconds: float = float(os.getenv("NOTIFICATION_BASE_BACKOFF", "5.0"))
+    ):
+        self.session_factory = session_factory
+        self._provider = provider
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.base_backoff_seconds = base_backoff_seconds
+
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def provider(self) -> NotificationProvider:
+        # Resolved lazily so env configuration is read after dotenv loading
+        if self._provider is None:
+            self._provider = get_notification_provider()
+        return self._provider
+
+    def dispatch_pending(self) -> int:
+        """
+        Run one dispatch pass over due outbox rows.
+
+        Returns:
+            Number of coalesced notifications delivered successfully
+        """
+        db = self.session_factory()
+        delivered = 0
+        try:
+            now = datetime.now(timezone.utc)
+            rows = db.query(NotificationOutbox).filter(
+                NotificationOutbox.status == "pending",
+                NotificationOutbox.next_attempt_at <= now
+            ).order_by(NotificationOutbox.id).limit(self.batch_size).with_for_update(skip_locked=True).all()
+
+            if not rows:
+                db.commit()
+                return 0
+
+            # Group per recipient, preserving arrival order
+            by_recipient: "OrderedDict[int, List[NotificationOutbox]]" = OrderedDict()
+            for row in rows:
+                by_recipient.setdefault(row.recipient_user_id, []).append(row)
+
+            for recipient_user_id, recipient_rows in by_recipient.items():
+                notification = NotificationService.coalesce(recipient_user_id, recipient_rows)
+                try:
+                    self.provider.send(recipient_user_id, notification)
+                except Exception as e:
+                    logger.warning("Notification delivery failed for user_id %s: %s", recipient_user_id, e)
+                    self._schedule_retry(recipient_rows, str(e), now)
+                    continue
+
+                for row in recipient_rows:
+                    row.status = "sent"
+                    row.attempts += 1
+                    row.sent_at = now
+                delivered += 1
+
+            db.commit()
+            logger.debug("Dispatched %d notifications from %d outbox rows", delivered, len(rows))
+            return delivered
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _schedule_retry(self, rows: List[NotificationOutbox], error: str, now: datetime) -> None:
+        for row in rows:
+            row.attempts += 1
+            row.last_error = error[:255]
+            if row.attempts >= self.max_attempts:
+                row.status = "failed"
+            else:
+                backoff = self.base_backoff_seconds * (2 ** (row.attempts - 1))
+                row.next_attempt_at = now + timedelta(seconds=backoff)
+
+    def wake(self) -> None:
+        """Signal the worker that new rows were committed, skipping the poll wait"""
+        self._wake_event.set()
+
+    def start(self) -> None:
+        """Start the background dispatcher thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="notification-dispatcher", daemon=True)
+        self._thread.start()
+        logger.info("Notification dispatcher started with provider: %s", self.provider.name)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background dispatcher thread and wait for the current pass to finish"""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.dispatch_pending()
+            except Exception as e:
+                logger.error(f"Notification dispatch pass failed: {str(e)}")
+            self._wake_event.wait(self.poll_interval)
+            self._wake_event.clear()
+
+# Shared dispatcher used by the API process
+notification_dispatcher = NotificationDispatcher()
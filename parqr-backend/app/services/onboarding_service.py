@@ -0,0 +1,248 @@
+import csv
+import io
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+import logging
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.car import Car
+from app.models.user import User
+from app.schemas.car_schema import CarRegisterRequest
+from app.services.phone_validation import validate_phone_numbers, PhoneValidationResult
+from app.services.qr_render_queue import qr_render_queue
+from app.services.user_code_service import generate_user_code, generate_qr_code_id, build_profile_deep_link
+from scripts.country_codes import is_valid_country_iso
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ("phone_number", "signup_country_iso", "license_plate", "car_brand", "car_model")
+
+# Chunk-level retries when freshly generated codes collide on insert
+MAX_CHUNK_INSERT_ATTEMPTS = 3
+
+class BulkOnboardingService:
+    """
+    Bulk user + car import for B2B partners (apartment complexes, fleets).
+
+    Rows are processed in chunks: each chunk is validated in memory, checked for
+    existing phone numbers and plates with one set query per table, inserted with
+    executemany INSERTs, committed, and its QR renders are queued.
+    """
+
+    @staticmethod
+    def iter_csv_rows(stream: io.IOBase) -> Iterator[dict]:
+        """Stream rows from a CSV file object (bytes or text) without loading it fully"""
+        text_stream = stream if isinstance(stream, io.TextIOBase) else io.TextIOWrapper(stream, encoding="utf-8-sig")
+        reader = csv.DictReader(text_stream)
+        missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+        yield from reader
+
+    @staticmethod
+    def import_rows(db: Session, rows: Iterable[dict], chunk_size: int = 500) -> dict:
+        """
+        Import users and their cars.
+
+        Args:
+            db: Database session
+            rows: Iterable of dicts with REQUIRED_COLUMNS
+            chunk_size: Rows validated and inserted per transaction
+
+        Returns:
+            Summary counts plus a per-row report (1-based row numbers, header excluded)
+        """
+        report: List[dict] = []
+        seen_phones: set[str] = set()
+        seen_plates: set[str] = set()
+
+        row_iter = iter(enumerate(rows, start=1))
+        while True:
+            chunk = list(islice(row_iter, chunk_size))
+            if not chunk:
+                break
+            report.extend(BulkOnboardingService._import_chunk(db, chunk, seen_phones, seen_plates))
+
+        summary = {"total": len(report), "created": 0, "duplicate": 0, "invalid": 0, "failed": 0}
+        for entry in report:
+            summary[entry["status"]] += 1
+        logger.info("Bulk onboarding finished: %s", summary)
+        return {"summary": summary, "rows": report}
+
+    @staticmethod
+    def _validate_row(raw: dict, phone_result: PhoneValidationResult) -> tuple[Optional[dict], Optional[str]]:
+        country_iso = (raw.get("signup_country_iso") or "").strip().upper()
+        if not is_valid_country_iso(country_iso):
+            return None, "Invalid country code - country not serviced"
+
+        if phone_result.error:
+            return None, phone_result.error
+        phone_number = phone_result.e164
+
+        try:
+            car = CarRegisterRequest(
+                license_plate=(raw.get("license_plate") or "").strip(),
+                car_brand=raw.get("car_brand") or "",
+                car_model=raw.get("car_model") or ""
+            )
+        except ValidationError as e:
+            return None, "; ".join(error["msg"] for error in e.errors())
+
+        return {
+            "phone_number": phone_number,
+            "signup_country_iso": country_iso,
+            "license_plate": car.license_plate,
+            "car_brand": car.car_brand,
+            "car_model": car.car_model
+        }, None
+
+    @staticmethod
+    def _import_chunk(db: Session, chunk: list[tuple[int, dict]], seen_phones: set, seen_plates: set) -> List[dict]:
+        results: dict[int, dict] = {}
+        candidates: list[tuple[int, dict]] = []
+
+        # 1. Validate in memory; phone numbers go through the batch validator in one pass
+        phone_results = validate_phone_numbers(
+            [raw.get("phone_number") or "" for _, raw in chunk],
+            [(raw.get("signup_country_iso") or "").strip() for _, raw in chunk]
+        )
+        for (row_number, raw), phone_result in zip(chunk, phone_results):
+            parsed, error = BulkOnboardingService._validate_row(raw, phone_result)
+            if error:
+                results[row_number] = {"row": row_number, "status": "invalid", "error": error}
+            else:
+                candidates.append((row_number, parsed))
+
+        # 2. Duplicate check: one set query per table
+        existing_phones, existing_plates = BulkOnboardingService._existing_keys(db, candidates)
+
+        accepted: list[tuple[int, dict]] = []
+        for row_number, parsed in candidates:
+            error = BulkOnboardingService._duplicate_error(parsed, existing_phones, existing_plates, seen_phones, seen_plates)
+            if error:
+                results[row_number] = {"row": row_number, "status": "duplicate", "error": error}
+            else:
+                seen_phones.add(parsed["phone_number"])
+                seen_plates.add(parsed["license_plate"])
+                accepted.append((row_number, parsed))
+
+        # 3. Bulk insert users then cars in one transaction
+        if accepted:
+            created, duplicates = BulkOnboardingService._insert_accepted(db, accepted)
+            for row_number, parsed in accepted:
+                if row_number in created:
+                    results[row_number] = {"row": row_number, "status": "created", "user_code": created[row_number]["user_code"]}
+                elif row_number in duplicates:
+                    results[row_number] = {"row": row_number, "status": "duplicate", "error": duplicates[row_number]}
+                else:
+                    results[row_number] = {"row": row_number, "status": "failed", "error": "Insert failed"}
+
+        return [results[row_number] for row_number, _ in chunk]
+
+    @staticmethod
+    def _existing_keys(db: Session, candidates: list[tuple[int, dict]]) -> tuple[set[str], set[str]]:
+        """Phone numbers and plates among candidates that are already in the database"""
+        phones = [parsed["phone_number"] for _, parsed in candidates]
+        plates = [parsed["license_plate"] for _, parsed in candidates]
+        existing_phones = set(db.scalars(select(User.phone_number).where(User.phone_number.in_(phones)))) if phones else set()
+        existing_plates = set(db.scalars(select(Car.license_plate).where(Car.license_plate.in_(plates)))) if plates else set()
+        return existing_phones, existing_plates
+
+    @staticmethod
+    def _duplicate_error(parsed: dict, existing_phones: set[str], existing_plates: set[str],
+                         seen_phones: set[str] = frozenset(), seen_plates: set[str] = frozenset()) -> Optional[str]:
+        phone, plate = parsed["phone_number"], parsed["license_plate"]
+        if phone in existing_phones or phone in seen_phones:
+            return "Phone number already registered"
+        if plate in existing_plates or plate in seen_plates:
+            return "This license plate is already registered in the system"
+        return None
+
+    @staticmethod
+    def _insert_accepted(db: Session, accepted: list[tuple[int, dict]]) -> tuple[dict[int, dict], dict[int, str]]:
+        """
+        Insert accepted rows; returns created rows and rows that turned out to be duplicates.
+
+        A user_code/qr_code_id collision regenerates the codes and retries. A phone
+        or plate conflict means the value was registered after the duplicate check
+        (a concurrent signup or import): the check is re-run, the conflicting rows
+        are reported as duplicates and the rest of the chunk is inserted.
+        """
+        duplicates: dict[int, str] = {}
+        attempt = 0
+        while accepted:
+            user_rows = []
+            for _, parsed in accepted:
+                user_code = generate_user_code()
+                user_rows.append({
+                    "phone_number": parsed["phone_number"],
+                    "signup_country_iso": parsed["signup_country_iso"],
+                    "user_code": user_code,
+                    "qr_code_id": generate_qr_code_id(user_code, parsed["phone_number"]),
+                    "profile_deep_link": build_profile_deep_link(user_code),
+                    "profile_display_name": user_code
+                })
+            try:
+                db.execute(insert(User), user_rows)
+
+                # MySQL has no INSERT ... RETURNING; map generated ids back by user_code
+                user_codes = [row["user_code"] for row in user_rows]
+                id_by_code = dict(db.execute(select(User.user_code, User.id).where(User.user_code.in_(user_codes))).all())
+
+                db.execute(insert(Car), [
+                    {
+                        "owner_id": id_by_code[user_row["user_code"]],
+                        "license_plate": parsed["license_plate"],
+                        "car_brand": parsed["car_brand"],
+                        "car_model": parsed["car_model"]
+                    }
+                    for (_, parsed), user_row in zip(accepted, user_rows)
+                ])
+                db.commit()
+                break
+            except IntegrityError as e:
+                db.rollback()
+                error = str(e.orig)
+
+            if "user_code" in error or "qr_code_id" in error:
+                attempt += 1
+                if attempt >= MAX_CHUNK_INSERT_ATTEMPTS:
+                    logger.error("Bulk insert failed for chunk of %d rows: codes kept colliding", len(accepted))
+                    return {}, duplicates
+                logger.warning("Bulk insert code collision on attempt %d, regenerating codes: %s", attempt, error)
+                continue
+
+            existing_phones, existing_plates = BulkOnboardingService._existing_keys(db, accepted)
+            remaining = []
+            for row_number, parsed in accepted:
+                duplicate_error = BulkOnboardingService._duplicate_error(parsed, existing_phones, existing_plates)
+                if duplicate_error:
+                    duplicates[row_number] = duplicate_error
+                else:
+                    remaining.append((row_number, parsed))
+            if len(remaining) == len(accepted):
+                logger.error("Bulk insert failed for chunk of %d rows: %s", len(accepted), error)
+                return {}, duplicates
+            logger.warning("Bulk insert hit %d rows registered since the duplicate check; inserting the rest",
+                           len(accepted) - len(remaining))
+            accepted = remaining
+        else:
+            return {}, duplicates
+
+        created = {}
+        for (row_number, _), user_row in zip(accepted, user_rows):
+            created[row_number] = user_row
+            try:
+                qr_render_queue.submit(
+                    user_id=id_by_code[user_row["user_code"]],
+                    user_code=user_row["user_code"],
+                    qr_code_id=user_row["qr_code_id"],
+                    profile_url=user_row["profile_deep_link"]
+                )
+            except Exception as e:
+                logger.error("Failed to queue QR image for %s: %s", user_row["user_code"], str(e))
+        return created, duplicates
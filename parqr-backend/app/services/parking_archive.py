@@ -0,0 +1,573 @@
+"""
+Cold archive for ended parking sessions.
+
+Sessions that ended more than PARKING_ARCHIVE_AFTER_DAYS ago are moved out of
+the parking_sessions table into per-month columnar partitions on disk: one
+.npy file per column, opened with np.load(mmap_mode='r') so a history lookup
+only pages in the few kilobytes it touches. Rows in a partition are sorted by
+(user_id, start_time), which turns "sessions of user X" into a binary search.
+
+Layout:
+    <PARKING_ARCHIVE_DIR>/
+        2025-03/                         month of start_time (UTC)
+            manifest.json                current generation, row count, start_time range
+            g000002/
+                id.npy user_id.npy car_id.npy              int64
+                start_time.npy end_time.npy                int64 microseconds since epoch
+                longitude.npy latitude.npy                 float64, NaN for NULL
+                note_location.offsets.npy                  int64, n+1 offsets into .data
+                note_location.data.npy                     uint8, UTF-8 bytes
+                note_location.null.npy                     bool
+                public_message.{offsets,data,null}.npy
+
+Partitions are never modified in place: archiving more rows into a month
+writes a new generation directory and then swaps manifest.json atomically, so
+readers holding the old mmaps keep working. A superseded generation is kept
+for PARKING_ARCHIVE_GENERATION_GRACE seconds, so a reader that read the old
+manifest just before the swap can still open it; if it is gone anyway,
+partition() re-reads the manifest and retries. Rows are deleted from MySQL only
+after their partition is on disk; if a run dies in between, the rows exist in
+both places and the reader prefers the database copy until the next run.
+
+Every API instance reads the same archive, so PARKING_ARCHIVE_DIR has to be
+shared storage (or a single host) in multi-instance deployments.
+
+Env variables:
+    PARKING_ARCHIVE_DIR: Archive root (default: parqr-backend/archive/parking_sessions)
+    PARKING_ARCHIVE_AFTER_DAYS: Archive sessions that ended this many days ago (default: 180)
+    PARKING_ARCHIVE_BATCH_SIZE: Rows per delete chunk (default: 1000)
+    PARKING_ARCHIVE_CHUNK_PAUSE: Seconds between delete chunks (default: 0.05)
+    PARKING_ARCHIVE_GENERATION_GRACE: Seconds a superseded generation stays on disk (default: 3600)
+    PARKING_ARCHIVE_MAX_RUNTIME: Seconds per run, checked between fetch chunks; the rest waits for the next run (default: 1800)
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+import logging
+
+import numpy as np
+from prometheus_client import Counter, Gauge
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.db.locks import named_lock
+from app.db.session import SessionLocal
+from app.models.parking_session import ParkingSession
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ARCHIVE_FORMAT_VERSION = 1
+ARCHIVE_LOCK_NAME = "parqr_parking_archive"
+MANIFEST_NAME = "manifest.json"
+# Manifest reads per partition() call when a generation disappears underneath it
+PARTITION_OPEN_ATTEMPTS = 3
+
+INT_COLUMNS = ("id", "user_id", "car_id")
+TIME_COLUMNS = ("start_time", "end_time")
+FLOAT_COLUMNS = ("longitude", "latitude")
+STRING_COLUMNS = ("note_location", "public_message")
+# Same order as ParkingSessionOut, so rows serialize exactly like the schema would
+ALL_COLUMNS = ("id", "user_id", "car_id", "start_time", "end_time", "note_location", "public_message", "longitude", "latitude")
+
+ARCHIVED_ROWS = Counter(
+    "parqr_parking_archive_rows_total",
+    "Parking sessions moved from MySQL into the cold archive"
+)
+ARCHIVE_LAST_RUN = Gauge(
+    "parqr_parking_archive_last_run_timestamp_seconds",
+    "Unix time the parking archive last finished a run",
+    multiprocess_mode="max"
+)
+
+def to_micros(value: datetime) -> int:
+    """Naive datetimes from MySQL are UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - ARCHIVE_EPOCH) // timedelta(microseconds=1)
+
+def from_micros(value: int) -> datetime:
+    return ARCHIVE_EPOCH + timedelta(microseconds=int(value))
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def column_arrays(rows: List[tuple]) -> Dict[str, np.ndarray]:
+    """
+    On-disk column arrays for a chunk of rows in ALL_COLUMNS order.
+
+    Only one fetch chunk is ever held as Python tuples; everything after this
+    works on the arrays.
+    """
+    values = dict(zip(ALL_COLUMNS, zip(*rows))) if rows else {name: () for name in ALL_COLUMNS}
+    arrays = {name: np.array(values[name], dtype=np.int64) for name in INT_COLUMNS}
+    for name in TIME_COLUMNS:
+        arrays[name] = np.array([to_micros(value) for value in values[name]], dtype=np.int64)
+    for name in FLOAT_COLUMNS:
+        arrays[name] = np.array([np.nan if value is None else value for value in values[name]], dtype=np.float64)
+    for name in STRING_COLUMNS:
+        encoded = [(value or "").encode("utf-8") for value in values[name]]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(np.array([len(value) for value in encoded], dtype=np.int64), out=offsets[1:])
+        arrays[f"{name}.offsets"] = offsets
+        arrays[f"{name}.data"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        arrays[f"{name}.null"] = np.array([value is None for value in values[name]], dtype=np.bool_)
+    return arrays
+
+def concat_columns(parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Concatenate column arrays (in-memory or mmapped), rebasing string offsets"""
+    arrays = {name: np.concatenate([part[name] for part in parts]) for name in INT_COLUMNS + TIME_COLUMNS + FLOAT_COLUMNS}
+    for name in STRING_COLUMNS:
+        lengths = np.concatenate([np.diff(part[f"{name}.offsets"]) for part in parts])
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        arrays[f"{name}.offsets"] = offsets
+        arrays[f"{name}.data"] = np.concatenate([part[f"{name}.data"][:part[f"{name}.offsets"][-1]] for part in parts])
+        arrays[f"{name}.null"] = np.concatenate([part[f"{name}.null"] for part in parts])
+    return arrays
+
+# Rows per step when gathering string bytes, bounding the temporary position array
+STRING_TAKE_ROWS = 1 << 18
+
+def take_columns(arrays: Dict[str, np.ndarray], index: np.ndarray) -> Dict[str, np.ndarray]:
+    """Rows `index` of column arrays, in that order"""
+    taken = {name: arrays[name][index] for name in INT_COLUMNS + TIME_COLUMNS + FLOAT_COLUMNS}
+    for name in STRING_COLUMNS:
+        offsets, data = arrays[f"{name}.offsets"], arrays[f"{name}.data"]
+        starts = offsets[:-1][index]
+        lengths = offsets[1:][index] - starts
+        new_offsets = np.zeros(len(index) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=new_offsets[1:])
+        pieces = []
+        for lo in range(0, len(index), STRING_TAKE_ROWS):
+            hi = min(lo + STRING_TAKE_ROWS, len(index))
+            # Byte position of every output byte in `data`: row start plus offset within the row
+            counts = lengths[lo:hi]
+            positions = np.arange(new_offsets[lo], new_offsets[hi], dtype=np.int64)
+            positions += np.repeat(starts[lo:hi] - new_offsets[lo:hi], counts)
+            pieces.append(data[positions])
+        taken[f"{name}.offsets"] = new_offsets
+        taken[f"{name}.data"] = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.uint8)
+        taken[f"{name}.null"] = arrays[f"{name}.null"][index]
+    return taken
+
+def month_key(value: datetime) -> str:
+    return as_utc(value).strftime("%Y-%m")
+
+def month_bounds(month: str) -> tuple:
+    """Naive UTC [start, end) of a 'YYYY-MM' partition, matching how MySQL stores timestamps"""
+    start = datetime.strptime(month, "%Y-%m")
+    end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    return start, end
+
+class ArchivePartition:
+    """Read-only, memory-mapped view of one month of archived sessions"""
+
+    def __init__(self, month: str, directory: Path, manifest: dict):
+        self.month = month
+        self.directory = directory
+        self.manifest = manifest
+        self.rows = manifest["rows"]
+        self.min_start = manifest["min_start_time"]
+        self.max_start = manifest["max_start_time"]
+        self.columns: Dict[str, np.ndarray] = {}
+        for name in INT_COLUMNS + TIME_COLUMNS + FLOAT_COLUMNS:
+            self.columns[name] = np.load(directory / f"{name}.npy", mmap_mode="r")
+        for name in STRING_COLUMNS:
+            for part in ("offsets", "data", "null"):
+                self.columns[f"{name}.{part}"] = np.load(directory / f"{name}.{part}.npy", mmap_mode="r")
+
+    def string_at(self, name: str, index: int) -> Optional[str]:
+        if self.columns[f"{name}.null"][index]:
+            return None
+        offsets = self.columns[f"{name}.offsets"]
+        return self.columns[f"{name}.data"][offsets[index]:offsets[index + 1]].tobytes().decode("utf-8")
+
+    def row(self, index: int) -> dict:
+        row = {}
+        for name in ALL_COLUMNS:
+            if name in STRING_COLUMNS:
+                row[name] = self.string_at(name, index)
+            elif name in TIME_COLUMNS:
+                row[name] = from_micros(self.columns[name][index])
+            elif name in FLOAT_COLUMNS:
+                value = float(self.columns[name][index])
+                row[name] = None if np.isnan(value) else value
+            else:
+                row[name] = int(self.columns[name][index])
+        return row
+
+    def user_rows(self, user_id: int, limit: int) -> List[dict]:
+        """Most recent `limit` sessions of a user in this month, newest first"""
+        user_ids = self.columns["user_id"]
+        lo = int(np.searchsorted(user_ids, user_id, side="left"))
+        hi = int(np.searchsorted(user_ids, user_id, side="right"))
+        # Within a user, rows are in start_time order
+        return [self.row(i) for i in range(hi - 1, max(lo, hi - limit) - 1, -1)]
+
+    def size_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self.directory.iterdir())
+
+class ParkingArchive:
+    """Partition directory management plus a cache of opened (mmapped) partitions"""
+
+    def __init__(self, root: Optional[Path] = None, generation_grace: Optional[float] = None):
+        self.root = Path(root or os.getenv("PARKING_ARCHIVE_DIR") or Path(__file__).parent.parent.parent / "archive" / "parking_sessions")
+        # Read in __init__ (not as default args) so .env values loaded at startup apply
+        self.generation_grace = generation_grace if generation_grace is not None else float(os.getenv("PARKING_ARCHIVE_GENERATION_GRACE", "3600"))
+        self._lock = threading.Lock()
+        self._months: Optional[List[str]] = None
+        self._months_mtime: Optional[int] = None
+        self._partitions: Dict[str, tuple] = {}
+
+    def months(self) -> List[str]:
+        """Archived months, newest first"""
+        try:
+            mtime = self.root.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+        with self._lock:
+            # New partitions add a directory, which bumps the root's mtime. A month
+            # without a manifest yet is listed anyway; partition() returns None for it
+            if self._months is None or self._months_mtime != mtime:
+                self._months = sorted((p.name for p in self.root.iterdir() if p.is_dir()), reverse=True)
+                self._months_mtime = mtime
+            return list(self._months)
+
+    def read_manifest(self, month: str) -> Optional[dict]:
+        try:
+            return json.loads((self.root / month / MANIFEST_NAME).read_text())
+        except FileNotFoundError:
+            return None
+
+    def partition(self, month: str) -> Optional[ArchivePartition]:
+        """Open (or reuse) the current generation of a month"""
+        manifest_path = self.root / month / MANIFEST_NAME
+        for attempt in range(PARTITION_OPEN_ATTEMPTS):
+            try:
+                mtime = manifest_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                return None
+            with self._lock:
+                cached = self._partitions.get(month)
+                if cached and cached[0] == mtime:
+                    return cached[1]
+            try:
+                manifest = json.loads(manifest_path.read_text())
+                partition = ArchivePartition(month, self.root / month / manifest["directory"], manifest)
+            except FileNotFoundError:
+                # A writer published a newer manifest and removed this generation in between
+                if attempt == PARTITION_OPEN_ATTEMPTS - 1:
+                    raise
+                logger.info("Archive generation of %s disappeared while opening it, retrying", month)
+                continue
+            with self._lock:
+                self._partitions[month] = (mtime, partition)
+            return partition
+
+    def iter_partitions(self) -> Iterator[ArchivePartition]:
+        """Partitions newest first, for analytics scans over the raw column arrays"""
+        for month in self.months():
+            partition = self.partition(month)
+            if partition is not None:
+                yield partition
+
+    def write_partition(self, month: str, columns: Dict[str, np.ndarray]) -> dict:
+        """
+        Merge column arrays (see column_arrays) into a month's partition and publish a new generation.
+
+        Rows already in the partition are replaced by incoming rows with the same id.
+        The merge works on the current generation's mmapped columns; rows are never
+        decoded into Python objects.
+
+        Returns:
+            The new manifest
+        """
+        month_dir = self.root / month
+        month_dir.mkdir(parents=True, exist_ok=True)
+        previous = self.read_manifest(month)
+        current = self.partition(month) if previous else None
+        if current is not None and current.rows:
+            keep = ~np.isin(current.columns["id"], columns["id"])
+            merged = concat_columns([current.columns, columns])
+            selected = np.concatenate([np.flatnonzero(keep), current.rows + np.arange(len(columns["id"]))])
+        else:
+            merged = columns
+            selected = np.arange(len(columns["id"]))
+        order = np.lexsort((merged["id"][selected], merged["start_time"][selected], merged["user_id"][selected]))
+        arrays = take_columns(merged, selected[order])
+        del merged
+        rows = len(arrays["id"])
+
+        generation = (previous["generation"] + 1) if previous else 1
+        directory_name = f"g{generation:06d}"
+        directory = month_dir / directory_name
+        if directory.exists():
+            # Left over from a run that died before publishing its manifest
+            shutil.rmtree(directory)
+        directory.mkdir()
+
+        for name, array in arrays.items():
+            with open(directory / f"{name}.npy", "wb") as f:
+                np.save(f, array, allow_pickle=False)
+                f.flush()
+                os.fsync(f.fileno())
+
+        manifest = {
+            "format_version": ARCHIVE_FORMAT_VERSION,
+            "month": month,
+            "generation": generation,
+            "directory": directory_name,
+            "rows": rows,
+            "min_start_time": int(arrays["start_time"].min()) if rows else 0,
+            "max_start_time": int(arrays["start_time"].max()) if rows else 0,
+            "written_at": datetime.now(timezone.utc).isoformat()
+        }
+        temp_path = month_dir / f"{MANIFEST_NAME}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, month_dir / MANIFEST_NAME)
+
+        self._remove_old_generations(month_dir, directory_name, previous["directory"] if previous else None)
+        return manifest
+
+    def _remove_old_generations(self, month_dir: Path, current: str, superseded: Optional[str]) -> None:
+        """
+        Delete generations superseded more than generation_grace seconds ago.
+
+        A finished generation directory is never written again, so its mtime is
+        set to the moment it was superseded and serves as the grace clock.
+        Open mmaps of deleted generations stay valid after unlink.
+        """
+        now = time.time()
+        for old in month_dir.iterdir():
+            if not old.is_dir() or old.name == current:
+                continue
+            if old.name == superseded:
+                os.utime(old, (now, now))
+            elif now - old.stat().st_mtime >= self.generation_grace:
+                shutil.rmtree(old, ignore_errors=True)
+
+    def user_history(self, user_id: int, limit: int, newer_than: Optional[int] = None) -> List[dict]:
+        """
+        Most recent archived sessions of a user, newest first.
+
+        Args:
+            user_id: Session owner
+            limit: Maximum rows to return
+            newer_than: Skip partitions whose newest session starts before this (epoch microseconds)
+        """
+        rows: List[dict] = []
+        for month in self.months():
+            if len(rows) >= limit:
+                # Older months only hold older sessions
+                break
+            partition = self.partition(month)
+            if partition is None or partition.rows == 0:
+                continue
+            if newer_than is not None and partition.max_start < newer_than:
+                break
+            rows.extend(partition.user_rows(user_id, limit - len(rows)))
+        return rows
+
+    def stats(self) -> dict:
+        months = []
+        for partition in self.iter_partitions():
+            months.append({
+                "month": partition.month,
+                "rows": partition.rows,
+                "generation": partition.manifest["generation"],
+                "bytes": partition.size_bytes()
+            })
+        return {
+            "root": str(self.root),
+            "partitions": len(months),
+            "rows": sum(m["rows"] for m in months),
+            "bytes": sum(m["bytes"] for m in months),
+            "months": months
+        }
+
+def get_parking_history(
+    db: Session,
+    user_id: int,
+    limit: int,
+    ended_only: bool = False,
+    archive: Optional[ParkingArchive] = None
+) -> List[dict]:
+    """
+    A user's most recent sessions, newest first, from MySQL and the cold archive.
+
+    Rows are plain dicts shaped like ParkingSessionOut (aware UTC datetimes),
+    ready for FastJSONResponse. The archive is only consulted when the hot rows
+    cannot fill the page by themselves, i.e. when some archived month could
+    hold newer sessions than the oldest hot row returned.
+    """
+    archive = archive or parking_archive
+    query = select(*(getattr(ParkingSession, name) for name in ALL_COLUMNS)).where(ParkingSession.user_id == user_id)
+    if ended_only:
+        query = query.where(ParkingSession.end_time.isnot(None))
+    hot = [dict(row) for row in db.execute(query.order_by(ParkingSession.start_time.desc()).limit(limit)).mappings()]
+
+    newer_than = to_micros(hot[-1]["start_time"]) if len(hot) >= limit and hot else None
+    archived = archive.user_history(user_id, limit, newer_than=newer_than)
+    if not archived:
+        return hot
+
+    # A row in both places means a run died between writing and deleting; the database copy wins
+    hot_ids = {row["id"] for row in hot}
+    merged = hot + [row for row in archived if row["id"] not in hot_ids]
+    merged.sort(key=lambda row: row["start_time"], reverse=True)
+    return merged[:limit]
+
+class ParkingArchiver:
+    """Moves ended sessions from MySQL into the archive, one month at a time"""
+
+    def __init__(
+        self,
+        archive: Optional[ParkingArchive] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        after_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        chunk_pause: Optional[float] = None,
+        max_runtime: Optional[float] = None
+    ):
+        self.archive = archive or parking_archive
+        self.session_factory = session_factory
+        # Read in __init__ (not as default args) so .env values loaded at startup apply
+        self.after_days = after_days if after_days is not None else int(os.getenv("PARKING_ARCHIVE_AFTER_DAYS", "180"))
+        self.batch_size = batch_size if batch_size is not None else int(os.getenv("PARKING_ARCHIVE_BATCH_SIZE", "1000"))
+        self.chunk_pause = chunk_pause if chunk_pause is not None else float(os.getenv("PARKING_ARCHIVE_CHUNK_PAUSE", "0.05"))
+        self.max_runtime = max_runtime if max_runtime is not None else float(os.getenv("PARKING_ARCHIVE_MAX_RUNTIME", "1800"))
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Naive UTC cutoff, compared against MySQL's naive end_time"""
+        return ((now or datetime.now(timezone.utc)) - timedelta(days=self.after_days)).replace(tzinfo=None)
+
+    def _eligible(self, cutoff: datetime):
+        return (
+            ParkingSession.end_time.isnot(None),
+            ParkingSession.end_time < cutoff,
+            ParkingSession.start_time.isnot(None)
+        )
+
+    def pending_months(self, cutoff: datetime) -> List[str]:
+        """Months (oldest first) that may hold sessions eligible for archiving"""
+        db = self.session_factory()
+        try:
+            oldest = db.execute(select(func.min(ParkingSession.start_time)).where(*self._eligible(cutoff))).scalar()
+        finally:
+            db.close()
+        if oldest is None:
+            return []
+        months = []
+        month = month_key(oldest)
+        last = month_key(cutoff)
+        while month <= last:
+            months.append(month)
+            month = month_key(month_bounds(month)[1])
+        return months
+
+    def _fetch_month(self, month: str, cutoff: datetime, deadline: float) -> Dict[str, np.ndarray]:
+        """
+        Eligible sessions of a month as column arrays.
+
+        Stops early at the deadline; the rest of the month is picked up by the next run.
+        """
+        start, end = month_bounds(month)
+        columns = [getattr(ParkingSession, name) for name in ALL_COLUMNS]
+        chunks: List[Dict[str, np.ndarray]] = []
+        last_id = 0
+        db = self.session_factory()
+        try:
+            while True:
+                # Keyset by id keeps each read short; the start_time index narrows the month
+                batch = db.execute(
+                    select(*columns)
+                    .where(*self._eligible(cutoff), ParkingSession.start_time >= start, ParkingSession.start_time < end,
+                           ParkingSession.id > last_id)
+                    .order_by(ParkingSession.id)
+                    .limit(self.batch_size * 10)
+                ).all()
+                if not batch:
+                    break
+                chunks.append(column_arrays(batch))
+                last_id = batch[-1][0]
+                if time.perf_counter() > deadline:
+                    break
+        finally:
+            db.close()
+        return concat_columns(chunks) if chunks else column_arrays([])
+
+    def _delete(self, ids: np.ndarray) -> None:
+        for i in range(0, len(ids), self.batch_size):
+            db = self.session_factory()
+            try:
+                db.execute(
+                    delete(ParkingSession)
+                    .where(ParkingSession.id.in_(ids[i:i + self.batch_size].tolist()))
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+            if i + self.batch_size < len(ids):
+                time.sleep(self.chunk_pause)
+
+    def run(self, dry_run: bool = False, now: Optional[datetime] = None) -> dict:
+        """
+        Archive every eligible month, oldest first.
+
+        Returns:
+            Run summary; "skipped" is set when another instance holds the archive lock
+        """
+        started = time.perf_counter()
+        cutoff = self.cutoff(now)
+        summary = {"cutoff": cutoff.replace(tzinfo=timezone.utc).isoformat(), "dry_run": dry_run,
+                   "months": [], "rows": 0, "complete": True}
+
+        with named_lock(self.session_factory, ARCHIVE_LOCK_NAME) as acquired:
+            if not acquired:
+                logger.info("Parking archive run skipped: another instance holds the lock")
+                return {**summary, "skipped": True}
+            for month in self.pending_months(cutoff):
+                if time.perf_counter() - started > self.max_runtime:
+                    summary["complete"] = False
+                    break
+                deadline = started + self.max_runtime
+                columns = self._fetch_month(month, cutoff, deadline)
+                rows = len(columns["id"])
+                if not rows:
+                    continue
+                if not dry_run:
+                    manifest = self.archive.write_partition(month, columns)
+                    self._delete(columns["id"])
+                    ARCHIVED_ROWS.inc(rows)
+                    logger.info("Archived %d parking sessions for %s (partition now %d rows)",
+                                rows, month, manifest["rows"])
+                summary["months"].append({"month": month, "rows": rows})
+                summary["rows"] += rows
+                if time.perf_counter() > deadline:
+                    # The fetch may have stopped partway through this month
+                    summary["complete"] = False
+                    break
+
+        if not dry_run:
+            ARCHIVE_LAST_RUN.set_to_current_time()
+        summary["seconds"] = round(time.perf_counter() - started, 3)
+        return summary
+
+# Shared archive used by the API process
+parking_archive = ParkingArchive()
@@ -0,0 +1,196 @@
+"""
+Phone number validation and E.164 normalization.
+
+Rules for every country in ALL_COUNTRIES are compiled once at import into an
+ISO -> PhoneRule table, so validating a number is a dict lookup plus a few
+string operations. Use normalize_phone_number for single values and
+validate_phone_numbers for batches (bulk onboarding, imports).
+"""
+
+import re
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Union
+
+from scripts.country_codes import ALL_COUNTRIES
+
+class PhoneValidationError(ValueError):
+    """Raised when a phone number fails validation; the message is safe to return to clients"""
+
+class PhoneRule(NamedTuple):
+    country_iso: str
+    dial_code: str                      # Digits only, e.g. '82'
+    e164_prefix: str                    # '+' + dial_code, precomputed
+    trunk_prefix: str                   # National prefix dropped in E.164, e.g. '0' ('' if none)
+    nsn_lengths: FrozenSet[int]         # Valid national significant number lengths
+    nsn_pattern: Optional[re.Pattern]   # Extra constraint on the NSN (e.g. mobile ranges)
+
+class PhoneValidationResult(NamedTuple):
+    e164: Optional[str]
+    error: Optional[str]
+
+# Per-country overrides: (trunk prefix, (min NSN length, max NSN length), NSN regex or None)
+# Countries not listed fall back to DEFAULT_RULE_SPEC.
+_RULE_SPECS: Dict[str, tuple] = {
+    "KR": ("0", (10, 10), r"10\d{8}"),  # Mobile only: 010-XXXX-XXXX
+    "JP": ("0", (9, 10), None),
+    "CN": ("0", (10, 11), None),
+    "TW": ("0", (8, 9), None),
+    "HK": ("", (8, 8), None),
+    "SG": ("", (8, 8), None),
+    "MY": ("0", (9, 10), None),
+    "TH": ("0", (8, 9), None),
+    "VN": ("0", (9, 10), None),
+    "PH": ("0", (8, 10), None),
+    "ID": ("0", (9, 12), None),
+    "IN": ("0", (10, 10), None),
+    "AU": ("0", (9, 9), None),
+    "NZ": ("0", (8, 10), None),
+    "US": ("1", (10, 10), r"[2-9]\d{2}[2-9]\d{6}"),
+    "CA": ("1", (10, 10), r"[2-9]\d{2}[2-9]\d{6}"),
+    "MX": ("", (10, 10), None),
+    "GB": ("0", (9, 10), None),
+    "DE": ("0", (6, 11), None),
+    "FR": ("0", (9, 9), None),
+    "IT": ("", (6, 11), None),
+    "ES": ("", (9, 9), None),
+    "NL": ("0", (9, 9), None),
+    "SE": ("0", (7, 9), None),
+    "NO": ("", (8, 8), None),
+    "DK": ("", (8, 8), None),
+    "FI": ("0", (6, 10), None),
+    "CH": ("0", (9, 9), None),
+    "AT": ("0", (7, 13), None),
+    "BR": ("0", (10, 11), None),
+    "AR": ("0", (10, 11), None),
+    "CL": ("", (9, 9), None),
+    "ZA": ("0", (9, 9), None),
+    "IL": ("0", (8, 9), None),
+    "AE": ("0", (8, 9), None),
+}
+DEFAULT_RULE_SPEC = ("0", (4, 12), None)
+
+# E.164 caps the full number (country code + NSN) at 15 digits
+E164_MAX_DIGITS = 15
+
+# Separators users commonly type; removed with a single str.translate
+_SEPARATORS = str.maketrans("", "", " -.()/")
+
+def _build_rule(country_iso: str, country_code: str) -> PhoneRule:
+    trunk_prefix, (min_length, max_length), nsn_regex = _RULE_SPECS.get(country_iso, DEFAULT_RULE_SPEC)
+    dial_code = country_code.lstrip("+")
+    max_length = min(max_length, E164_MAX_DIGITS - len(dial_code))
+    return PhoneRule(
+        country_iso=country_iso,
+        dial_code=dial_code,
+        e164_prefix=f"+{dial_code}",
+        trunk_prefix=trunk_prefix,
+        nsn_lengths=frozenset(range(min_length, max_length + 1)),
+        nsn_pattern=re.compile(nsn_regex) if nsn_regex else None
+    )
+
+# ISO -> compiled rule, built once at import
+PHONE_RULES: Dict[str, PhoneRule] = {
+    info["country_iso"]: _build_rule(info["country_iso"], info["country_code"])
+    for info in ALL_COUNTRIES.values()
+}
+
+def _national_length_message(rule: PhoneRule) -> str:
+    # Report lengths as users type them nationally (including the trunk prefix)
+    lengths = sorted(length + len(rule.trunk_prefix) for length in rule.nsn_lengths)
+    if len(lengths) == 1:
+        return f"Phone number must be {lengths[0]} digits"
+    return f"Phone number must be {lengths[0]}-{lengths[-1]} digits"
+
+def _normalize(phone_number: str, rule: PhoneRule) -> PhoneValidationResult:
+    # Fast path: most input is already bare digits, skip the translate pass
+    if phone_number.isdigit():
+        nsn = phone_number
+        if rule.trunk_prefix and nsn.startswith(rule.trunk_prefix):
+            nsn = nsn[len(rule.trunk_prefix):]
+        return _check_nsn(nsn, rule)
+
+    cleaned = phone_number.strip().translate(_SEPARATORS)
+
+    if cleaned.startswith("+"):
+        digits = cleaned[1:]
+        if not digits.isdigit():
+            return PhoneValidationResult(None, "Phone number must contain only digits and valid separators")
+        if not digits.startswith(rule.dial_code):
+            return PhoneValidationResult(None, f"Phone number must start with +{rule.dial_code} for {rule.country_iso}")
+        nsn = digits[len(rule.dial_code):]
+    else:
+        if not cleaned.isdigit():
+            return PhoneValidationResult(None, "Phone number must contain only digits and valid separators")
+        nsn = cleaned
+        if rule.trunk_prefix and nsn.startswith(rule.trunk_prefix):
+            nsn = nsn[len(rule.trunk_prefix):]
+
+    return _check_nsn(nsn, rule)
+
+def _check_nsn(nsn: str, rule: PhoneRule) -> PhoneValidationResult:
+    if len(nsn) not in rule.nsn_lengths:
+        return PhoneValidationResult(None, _national_length_message(rule))
+    if rule.nsn_pattern is not None and not rule.nsn_pattern.fullmatch(nsn):
+        return PhoneValidationResult(None, "Invalid mobile phone number format")
+
+    return PhoneValidationResult(rule.e164_prefix + nsn, None)
+
+def get_phone_rule(country_iso: str) -> PhoneRule:
+    """O(1) lookup of the compiled rule for a country; raises PhoneValidationError if unknown"""
+    rule = PHONE_RULES.get(country_iso.upper())
+    if rule is None:
+        raise PhoneValidationError("Invalid country code")
+    return rule
+
+def normalize_phone_number(phone_number: str, country_iso: str) -> str:
+    """
+    Validate a phone number for the signup country and normalize it to E.164.
+
+    Accepts national format (e.g. '01012345678' for KR) or international
+    format with a leading '+'; spaces, dashes, dots and parentheses are ignored.
+
+    Args:
+        phone_number: Phone number as entered by the user
+        country_iso: Two-letter signup country code
+
+    Returns:
+        E.164 phone number, e.g. '+821012345678'
+
+    Raises:
+        PhoneValidationError: If the number is not valid for the country
+    """
+    result = _normalize(phone_number, get_phone_rule(country_iso))
+    if result.error:
+        raise PhoneValidationError(result.error)
+    return result.e164
+
+def validate_phone_numbers(
+    phone_numbers: Sequence[str],
+    country_isos: Union[str, Sequence[str]]
+) -> List[PhoneValidationResult]:
+    """
+    Validate and normalize a batch of phone numbers without raising.
+
+    Args:
+        phone_numbers: Phone numbers as entered
+        country_isos: One ISO code for the whole batch, or one per number
+
+    Returns:
+        One PhoneValidationResult (e164, error) per input, in order
+    """
+    if isinstance(country_isos, str):
+        rule = PHONE_RULES.get(country_isos.upper())
+        if rule is None:
+            return [PhoneValidationResult(None, "Invalid country code")] * len(phone_numbers)
+        return [_normalize(number, rule) for number in phone_numbers]
+
+    if len(country_isos) != len(phone_numbers):
+        raise ValueError("phone_numbers and country_isos must have the same length")
+
+    # Resolve each distinct raw ISO value once per batch
+    rule_by_iso = {iso: PHONE_RULES.get(iso.upper()) for iso in set(country_isos)}
+    invalid_country = PhoneValidationResult(None, "Invalid country code")
+    normalize = _normalize
+    return [
+        normalize(number, rule) if (rule := rule_by_iso[country_iso]) else invalid_country
+        for number, country_iso in zip(phone_numbers, country_isos)
+    ]
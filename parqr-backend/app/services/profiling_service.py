@@ -0,0 +1,252 @@
+"""
+On-demand request profiling.
+
+A request is profiled when it carries a valid signed X-Profile header or when
+an admin has armed the sampling toggle. Three modes are supported:
+
+  - cprofile: deterministic cProfile run, stored as a pstats file (.prof)
+  - sampling: wall-clock stack sampler, stored as folded stacks (.folded) for
+              speedscope / flamegraph.pl
+  - memory:   tracemalloc snapshots before/after, stored as a text diff (.txt)
+
+Only one request per process is profiled at a time; others pass through
+untouched. Results are kept on local disk (PROFILE_STORAGE_DIR) and are only
+downloadable through the admin endpoints.
+"""
+
+import cProfile
+import hashlib
+import hmac
+import io
+import marshal
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sampling", "memory")
+PROFILE_EXTENSIONS = {"cprofile": "prof", "sampling": "folded", "memory": "txt"}
+
+PROFILE_HEADER = "x-profile"
+
+# tracemalloc frames kept per allocation; deeper is more useful and slower
+TRACEMALLOC_FRAMES = int(os.getenv("PROFILE_TRACEMALLOC_FRAMES", "10"))
+
+class ProfileSignatureError(ValueError):
+    """Raised when an X-Profile header is malformed, expired or not signed with PROFILING_SECRET"""
+
+def sign_profile_request(mode: str, expires_at: int, secret: str) -> str:
+    """Build an X-Profile header value: '<mode>:<expires_at>:<hex hmac-sha256>'"""
+    signature = hmac.new(secret.encode(), f"{mode}:{expires_at}".encode(), hashlib.sha256).hexdigest()
+    return f"{mode}:{expires_at}:{signature}"
+
+def verify_profile_header(value: str, secret: str) -> str:
+    """
+    Validate an X-Profile header value.
+
+    Returns:
+        The requested profile mode
+
+    Raises:
+        ProfileSignatureError: If the value is malformed, expired or has a bad signature
+    """
+    try:
+        mode, expires_at, signature = value.split(":")
+        expires = int(expires_at)
+    except ValueError:
+        raise ProfileSignatureError("Malformed X-Profile header")
+    if mode not in PROFILE_MODES:
+        raise ProfileSignatureError(f"Unknown profile mode: {mode}")
+    if expires < time.time():
+        raise ProfileSignatureError("X-Profile header expired")
+    expected = sign_profile_request(mode, expires, secret).rsplit(":", 1)[1]
+    if not hmac.compare_digest(signature, expected):
+        raise ProfileSignatureError("Invalid X-Profile signature")
+    return mode
+
+class ProfilingToggle:
+    """Admin-armed sampling: profile a fraction of matching requests until expiry (per process)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.mode: Optional[str] = None
+        self.sample_rate = 0.0
+        self.route_prefix: Optional[str] = None
+        self.expires_at = 0.0
+        # Set by install_profiling; without the hooks an armed toggle would profile nothing
+        self.installed = False
+
+    def arm(self, mode: str, sample_rate: float, duration_seconds: int, route_prefix: Optional[str] = None) -> None:
+        with self._lock:
+            self.mode = mode
+            self.sample_rate = sample_rate
+            self.route_prefix = route_prefix
+            self.expires_at = time.time() + duration_seconds
+        logger.info("Profiling armed: mode=%s sample_rate=%s route_prefix=%s for %ss", mode, sample_rate, route_prefix, duration_seconds)
+
+    def disarm(self) -> None:
+        with self._lock:
+            self.mode = None
+            self.expires_at = 0.0
+
+    @property
+    def armed(self) -> bool:
+        return self.mode is not None and time.time() < self.expires_at
+
+    def pick(self, path: str) -> Optional[str]:
+        """Mode to profile this request with, or None"""
+        if not self.armed:
+            return None
+        if self.route_prefix and not path.startswith(self.route_prefix):
+            return None
+        if random.random() >= self.sample_rate:
+            return None
+        return self.mode
+
+    def status(self) -> dict:
+        return {
+            "armed": self.armed,
+            "mode": self.mode if self.armed else None,
+            "sample_rate": self.sample_rate if self.armed else 0.0,
+            "route_prefix": self.route_prefix if self.armed else None,
+            "expires_at": datetime.fromtimestamp(self.expires_at, timezone.utc).isoformat() if self.armed else None
+        }
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval and counts folded stacks"""
+
+    def __init__(self, interval: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.001"))):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self, thread_id: int) -> None:
+        self._thread_id = thread_id
+        self._sampler = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+class RequestProfiler:
+    """Profiles the code run between start() and stop() on the calling thread"""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+        self._snapshot_before: Optional[tracemalloc.Snapshot] = None
+        self._started_tracemalloc = False
+
+    def start(self) -> None:
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self.mode == "sampling":
+            self._sampler = StackSampler()
+            self._sampler.start(threading.get_ident())
+        elif self.mode == "memory":
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                self._started_tracemalloc = True
+            tracemalloc.reset_peak()
+            self._snapshot_before = tracemalloc.take_snapshot()
+
+    def stop(self) -> bytes:
+        """Stop profiling and return the serialized result"""
+        if self.mode == "cprofile":
+            self._profile.disable()
+            self._profile.create_stats()
+            return marshal.dumps(self._profile.stats)
+        if self.mode == "sampling":
+            self._sampler.stop()
+            return self._sampler.folded().encode()
+
+        snapshot_after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        report = io.StringIO()
+        report.write(f"traced memory: current={current / 1024:.1f} KiB peak={peak / 1024:.1f} KiB\n\n")
+        report.write("top allocation growth by line:\n")
+        for stat in snapshot_after.compare_to(self._snapshot_before, "lineno")[:50]:
+            report.write(f"{stat}\n")
+        return report.getvalue().encode()
+
+class ProfileStore:
+    """Keeps the most recent profile results on local disk"""
+
+    def __init__(
+        self,
+        directory: Path = Path(os.getenv("PROFILE_STORAGE_DIR", str(Path(__file__).parent.parent.parent / "profiles"))),
+        max_results: int = int(os.getenv("PROFILE_MAX_RESULTS", "50"))
+    ):
+        self.directory = directory
+        self.max_results = max_results
+        self._lock = threading.Lock()
+        self._results: Dict[str, dict] = {}
+
+    def save(self, mode: str, method: str, path: str, duration_ms: float, data: bytes) -> dict:
+        profile_id = uuid.uuid4().hex
+        filename = f"{profile_id}.{PROFILE_EXTENSIONS[mode]}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / filename).write_bytes(data)
+
+        entry = {
+            "id": profile_id,
+            "mode": mode,
+            "method": method,
+            "path": path,
+            "duration_ms": round(duration_ms, 3),
+            "size_bytes": len(data),
+            "filename": filename,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+        with self._lock:
+            self._results[profile_id] = entry
+            while len(self._results) > self.max_results:
+                oldest = self._results.pop(next(iter(self._results)))
+                (self.directory / oldest["filename"]).unlink(missing_ok=True)
+        logger.info("Stored %s profile %s for %s %s (%.1f ms)", mode, profile_id, method, path, duration_ms)
+        return entry
+
+    def list(self) -> List[dict]:
+        with self._lock:
+            return list(reversed(self._results.values()))
+
+    def path_for(self, profile_id: str) -> Optional[Path]:
+        with self._lock:
+            entry = self._results.get(profile_id)
+        return self.directory / entry["filename"] if entry else None
+
+profiling_toggle = ProfilingToggle()
+profile_store = ProfileStore()
@@ -0,0 +1,200 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.services.qr_service import QRCodeService
+
+logger = logging.getLogger(__name__)
+
+def render_qr_job(user_code: str, qr_code_id: str, profile_url: str) -> tuple[str, float]:
+    """
+    Worker-process entry point: render one QR image.
+
+    Returns:
+        (relative image path, render time in seconds)
+    """
+    started = time.perf_counter()
+    relative_path = QRCodeService.generate_profile_qr_image(
+        user_code=user_code,
+        qr_code_id=qr_code_id,
+        profile_url=profile_url,
+        display_name=user_code
+    )
+    return relative_path, time.perf_counter() - started
+
+class QRRenderQueue:
+    """
+    Process-pool-backed queue for QR image rendering.
+
+    Jobs are rendered off the request path; when a job finishes the user's
+    qr_image_path is updated in a short-lived session. Failed renders are
+    retried with a linear backoff up to max_retries.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_workers: int = int(os.getenv("QR_RENDER_WORKERS", "2")),
+        max_retries: int = int(os.getenv("QR_RENDER_MAX_RETRIES", "3")),
+        retry_delay_seconds: float = float(os.getenv("QR_RENDER_RETRY_DELAY", "2.0"))
+    ):
+        self.session_factory = session_factory
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_delay_seconds = retry_delay_seconds
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # Observability counters
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._retried = 0
+        self._render_seconds_total = 0.0
+        self._render_seconds_max = 0.0
+        self._last_render_seconds: Optional[float] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created on first use so importing the app never forks worker processes
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _replace_broken_executor(self, broken: ProcessPoolExecutor) -> None:
+        # A worker died (OOM, kill); the pool refuses all further work, so start a fresh one
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False)
+        logger.warning("QR render pool broke (worker died); starting a new pool")
+
+    def submit(self, user_id: int, user_code: str, qr_code_id: str, profile_url: str) -> Future:
+        """Queue a QR render for a committed user row"""
+        with self._lock:
+            self._pending += 1
+        try:
+            return self._submit(user_id, user_code, qr_code_id, profile_url, attempt=1)
+        except Exception:
+            self._count_failed()
+            raise
+
+    def _retry(self, user_id: int, user_code: str, qr_code_id: str, profile_url: str, attempt: int) -> None:
+        # Runs on a Timer thread, where a raised exception would silently drop the job
+        try:
+            self._submit(user_id, user_code, qr_code_id, profile_url, attempt)
+        except Exception as e:
+            logger.error("QR render retry could not be queued for %s: %s", user_code, str(e))
+            self._count_failed()
+
+    def _count_failed(self) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._failed += 1
+
+    def _submit(self, user_id: int, user_code: str, qr_code_id: str, profile_url: str, attempt: int) -> Future:
+        executor = self._get_executor()
+        try:
+            future = executor.submit(render_qr_job, user_code, qr_code_id, profile_url)
+        except BrokenProcessPool:
+            self._replace_broken_executor(executor)
+            future = self._get_executor().submit(render_qr_job, user_code, qr_code_id, profile_url)
+        future.add_done_callback(
+            lambda f: self._on_done(f, user_id, user_code, qr_code_id, profile_url, attempt)
+        )
+        return future
+
+    def _on_done(
+        self,
+        future: Future,
+        user_id: int,
+        user_code: str,
+        qr_code_id: str,
+        profile_url: str,
+        attempt: int
+    ) -> None:
+        try:
+            relative_path, render_seconds = future.result()
+        except Exception as e:
+            if attempt <= self.max_retries:
+                logger.warning("QR render failed for %s (attempt %d), retrying: %s", user_code, attempt, str(e))
+                with self._lock:
+                    self._retried += 1
+                timer = threading.Timer(
+                    self.retry_delay_seconds * attempt,
+                    self._retry,
+                    args=(user_id, user_code, qr_code_id, profile_url, attempt + 1)
+                )
+                timer.daemon = True
+                timer.start()
+                return
+
+            logger.error("QR render failed permanently for %s: %s", user_code, str(e))
+            self._count_failed()
+            return
+
+        try:
+            self._store_image_path(user_id, qr_code_id, relative_path)
+        except Exception as e:
+            logger.error("Failed to store QR image path for %s: %s", user_code, str(e))
+
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+            self._render_seconds_total += render_seconds
+            self._render_seconds_max = max(self._render_seconds_max, render_seconds)
+            self._last_render_seconds = render_seconds
+        logger.info("Generated QR image: %s in %.1fms", relative_path, render_seconds * 1000)
+
+    def _store_image_path(self, user_id: int, qr_code_id: str, relative_path: str) -> None:
+        db = self.session_factory()
+        try:
+            # Guard on qr_code_id so a stale render never overwrites a regenerated code
+            db.query(User).filter(
+                User.id == user_id,
+                User.qr_code_id == qr_code_id
+            ).update({User.qr_image_path: relative_path}, synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        """Snapshot of queue depth and render latency"""
+        with self._lock:
+            average = self._render_seconds_total / self._completed if self._completed else None
+            return {
+                "queue_depth": self._pending,
+                "completed": self._completed,
+                "failed": self._failed,
+                "retried": self._retried,
+                "workers": self.max_workers,
+                "render_ms_last": round(self._last_render_seconds * 1000, 2) if self._last_render_seconds is not None else None,
+                "render_ms_avg": round(average * 1000, 2) if average is not None else None,
+                "render_ms_max": round(self._render_seconds_max * 1000, 2)
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool; waits for in-flight renders by default"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+
+# Shared queue used by the API process
+qr_render_queue = QRRenderQueue()
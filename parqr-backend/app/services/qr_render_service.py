@@ -0,0 +1,256 @@
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Level -> qrcode.constants attribute; qrcode (and PIL) are imported on first render, not at startup
+ERROR_CORRECTION_LEVELS = {
+    "L": "ERROR_CORRECT_L",
+    "M": "ERROR_CORRECT_M",
+    "Q": "ERROR_CORRECT_Q",
+    "H": "ERROR_CORRECT_H",
+}
+
+# Quiet zone in modules around the code
+QR_BORDER = 2
+
+MEDIA_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+
+class QRRenderService:
+
+    @staticmethod
+    def content_key(payload: str, fmt: str, box_size: int, error_correction: str) -> str:
+        """
+        Content address of a render: SHA-256 over the payload and every render parameter.
+
+        Keyed on the effective box_size (see box_size()), not the requested pixel
+        size, so every size that renders the same image shares one entry.
+        """
+        raw = f"{payload}\x1f{fmt}\x1f{box_size}\x1f{error_correction}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def box_size(payload: str, size: int, error_correction: str) -> int:
+        """Pixels per module render() uses for size; only fits the QR version, no matrix is built"""
+        import qrcode
+
+        qr = qrcode.QRCode(
+            version=None,
+            error_correction=getattr(qrcode.constants, ERROR_CORRECTION_LEVELS[error_correction]),
+            box_size=1,
+            border=QR_BORDER
+        )
+        qr.add_data(payload)
+        modules_count = qr.best_fit() * 4 + 17
+        return max(1, size // (modules_count + 2 * QR_BORDER))
+
+    @staticmethod
+    def render(payload: str, fmt: str = "png", size: int = 300, error_correction: str = "M") -> bytes:
+        """
+        Render a QR code for payload.
+
+        Args:
+            payload: Data encoded in the QR code (profile deep link)
+            fmt: 'png' or 'svg'
+            size: Target edge length in pixels; the nearest module multiple not exceeding it is used
+            error_correction: One of L, M, Q, H
+
+        Returns:
+            Encoded image bytes
+        """
+        import qrcode
+        import qrcode.image.svg
+
+        qr = qrcode.QRCode(
+            version=None,
+            error_correction=getattr(qrcode.constants, ERROR_CORRECTION_LEVELS[error_correction]),
+            box_size=1,
+            border=QR_BORDER
+        )
+        qr.add_data(payload)
+        qr.make(fit=True)
+
+        # Choose box_size so the rendered image is as close to size as possible
+        qr.box_size = max(1, size // (qr.modules_count + 2 * QR_BORDER))
+
+        if fmt == "svg":
+            qr_img = qr.make_image(image_factory=qrcode.image.svg.SvgPathImage)
+            return qr_img.to_string(encoding="unicode").encode("utf-8")
+
+        qr_img = qr.make_image(fill_color="black", back_color="white")
+        buffer = io.BytesIO()
+        qr_img.save(buffer, "PNG")
+        return buffer.getvalue()
+
+class QRRenderCache:
+    """
+    Two-level content-addressed cache for rendered QR codes.
+
+    Renders are stored by content key in an in-memory LRU bounded by total bytes
+    and mirrored to disk so they survive restarts. The disk tier is an LRU too,
+    bounded by max_disk_bytes: its index is built from file mtimes on first use
+    and a disk hit refreshes the file's mtime. Each process enforces the budget
+    on its own view of the directory, so with several workers sharing it the
+    total can briefly overshoot. A separate alias index maps request identity
+    (user_code + params) to the content key, so a repeated request is served
+    with dictionary lookups only. The payload behind a user_code can change
+    (profile_deep_link), so aliases expire after alias_ttl seconds; content
+    entries never go stale.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_memory_bytes: Optional[int] = None,
+        max_disk_bytes: Optional[int] = None,
+        max_aliases: Optional[int] = None,
+        alias_ttl: Optional[float] = None
+    ):
+        self.cache_dir = cache_dir or Path(__file__).parent.parent.parent / "qr_cache"
+        # Read in __init__ (not as default args) so .env values loaded at startup apply
+        self.max_memory_bytes = max_memory_bytes if max_memory_bytes is not None else int(os.getenv("QR_CACHE_MAX_MEMORY_BYTES", str(32 * 1024 * 1024)))
+        self.max_disk_bytes = max_disk_bytes if max_disk_bytes is not None else int(os.getenv("QR_CACHE_MAX_DISK_BYTES", str(512 * 1024 * 1024)))
+        self.max_aliases = max_aliases if max_aliases is not None else int(os.getenv("QR_CACHE_MAX_ALIASES", "100000"))
+        self.alias_ttl = alias_ttl if alias_ttl is not None else float(os.getenv("QR_CACHE_ALIAS_TTL", "300"))
+
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._aliases: "OrderedDict[tuple, tuple]" = OrderedDict()  # alias -> (key, expires_at)
+        self._memory_bytes = 0
+        self._disk_entries: "Optional[OrderedDict[Path, int]]" = None  # path -> size, least recently used first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+    def _disk_path(self, key: str, fmt: str) -> Path:
+        # Shard by prefix to keep directory sizes manageable
+        return self.cache_dir / key[:2] / f"{key}.{fmt}"
+
+    def resolve_alias(self, alias: tuple) -> Optional[str]:
+        with self._lock:
+            entry = self._aliases.get(alias)
+            if entry is None:
+                return None
+            key, expires_at = entry
+            if time.monotonic() >= expires_at:
+                # Re-read the payload; the render itself is still cached by content key
+                del self._aliases[alias]
+                return None
+            self._aliases.move_to_end(alias)
+            return key
+
+    def get(self, key: str, fmt: str) -> Optional[bytes]:
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+                return content
+
+        disk_path = self._disk_path(key, fmt)
+        try:
+            content = disk_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        self._touch_disk(disk_path, len(content))
+        self._remember(key, content)
+        return content
+
+    def put(self, key: str, fmt: str, content: bytes, alias: Optional[tuple] = None) -> None:
+        self._remember(key, content)
+        if alias is not None:
+            with self._lock:
+                self._aliases[alias] = (key, time.monotonic() + self.alias_ttl)
+                self._aliases.move_to_end(alias)
+                while len(self._aliases) > self.max_aliases:
+                    self._aliases.popitem(last=False)
+
+        disk_path = self._disk_path(key, fmt)
+        if not disk_path.exists():
+            try:
+                disk_path.parent.mkdir(parents=True, exist_ok=True)
+                # Write-then-rename so concurrent readers never see a partial file
+                tmp_path = disk_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp_path.write_bytes(content)
+                os.replace(tmp_path, disk_path)
+            except OSError as e:
+                logger.warning("Failed to persist QR cache entry %s: %s", key, str(e))
+                return
+            self._track_disk(disk_path, len(content))
+
+    def _remember(self, key: str, content: bytes) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = content
+            self._memory_bytes += len(content)
+            while self._memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _load_disk_index(self) -> "OrderedDict[Path, int]":
+        """Disk entries oldest-mtime first; scanned once per process (caller holds the lock)"""
+        if self._disk_entries is None:
+            found = []
+            if self.cache_dir.is_dir():
+                for shard in os.scandir(self.cache_dir):
+                    if not shard.is_dir():
+                        continue
+                    for entry in os.scandir(shard.path):
+                        if entry.name.endswith(".tmp"):
+                            continue
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        found.append((stat.st_mtime, Path(entry.path), stat.st_size))
+            found.sort(key=lambda item: item[0])
+            self._disk_entries = OrderedDict((path, size) for _, path, size in found)
+            self._disk_bytes = sum(self._disk_entries.values())
+        return self._disk_entries
+
+    def _touch_disk(self, disk_path: Path, size: int) -> None:
+        """Mark a disk entry as recently used, here and (via mtime) for the next process"""
+        with self._lock:
+            disk_entries = self._load_disk_index()
+            if disk_path not in disk_entries:
+                disk_entries[disk_path] = size
+                self._disk_bytes += size
+            disk_entries.move_to_end(disk_path)
+        try:
+            os.utime(disk_path)
+        except OSError:
+            pass
+
+    def _track_disk(self, disk_path: Path, size: int) -> None:
+        """Record a new disk entry and evict least recently used files over max_disk_bytes"""
+        evicted = []
+        with self._lock:
+            disk_entries = self._load_disk_index()
+            if disk_path not in disk_entries:
+                disk_entries[disk_path] = size
+                self._disk_bytes += size
+            disk_entries.move_to_end(disk_path)
+            while self._disk_bytes > self.max_disk_bytes and len(disk_entries) > 1:
+                path, evicted_size = disk_entries.popitem(last=False)
+                self._disk_bytes -= evicted_size
+                evicted.append(path)
+
+        for path in evicted:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass  # Another worker evicted it first
+            except OSError as e:
+                logger.warning("Failed to evict QR cache file %s: %s", path, str(e))
+
+# Shared cache used by the API process
+qr_render_cache = QRRenderCache()
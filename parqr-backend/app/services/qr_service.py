@@ -1,9 +1,11 @@
-import qrcode
+import io
 import os
 from pathlib import Path
 from typing import Optional
 import logging
 
+from app.services.asset_storage import get_asset_storage
+
 logger = logging.getLogger(__name__)
 
 class QRCodeService:
@@ -25,9 +27,12 @@ class QRCodeService:
     ) -> str:
         """
         Generate a clean QR code image for design team to use in card production
-        Returns: relative path to saved image
+        Returns: URL of the stored image (content-hashed, immutable)
         """
 
+        # Imported here so qrcode/PIL stay off the application startup path
+        import qrcode
+
         try:
             # Create QR code with minimal, clean settings to match frontend display
             qr = qrcode.QRCode(
@@ -41,18 +46,17 @@ class QRCodeService:
 
             # Create QR code image
             qr_img = qr.make_image(fill_color="black", back_color="white")
+            buffer = io.BytesIO()
+            qr_img.save(buffer, "PNG")
 
-            # Save with descriptive filename for design POC
-            qr_dir = QRCodeService.get_qr_images_directory()
-            filename = f"qr_{user_code}.png"
-            file_path = qr_dir / filename
-
-            qr_img.save(file_path, "PNG")
+            # Store under a content-hashed, immutable key shared by all API instances
+            storage = get_asset_storage()
+            key = storage.save(buffer.getvalue(), prefix="qr", extension="png", content_type="image/png")
 
-            relative_path = f"qr_images/{filename}"
-            logger.info(f"Generated QR image for design team: {relative_path}")
-            return relative_path
+            image_url = storage.url_for(key)
+            logger.info("Generated QR image for design team: %s", image_url)
+            return image_url
         
         except Exception as e:
-            logger.error(f"Failed to generate QR image for {user_code}: {str(e)}")
+            logger.error("Failed to generate QR image for %s: %s", user_code, str(e))
             raise e
\ No newline at end of file
@@ -0,0 +1,349 @@
+"""
+Data retention: purge or anonymize old rows in small, throttled chunks.
+
+Each policy walks its timestamp index in (timestamp, id) order, takes at most
+batch_size ids per chunk and deletes/updates them by primary key in a short
+transaction of its own, then sleeps before the next chunk so hot tables never
+see long-held locks or a saturated primary. A run stops early when it exceeds
+max_runtime; the next run picks up the remaining rows.
+
+Anonymize policies leave processed rows in the table. Walking them again
+every run would scan most of the table before reaching new work, so these
+"resumable" policies remember the last (timestamp, id) they processed and
+start there. A process without a watermark (fresh start, other instance)
+starts RETENTION_LOOKBACK_DAYS before the cutoff; the initial backfill of
+older rows is run once with scripts/run_retention.py --backfill.
+
+Policies run from the in-process scheduler (RETENTION_ENABLED=true) or from
+scripts/run_retention.py. On MySQL a named lock (GET_LOCK) makes sure only one
+API instance runs them at a time.
+
+Env variables:
+    RETENTION_ENABLED: Run the scheduler in the API process (default: false)
+    RETENTION_INTERVAL: Seconds between scheduled runs (default: 3600)
+    RETENTION_BATCH_SIZE: Rows per chunk (default: 1000)
+    RETENTION_CHUNK_PAUSE: Minimum seconds between chunks (default: 0.05)
+    RETENTION_THROTTLE_RATIO: Extra pause as a multiple of the chunk's own duration (default: 1.0)
+    RETENTION_MAX_RUNTIME: Seconds per policy per run (default: 300)
+    RETENTION_LOOKBACK_DAYS: How far behind the cutoff a resumable policy starts walking when this
+        process has no watermark for it yet (default: 7); older rows need a --backfill run
+    RETENTION_<POLICY>_DAYS: Override a policy's retention period; 0 disables it
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+import logging
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.locks import named_lock
+from app.db.session import SessionLocal
+from app.models.chat_message import ChatMessage
+from app.models.move_request import MoveRequest
+from app.models.notification_outbox import NotificationOutbox
+from app.models.parking_session import ParkingSession
+
+logger = logging.getLogger(__name__)
+
+# move_requests.ip_address is NOT NULL; anonymized rows get this placeholder
+ANONYMIZED_IP = "0.0.0.0"
+
+RETENTION_LOCK_NAME = "parqr_retention"
+
+RETENTION_ROWS = Counter(
+    "parqr_retention_rows_total",
+    "Rows purged or anonymized by retention policies",
+    ["policy", "action"]
+)
+RETENTION_CHUNK_DURATION = Histogram(
+    "parqr_retention_chunk_duration_seconds",
+    "Duration of one retention chunk transaction",
+    ["policy"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+RETENTION_LAST_RUN = Gauge(
+    "parqr_retention_last_run_timestamp_seconds",
+    "Unix time a retention policy last finished a run",
+    ["policy"],
+    multiprocess_mode="max"
+)
+
+class RetentionPolicy:
+    """Purge (action='delete') or anonymize (action='anonymize') rows older than retention_days"""
+
+    def __init__(
+        self,
+        name: str,
+        model,
+        timestamp_column: str,
+        retention_days: int,
+        action: str = "delete",
+        anonymize_values: Optional[dict] = None,
+        condition=None,
+        resumable: bool = False
+    ):
+        if action not in ("delete", "anonymize"):
+            raise ValueError(f"Unknown retention action: {action}")
+        if action == "anonymize" and not anonymize_values:
+            raise ValueError("anonymize policies need anonymize_values")
+        self.name = name
+        self.model = model
+        self.timestamp_column = timestamp_column
+        self.retention_days = int(os.getenv(f"RETENTION_{name.upper()}_DAYS", str(retention_days)))
+        self.action = action
+        self.anonymize_values = anonymize_values or {}
+        self.condition = condition
+        # Processed rows stay in the table and never match the condition again, so a
+        # run may start where the previous one stopped instead of at the oldest row
+        self.resumable = resumable
+
+    @property
+    def enabled(self) -> bool:
+        return self.retention_days > 0
+
+    def describe(self) -> dict:
+        return {
+            "name": self.name,
+            "table": self.model.__tablename__,
+            "action": self.action,
+            "timestamp_column": self.timestamp_column,
+            "retention_days": self.retention_days,
+            "enabled": self.enabled
+        }
+
+def default_policies() -> List[RetentionPolicy]:
+    """Built-in policies; periods can be overridden with RETENTION_<NAME>_DAYS"""
+    return [
+        # Requester IPs are only needed for short-term abuse investigation
+        RetentionPolicy(
+            "move_request_ip", MoveRequest, "created_at", 30, action="anonymize",
+            anonymize_values={"ip_address": ANONYMIZED_IP, "requester_info": None},
+            condition=MoveRequest.ip_address != ANONYMIZED_IP,
+            resumable=True
+        ),
+        RetentionPolicy("move_requests", MoveRequest, "created_at", 365),
+        RetentionPolicy("chat_messages", ChatMessage, "created_at", 180),
+        RetentionPolicy(
+            "notification_outbox", NotificationOutbox, "created_at", 30,
+            condition=NotificationOutbox.status.in_(("sent", "failed"))
+        ),
+        # Old ended sessions move to the cold archive (scripts/archive_parking_sessions.py) and stay
+        # readable as history; deleting them outright is opt-in (set RETENTION_PARKING_SESSIONS_DAYS)
+        RetentionPolicy("parking_sessions", ParkingSession, "end_time", 0),
+    ]
+
+class RetentionRunner:
+    """Runs retention policies chunk by chunk, on demand or from a background thread"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        policies: Optional[List[RetentionPolicy]] = None,
+        interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        chunk_pause: Optional[float] = None,
+        throttle_ratio: Optional[float] = None,
+        max_runtime: Optional[float] = None,
+        lookback_days: Optional[float] = None
+    ):
+        self.session_factory = session_factory
+        self._policies = policies
+        # Read in __init__ (not as default args) so .env values loaded at startup apply
+        self.interval = interval if interval is not None else float(os.getenv("RETENTION_INTERVAL", "3600"))
+        self.batch_size = batch_size if batch_size is not None else int(os.getenv("RETENTION_BATCH_SIZE", "1000"))
+        self.chunk_pause = chunk_pause if chunk_pause is not None else float(os.getenv("RETENTION_CHUNK_PAUSE", "0.05"))
+        self.throttle_ratio = throttle_ratio if throttle_ratio is not None else float(os.getenv("RETENTION_THROTTLE_RATIO", "1.0"))
+        self.max_runtime = max_runtime if max_runtime is not None else float(os.getenv("RETENTION_MAX_RUNTIME", "300"))
+        self.lookback_days = lookback_days if lookback_days is not None else float(os.getenv("RETENTION_LOOKBACK_DAYS", "7"))
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._last_results: Dict[str, dict] = {}
+        # Last (timestamp, id) processed by each resumable policy
+        self._watermarks: Dict[str, tuple] = {}
+
+    @property
+    def policies(self) -> List[RetentionPolicy]:
+        if self._policies is None:
+            self._policies = default_policies()
+        return self._policies
+
+    def run_policy(
+        self,
+        policy: RetentionPolicy,
+        now: Optional[datetime] = None,
+        dry_run: bool = False,
+        backfill: bool = False
+    ) -> dict:
+        """
+        Process rows older than the policy's cutoff, one chunk per transaction.
+
+        Args:
+            policy: Policy to run
+            now: Reference time for the cutoff (default: current UTC time)
+            dry_run: Walk and count matching rows without modifying them
+            backfill: Walk a resumable policy from its oldest row instead of its watermark
+
+        Returns:
+            Run summary with rows processed, chunks and whether the run finished
+        """
+        started = time.perf_counter()
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=policy.retention_days)
+        model = policy.model
+        timestamp = getattr(model, policy.timestamp_column)
+
+        rows_processed = 0
+        chunks = 0
+        complete = True
+        last_position = None
+        lower_bound = None
+        if policy.resumable and not backfill:
+            with self._lock:
+                last_position = self._watermarks.get(policy.name)
+            if last_position is None:
+                lower_bound = cutoff - timedelta(days=self.lookback_days)
+
+        while True:
+            if self._stop_event.is_set() or time.perf_counter() - started > self.max_runtime:
+                complete = False
+                break
+
+            chunk_started = time.perf_counter()
+            query = select(model.id, timestamp).where(timestamp < cutoff)
+            if policy.condition is not None:
+                query = query.where(policy.condition)
+            if lower_bound is not None:
+                query = query.where(timestamp >= lower_bound)
+            if last_position is not None:
+                # Keyset over the timestamp index, so each chunk starts where the last one ended
+                last_timestamp, last_id = last_position
+                query = query.where(or_(timestamp > last_timestamp, and_(timestamp == last_timestamp, model.id > last_id)))
+            query = query.order_by(timestamp, model.id).limit(self.batch_size)
+
+            db = self.session_factory()
+            try:
+                rows = db.execute(query).all()
+                ids = [row[0] for row in rows]
+                if ids and not dry_run:
+                    if policy.action == "delete":
+                        statement = delete(model).where(model.id.in_(ids))
+                    else:
+                        statement = update(model).where(model.id.in_(ids)).values(**policy.anonymize_values)
+                    db.execute(statement.execution_options(synchronize_session=False))
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+            if not ids:
+                break
+
+            chunk_seconds = time.perf_counter() - chunk_started
+            chunks += 1
+            rows_processed += len(ids)
+            last_position = (rows[-1][1], rows[-1][0])
+            if not dry_run:
+                RETENTION_ROWS.labels(policy.name, policy.action).inc(len(ids))
+                RETENTION_CHUNK_DURATION.labels(policy.name).observe(chunk_seconds)
+                if policy.resumable:
+                    with self._lock:
+                        self._watermarks[policy.name] = last_position
+
+            if len(ids) < self.batch_size:
+                break
+            # Leave the table alone for at least as long as the chunk held it (throttle_ratio=1.0)
+            self._stop_event.wait(max(self.chunk_pause, chunk_seconds * self.throttle_ratio))
+
+        result = {
+            "policy": policy.name,
+            "action": policy.action,
+            "dry_run": dry_run,
+            "cutoff": cutoff.isoformat(),
+            "rows": rows_processed,
+            "chunks": chunks,
+            "complete": complete,
+            "seconds": round(time.perf_counter() - started, 3),
+            "finished_at": datetime.now(timezone.utc).isoformat()
+        }
+        if not dry_run:
+            RETENTION_LAST_RUN.labels(policy.name).set_to_current_time()
+            with self._lock:
+                self._last_results[policy.name] = result
+        if rows_processed:
+            logger.info("Retention %s: %s %d rows in %d chunks (%.1fs, complete=%s)",
+                        policy.name, policy.action, rows_processed, chunks, result["seconds"], complete)
+        return result
+
+    def run_all(self, names: Optional[List[str]] = None, dry_run: bool = False, backfill: bool = False) -> List[dict]:
+        """
+        Run every enabled policy (or only those in names) once.
+
+        backfill walks resumable policies from their oldest row (see run_policy).
+
+        Returns:
+            One summary per policy run; empty if another instance holds the retention lock
+        """
+        selected = [p for p in self.policies if p.enabled and (names is None or p.name in names)]
+        with named_lock(self.session_factory, RETENTION_LOCK_NAME) as acquired:
+            if not acquired:
+                logger.info("Retention run skipped: another instance holds the lock")
+                return []
+            results = []
+            for policy in selected:
+                try:
+                    results.append(self.run_policy(policy, dry_run=dry_run, backfill=backfill))
+                except Exception as e:
+                    logger.error("Retention policy %s failed: %s", policy.name, str(e))
+                    results.append({"policy": policy.name, "error": str(e)})
+            return results
+
+    def stats(self) -> dict:
+        """Configured policies and the last completed run of each"""
+        with self._lock:
+            last_results = dict(self._last_results)
+            watermarks = dict(self._watermarks)
+        return {
+            "scheduler_running": bool(self._thread and self._thread.is_alive()),
+            "interval_seconds": self.interval,
+            "batch_size": self.batch_size,
+            "lookback_days": self.lookback_days,
+            "policies": [
+                {**p.describe(), "last_run": last_results.get(p.name), "watermark": watermarks.get(p.name)}
+                for p in self.policies
+            ]
+        }
+
+    def start(self) -> None:
+        """Start the background scheduler thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="retention-scheduler", daemon=True)
+        self._thread.start()
+        logger.info("Retention scheduler started (every %.0fs)", self.interval)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the scheduler; an in-progress chunk finishes, the rest of the run is skipped"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        # First run waits one interval so retention never competes with startup traffic
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.run_all()
+            except Exception as e:
+                logger.error("Retention run failed: %s", str(e))
+
+# Shared runner used by the API process
+retention_runner = RetentionRunner()
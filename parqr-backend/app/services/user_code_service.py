@@ -0,0 +1,30 @@
+import hashlib
+import os
+import secrets
+import string
+import uuid
+
+def generate_user_code() -> str:
+    """Generate 8-character alphanumeric user code"""
+    return ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(8))
+
+def generate_qr_code_id(user_code: str, phone_number: str) -> str:
+    """
+    Generate unique QR code ID based on user data
+    Format: QR_[8-char-hash] for easy identification
+    """
+    # Create unique string from user data + timestamp
+    unique_string = f"{user_code}_{phone_number}_{uuid.uuid4().hex[:8]}"
+    
+    # Generate SHA-256 hash and take first 8 characters
+    hash_object = hashlib.sha256(unique_string.encode())
+    short_hash = hash_object.hexdigest()[:8].upper()
+    
+    return f"QR_{short_hash}"
+
+def build_profile_deep_link(user_code: str) -> str:
+    """Generate profile deep link URL for a user code"""
+    if os.getenv("DEV_MODE", "false").lower() == "true":
+        return f"exp://192.168.1.39:19006/--/profile/{user_code}"
+    # production deep link when ready. Placeholder for now.
+    return f"https://parqr.app/profile/{user_code}"
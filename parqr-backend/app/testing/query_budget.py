@@ -0,0 +1,25 @@
+"""
+pytest plugin exposing the query_budget fixture.
+
+Enable it from a conftest.py:
+
+    pytest_plugins = ["app.testing.query_budget"]
+
+and assert a per-endpoint statement budget:
+
+    def test_public_profile_queries(client, query_budget):
+        with query_budget(2):
+            client.get("/api/v01/user/public/ABCD1234")
+
+The block fails with QueryBudgetExceeded if any request inside it issues more
+statements than allowed or repeats one statement shape N+1 style. The app must
+be wrapped in QueryInstrumentationMiddleware (create_app() does this).
+"""
+
+import pytest
+
+from app.middleware.query_instrumentation import query_budget as _query_budget
+
+@pytest.fixture
+def query_budget():
+    return _query_budget
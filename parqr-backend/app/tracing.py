@@ -0,0 +1,304 @@
+"""
+Lightweight request tracing with OpenTelemetry-style spans.
+
+Each traced request gets a root span; child spans cover the shared FastAPI
+dependencies (dep.get_db, dep.get_current_user, ...), the endpoint body
+(handler), every SQL statement (db.query), chat message encryption (crypto.*)
+and response serialization (serialize). Spans are handed to a pluggable
+exporter when the request finishes and summarized per category in a
+Server-Timing response header.
+
+Code outside a traced request pays only a ContextVar lookup per span.
+Dependencies open their own span (with span("dep.<name>")), so the
+dependency tree is never modified and app.dependency_overrides keeps
+working with tracing enabled.
+
+Env variables:
+    TRACING_ENABLED: Install the tracing hooks (default: false)
+    TRACING_EXPORTER: none | memory | file (default: none, Server-Timing only)
+    TRACING_SAMPLE_RATE: Fraction of requests traced (default: 1.0)
+    TRACING_FILE_PATH: JSON-lines output of the file exporter (default: traces.jsonl)
+    TRACING_SERVER_TIMING: Add the Server-Timing header (default: true)
+"""
+
+import asyncio
+import json
+import os
+import random
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Type
+import logging
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+class Span:
+    """A timed operation within a trace; timestamps are epoch nanoseconds"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "root", "_spans", "_serialize_span")
+
+    def __init__(self, name: str, trace_id: str, parent: Optional["Span"], spans: List["Span"], attributes: Optional[dict] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.root = parent.root if parent is not None else self
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes or {}
+        self._spans = spans
+        self._serialize_span: Optional[Span] = None
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self._spans.append(self)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes
+        }
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+def start_span(name: str, **attributes) -> Optional[Span]:
+    """Start a child of the current span, or return None when no trace is active"""
+    parent = _current_span.get()
+    if parent is None:
+        return None
+    return Span(name, parent.trace_id, parent, parent._spans, attributes)
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """Context manager around start_span that also makes the span current for nested spans"""
+    child = start_span(name, **attributes)
+    if child is None:
+        yield None
+        return
+    token = _current_span.set(child)
+    try:
+        yield child
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+# Exporters
+
+class SpanExporter:
+    """Receives the finished spans of one trace"""
+
+    name = "none"
+
+    def export(self, spans: List[Span]) -> None:
+        pass
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps the most recent spans in memory; for tests and local debugging"""
+
+    name = "memory"
+
+    def __init__(self, max_spans: int = 10000):
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+
+    def export(self, spans: List[Span]) -> None:
+        self.spans.extend(spans)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+class JsonFileSpanExporter(SpanExporter):
+    """Appends one JSON line per span to a local file"""
+
+    name = "file"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or os.getenv("TRACING_FILE_PATH", "traces.jsonl"))
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(s.to_dict(), default=str) + "\n" for s in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+SPAN_EXPORTERS: Dict[str, Type[SpanExporter]] = {
+    SpanExporter.name: SpanExporter,
+    InMemorySpanExporter.name: InMemorySpanExporter,
+    JsonFileSpanExporter.name: JsonFileSpanExporter,
+}
+
+def register_span_exporter(exporter_cls: Type[SpanExporter]) -> None:
+    """Make an exporter selectable through the TRACING_EXPORTER env variable"""
+    SPAN_EXPORTERS[exporter_cls.name] = exporter_cls
+
+def get_span_exporter() -> SpanExporter:
+    """Instantiate the exporter configured by TRACING_EXPORTER (default: none)"""
+    exporter_name = os.getenv("TRACING_EXPORTER", "none").lower()
+    if exporter_name not in SPAN_EXPORTERS:
+        raise ValueError(f"Unknown span exporter: {exporter_name}")
+    return SPAN_EXPORTERS[exporter_name]()
+
+# Instrumentation
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_span(conn, cursor, statement, parameters, context, executemany):
+    query_span = start_span("db.query", **{"db.statement": statement[:500], "db.executemany": executemany})
+    if query_span is not None and context is not None:
+        # On the execution context, not conn.info, so nothing outlives the statement on a pooled connection
+        context._parqr_query_span = query_span
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_query_span(conn, cursor, statement, parameters, context, executemany):
+    query_span = getattr(context, "_parqr_query_span", None)
+    if query_span is not None:
+        query_span.end()
+
+@event.listens_for(Engine, "handle_error")
+def _fail_query_span(exception_context):
+    query_span = getattr(exception_context.execution_context, "_parqr_query_span", None)
+    if query_span is not None:
+        query_span.attributes["error"] = type(exception_context.original_exception).__name__
+        query_span.end()
+
+def traced(name: str) -> Callable:
+    """Decorator running a sync or async function inside span(name)"""
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return sync_wrapper
+    return decorator
+
+class TracingMiddleware:
+    """
+    Opens the root span for sampled requests, closes the serialize span when the
+    response starts, adds Server-Timing and exports the trace once the response is sent.
+    """
+
+    def __init__(self, app, exporter: SpanExporter, sample_rate: float = 1.0, server_timing: bool = True):
+        self.app = app
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        spans: List[Span] = []
+        root = Span(f"{scope['method']} {scope['path']}", secrets.token_hex(16), None, spans, {"http.method": scope["method"]})
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                if root._serialize_span is not None:
+                    root._serialize_span.end()
+                root.attributes["http.status_code"] = message["status"]
+                if self.server_timing:
+                    message = {**message, "headers": list(message.get("headers", [])) + [(b"server-timing", server_timing_header(spans, root).encode())]}
+            await send(message)
+
+        token = _current_span.set(root)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_span.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                root.name = f"{scope['method']} {route.path_format}"
+                root.attributes["http.route"] = route.path_format
+            root.end()
+            try:
+                self.exporter.export(spans)
+            except Exception as e:
+                logger.warning("Span export failed: %s", str(e))
+
+def _traced_endpoint(call: Callable) -> Callable:
+    # The handler span ends when the endpoint returns; the serialize span then runs until
+    # the response starts (response_model validation, jsonable_encoder, JSON rendering).
+    def begin_serialize():
+        serialize_span = start_span("serialize")
+        if serialize_span is not None:
+            serialize_span.root._serialize_span = serialize_span
+
+    if asyncio.iscoroutinefunction(call):
+        @wraps(call)
+        async def async_wrapper(*args, **kwargs):
+            with span("handler"):
+                result = await call(*args, **kwargs)
+            begin_serialize()
+            return result
+        return async_wrapper
+
+    @wraps(call)
+    def sync_wrapper(*args, **kwargs):
+        with span("handler"):
+            result = call(*args, **kwargs)
+        begin_serialize()
+        return result
+    return sync_wrapper
+
+def server_timing_header(spans: List[Span], root: Span) -> str:
+    """Sum finished span durations per category ('db', 'dep', 'crypto', ...) plus the total so far"""
+    totals: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    for finished in spans:
+        category = finished.name.split(".", 1)[0]
+        totals[category] = totals.get(category, 0.0) + finished.duration_ms
+        counts[category] = counts.get(category, 0) + 1
+    entries = [f'{category};dur={duration:.2f};desc="{counts[category]}x"' for category, duration in totals.items()]
+    entries.append(f"total;dur={root.duration_ms:.2f}")
+    return ", ".join(entries)
+
+span_exporter: SpanExporter = SpanExporter()
+
+def install_tracing(app: FastAPI) -> None:
+    """
+    Enable request tracing for every API route registered on app.
+
+    Call after all routers are included. Does nothing unless TRACING_ENABLED=true.
+    """
+    global span_exporter
+    if os.getenv("TRACING_ENABLED", "false").lower() != "true":
+        return
+
+    span_exporter = get_span_exporter()
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            route.dependant.call = _traced_endpoint(route.dependant.call)
+    app.add_middleware(
+        TracingMiddleware,
+        exporter=span_exporter,
+        sample_rate=float(os.getenv("TRACING_SAMPLE_RATE", "1.0")),
+        server_timing=os.getenv("TRACING_SERVER_TIMING", "true").lower() == "true"
+    )
+    logger.info("Request tracing installed with %s exporter", span_exporter.name)
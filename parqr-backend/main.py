@@ -3,21 +3,19 @@ import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware 
 from fastapi.staticfiles import StaticFiles
-from dotenv import load_dotenv
 from pathlib import Path
-from app.db.session import engine
-from app.db.base import Base
-from app.routes import car, health_check, parking, user, signup, chat, move_requests, public_profile
-
-load_dotenv(override=True)
-
-# Database URL loaded from environment
-
-app = FastAPI(
-    title="parQR API",
-    description="Privacy-first parking management API",
-    version="1.0.0"
-)
+from app.db.session import get_engine, get_replica_engine
+from app.db.pool import warm_pool
+from app.logging_config import LogContextMiddleware, configure_logging, shutdown_logging
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware, mark_worker_dead
+from app.middleware.profiling import install_profiling
+from app.middleware.query_instrumentation import QueryInstrumentationMiddleware
+from app.responses import FastJSONResponse
+from app.tracing import install_tracing
+from app.services.notification_service import notification_dispatcher
+from app.services.retention_service import retention_runner
+from app.services.qr_render_queue import qr_render_queue
 
 # Configure CORS middleware
 def get_cors_origins():
@@ -46,35 +44,137 @@ def get_cors_origins():
     
     return base_origins
 
-origins = get_cors_origins()
-
-# For development: Allow all origins (ONLY for development!)
-if os.getenv("DEV_MODE", "false").lower() == "true":
-    origins = ["*"]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["*"],
-)
-
-# Servicing QR code images
-qr_image_path = Path(__file__).parent / "qr_images"
-qr_image_path.mkdir(exist_ok=True)
-app.mount("/qr_images", StaticFiles(directory=str(qr_image_path)), name="qr_images")
-
-Base.metadata.create_all(bind=engine)
-
-app.include_router(health_check.router, prefix= "/api")
-app.include_router(user.router, prefix= "/api")
-app.include_router(car.router, prefix= "/api")
-app.include_router(parking.router, prefix= "/api")
-app.include_router(signup.router, prefix = "/api")
-app.include_router(chat.router, prefix="/api")
-app.include_router(public_profile.router, prefix="/api")
-app.include_router(move_requests.router, prefix="/api")
+def create_app() -> FastAPI:
+    """
+    Build the API application.
+
+    Kept cheap for Cloud Run cold starts: no database connection or schema DDL
+    happens here (Alembic owns the schema; engines are created on first use).
+    Connection pool warm-up, if enabled, runs in the background after startup.
+
+    Env variables:
+        DEV_MODE: Allow all CORS origins
+        DEBUG: Add X-DB-Query-* debug headers to every response
+        LOG_LEVEL / LOG_FORMAT / LOG_SAMPLE_RATES: Logging pipeline (app/logging_config.py)
+        NOTIFICATIONS_ENABLED: Run the outbox notification dispatcher (default: true)
+        RETENTION_ENABLED: Run the data retention scheduler (default: false; app/services/retention_service.py)
+        DB_POOL_WARM_CONNECTIONS: Connections to open in the background at startup (default: 0)
+        DB_CREATE_ALL: Create missing tables at startup, for local SQLite runs only (default: false)
+        PROMETHEUS_MULTIPROC_DIR: Shared directory for /metrics aggregation across workers
+        PROFILING_ENABLED / PROFILING_SECRET: On-demand request profiling (app/middleware/profiling.py)
+        TRACING_ENABLED / TRACING_EXPORTER: Request spans and Server-Timing (app/tracing.py)
+        COMPRESSION_ENABLED / COMPRESSION_MIN_SIZE: Response compression (app/middleware/compression.py)
+        BATCH_MAX_REQUESTS / BATCH_CONCURRENCY: /api/batch limits (app/services/batch_service.py)
+    """
+    # Route modules (and the services they pull in) load when an app is built, not on import
+    from app.routes import batch, car, health_check, parking, user, signup, chat, move_requests, public_profile, qr, assets, onboarding, metrics, profiling
+
+    app = FastAPI(
+        title="parQR API",
+        description="Privacy-first parking management API",
+        version="1.0.0",
+        default_response_class=FastJSONResponse
+    )
+
+    origins = get_cors_origins()
+
+    # For development: Allow all origins (ONLY for development!)
+    if os.getenv("DEV_MODE", "false").lower() == "true":
+        origins = ["*"]
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        allow_headers=["*"],
+    )
+
+    # Per-request SQL statement counts, DB time and N+1 detection (debug headers when DEBUG=true)
+    app.add_middleware(QueryInstrumentationMiddleware)
+
+    # Exposes method/route to the logging pipeline (route tags, per-route sampling)
+    app.add_middleware(LogContextMiddleware)
+
+    # gzip/brotli for JSON and text bodies (COMPRESSION_*); inside metrics so sizes are wire bytes
+    app.add_middleware(CompressionMiddleware)
+
+    # Outermost: per-route latency/status/size histograms for /metrics
+    app.add_middleware(MetricsMiddleware)
+
+    # Legacy QR code images (pre-hashed filenames); new images are served from /api/v01/assets
+    qr_image_path = Path(__file__).parent / "qr_images"
+    qr_image_path.mkdir(exist_ok=True)
+    app.mount("/qr_images", StaticFiles(directory=str(qr_image_path)), name="qr_images")
+
+    app.include_router(health_check.router, prefix= "/api")
+    app.include_router(user.router, prefix= "/api")
+    app.include_router(car.router, prefix= "/api")
+    app.include_router(parking.router, prefix= "/api")
+    app.include_router(signup.router, prefix = "/api")
+    app.include_router(chat.router, prefix="/api")
+    app.include_router(public_profile.router, prefix="/api")
+    app.include_router(move_requests.router, prefix="/api")
+    app.include_router(qr.router, prefix="/api")
+    app.include_router(assets.router, prefix="/api")
+    app.include_router(onboarding.router, prefix="/api")
+    app.include_router(profiling.router, prefix="/api")
+    app.include_router(batch.router, prefix="/api")
+
+    # Prometheus scrape path stays at the conventional /metrics
+    app.include_router(metrics.router)
+
+    # On-demand profiling (PROFILING_ENABLED); must run after all routers are included
+    install_profiling(app)
+
+    # Request spans + Server-Timing (TRACING_ENABLED); also after all routers are included
+    install_tracing(app)
+
+    app.add_event_handler("startup", configure_logging)
+    app.add_event_handler("startup", create_schema_for_local_dev)
+    app.add_event_handler("startup", start_pool_warmup)
+    app.add_event_handler("startup", start_notification_dispatcher)
+    app.add_event_handler("startup", start_retention_scheduler)
+    app.add_event_handler("shutdown", stop_notification_dispatcher)
+    app.add_event_handler("shutdown", stop_retention_scheduler)
+    app.add_event_handler("shutdown", stop_qr_render_queue)
+    app.add_event_handler("shutdown", mark_worker_dead)
+    app.add_event_handler("shutdown", shutdown_logging)
+    return app
+
+def create_schema_for_local_dev():
+    if os.getenv("DB_CREATE_ALL", "false").lower() == "true":
+        from app.db.base import Base
+        Base.metadata.create_all(bind=get_engine())
+
+def start_pool_warmup():
+    connections = int(os.getenv("DB_POOL_WARM_CONNECTIONS", "0"))
+    if connections > 0:
+        warm_pool(get_engine(), connections)
+        replica_engine = get_replica_engine()
+        if replica_engine is not None:
+            warm_pool(replica_engine, connections)
+
+# Background delivery of outbox notifications (move requests, ...)
+def start_notification_dispatcher():
+    if os.getenv("NOTIFICATIONS_ENABLED", "true").lower() == "true":
+        notification_dispatcher.start()
+
+def stop_notification_dispatcher():
+    notification_dispatcher.stop()
+
+# Purge/anonymize old move requests, chat messages, ... in throttled chunks
+def start_retention_scheduler():
+    if os.getenv("RETENTION_ENABLED", "false").lower() == "true":
+        retention_runner.start()
+
+def stop_retention_scheduler():
+    retention_runner.stop()
+
+def stop_qr_render_queue():
+    qr_render_queue.shutdown()
+
+app = create_app()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,108 @@
+"""
+Move old ended parking sessions into the cold archive.
+
+Writes month partitions of memory-mappable column files
+(app/services/parking_archive.py) and then deletes the archived rows from
+parking_sessions in small chunks. Parking history endpoints read both, so
+archived sessions stay visible to users. Intended for a nightly cron job.
+
+Usage:
+    python scripts/archive_parking_sessions.py --list
+    python scripts/archive_parking_sessions.py --dry-run
+    python scripts/archive_parking_sessions.py --older-than-days 90
+    python scripts/archive_parking_sessions.py --verify
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+import argparse
+
+import numpy as np
+
+from app.models.user import User  # noqa: F401 - relationship targets must be mapped
+from app.models.car import Car  # noqa: F401
+from app.models.user_tier import UserTier  # noqa: F401
+from app.models.move_request import MoveRequest  # noqa: F401
+from app.services.parking_archive import ParkingArchive, ParkingArchiver
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def list_partitions(archive: ParkingArchive):
+    stats = archive.stats()
+    print(f"📦 Archive at {stats['root']}: {stats['partitions']} partitions, {stats['rows']:,} sessions, {format_bytes(stats['bytes'])}")
+    for month in stats["months"]:
+        print(f"   {month['month']}  {month['rows']:>12,} sessions  {format_bytes(month['bytes']):>10}  (generation {month['generation']})")
+
+def verify_partitions(archive: ParkingArchive) -> bool:
+    """Check every partition opens, matches its manifest and is sorted for binary search"""
+    ok = True
+    for partition in archive.iter_partitions():
+        problems = []
+        for name, column in partition.columns.items():
+            expected = partition.rows + 1 if name.endswith(".offsets") else partition.rows
+            if not name.endswith(".data") and len(column) != expected:
+                problems.append(f"{name} has {len(column)} values, expected {expected}")
+        user_ids, start_times = partition.columns["user_id"], partition.columns["start_time"]
+        same_user = user_ids[1:] == user_ids[:-1]
+        if np.any(user_ids[1:] < user_ids[:-1]) or np.any(same_user & (start_times[1:] < start_times[:-1])):
+            problems.append("rows are not sorted by (user_id, start_time)")
+        if len(np.unique(partition.columns["id"])) != partition.rows:
+            problems.append("duplicate session ids")
+        if problems:
+            ok = False
+            print(f"   ❌ {partition.month}: {'; '.join(problems)}")
+        else:
+            print(f"   ✅ {partition.month}: {partition.rows:,} sessions")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old ended parking sessions into columnar month partitions")
+    parser.add_argument("--list", action="store_true", help="Show archived partitions and exit")
+    parser.add_argument("--verify", action="store_true", help="Check archived partitions and exit")
+    parser.add_argument("--dry-run", action="store_true", help="Count sessions that would be archived")
+    parser.add_argument("--older-than-days", type=int, help="Archive sessions that ended this many days ago (default: PARKING_ARCHIVE_AFTER_DAYS or 180)")
+    parser.add_argument("--batch-size", type=int, help="Rows per delete chunk (default: PARKING_ARCHIVE_BATCH_SIZE or 1000)")
+    parser.add_argument("--max-runtime", type=float, help="Seconds before stopping (default: PARKING_ARCHIVE_MAX_RUNTIME or 1800)")
+    parser.add_argument("--archive-dir", type=Path, help="Archive root (default: PARKING_ARCHIVE_DIR)")
+    args = parser.parse_args()
+
+    archive = ParkingArchive(args.archive_dir)
+    if args.list:
+        list_partitions(archive)
+        return
+    if args.verify:
+        print(f"🔍 Verifying archive at {archive.root}...")
+        if not verify_partitions(archive):
+            sys.exit(1)
+        return
+
+    archiver = ParkingArchiver(
+        archive=archive,
+        after_days=args.older_than_days,
+        batch_size=args.batch_size,
+        max_runtime=args.max_runtime
+    )
+    print(f"🗄️  Archiving parking sessions that ended more than {archiver.after_days} days ago{' (dry run)' if args.dry_run else ''}...")
+    summary = archiver.run(dry_run=args.dry_run)
+    if summary.get("skipped"):
+        print("⏭️  Another instance holds the archive lock")
+        return
+
+    verb = "would archive" if args.dry_run else "archived"
+    for month in summary["months"]:
+        print(f"   {month['month']}  {verb} {month['rows']:,} sessions")
+    status = "" if summary["complete"] else " (stopped at max runtime, rerun to continue)"
+    print(f"✅ {verb.capitalize()} {summary['rows']:,} sessions in {summary['seconds']:.1f}s{status}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark user_code / qr_code_id allocation strategies at scale.
+
+Seeds a SQLite table shaped like `users` (unique user_code and qr_code_id)
+with N existing users, then allocates new codes with:
+
+    select_loop   - SELECT for a collision, regenerate, then INSERT (old register_user)
+    insert_retry  - INSERT and regenerate only on IntegrityError (current register_user)
+
+and reports time and DB round trips per allocation alongside the analytic
+collision probability for both code spaces.
+
+Usage:
+    python scripts/bench_code_allocation.py                       # 10M existing users
+    python scripts/bench_code_allocation.py --existing 1000000 --allocations 20000
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from app.services.user_code_service import generate_user_code, generate_qr_code_id
+
+USER_CODE_SPACE = 36 ** 8      # 8 chars of [A-Z0-9]
+QR_CODE_SPACE = 16 ** 8        # QR_ + 8 hex chars
+
+def seed(conn: sqlite3.Connection, existing: int, batch_size: int = 100_000) -> None:
+    conn.execute(
+        "CREATE TABLE users (id INTEGER PRIMARY KEY, phone_number TEXT UNIQUE NOT NULL, "
+        "user_code TEXT UNIQUE NOT NULL, qr_code_id TEXT UNIQUE NOT NULL)"
+    )
+    started = time.perf_counter()
+    inserted = 0
+    while inserted < existing:
+        rows = []
+        for i in range(inserted, min(existing, inserted + batch_size)):
+            user_code = generate_user_code()
+            rows.append((f"+82{i:010d}", user_code, generate_qr_code_id(user_code, str(i))))
+        # OR IGNORE: seeding itself hits the same collisions we are measuring
+        conn.executemany("INSERT OR IGNORE INTO users (phone_number, user_code, qr_code_id) VALUES (?, ?, ?)", rows)
+        conn.commit()
+        inserted += len(rows)
+        print(f"   seeded {inserted:,}/{existing:,} ({inserted / (time.perf_counter() - started):,.0f} rows/s)", end="\r")
+    print()
+
+def allocate_select_loop(conn: sqlite3.Connection, phone_number: str) -> int:
+    round_trips = 0
+    user_code = generate_user_code()
+    while True:
+        round_trips += 1
+        if not conn.execute("SELECT 1 FROM users WHERE user_code = ?", (user_code,)).fetchone():
+            break
+        user_code = generate_user_code()
+    qr_code_id = generate_qr_code_id(user_code, phone_number)
+    while True:
+        round_trips += 1
+        if not conn.execute("SELECT 1 FROM users WHERE qr_code_id = ?", (qr_code_id,)).fetchone():
+            break
+        qr_code_id = generate_qr_code_id(user_code, phone_number)
+    round_trips += 1
+    conn.execute("INSERT INTO users (phone_number, user_code, qr_code_id) VALUES (?, ?, ?)", (phone_number, user_code, qr_code_id))
+    conn.commit()
+    return round_trips
+
+def allocate_insert_retry(conn: sqlite3.Connection, phone_number: str) -> int:
+    round_trips = 0
+    while True:
+        user_code = generate_user_code()
+        qr_code_id = generate_qr_code_id(user_code, phone_number)
+        round_trips += 1
+        try:
+            conn.execute("INSERT INTO users (phone_number, user_code, qr_code_id) VALUES (?, ?, ?)", (phone_number, user_code, qr_code_id))
+            conn.commit()
+            return round_trips
+        except sqlite3.IntegrityError:
+            conn.rollback()
+
+def run(existing: int, allocations: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = sqlite3.connect(os.path.join(tmp_dir, "bench.db"))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        print(f"🚀 Seeding {existing:,} existing users...")
+        seed(conn, existing)
+        actual = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+        print(f"\n📐 Analytic per-attempt collision probability at {actual:,} users:")
+        print(f"   user_code:  {actual / USER_CODE_SPACE:.2e}")
+        print(f"   qr_code_id: {actual / QR_CODE_SPACE:.2e}")
+
+        print(f"\n⏱️  Allocating {allocations:,} users per strategy:")
+        for offset, (name, strategy) in enumerate([("select_loop", allocate_select_loop), ("insert_retry", allocate_insert_retry)]):
+            round_trips = 0
+            started = time.perf_counter()
+            for i in range(allocations):
+                round_trips += strategy(conn, f"+83{offset}{i:09d}")
+            elapsed = time.perf_counter() - started
+            print(f"   {name:<13} {elapsed / allocations * 1e6:8.1f} µs/alloc   {round_trips / allocations:.4f} round trips/alloc")
+
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark unique code allocation strategies")
+    parser.add_argument("--existing", type=int, default=10_000_000, help="Existing users to seed")
+    parser.add_argument("--allocations", type=int, default=10_000, help="New users to allocate per strategy")
+    args = parser.parse_args()
+    run(args.existing, args.allocations)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Microbenchmarks for backend hot paths.
+
+Times the pure functions on the request path, without a database:
+
+    crypto.*   ChatMessage.simple_encrypt / simple_decrypt
+    codes.*    generate_user_code / generate_qr_code_id
+    qr.*       QRCodeService.generate_profile_qr_image (render + local storage)
+    schema.*   Pydantic response construction in the chat and move-request routes
+    render.*   Projection-dict + orjson rendering of the move-request history page
+    phone.*    normalize_phone_number
+
+Each benchmark is auto-calibrated (timeit autorange) and repeated; the median
+per-call time is reported. Runs can be appended to a JSON history file and
+each benchmark is compared with its last recorded result, so optimizations
+(and regressions) come with numbers.
+
+Usage:
+    python scripts/bench_hot_paths.py
+    python scripts/bench_hot_paths.py --filter schema.
+    python scripts/bench_hot_paths.py --output bench_history.json --label "$(git rev-parse --short HEAD)"
+    python scripts/bench_hot_paths.py --output bench_history.json --max-regression 0.2
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Tuple
+
+# QR images go to a throwaway directory instead of the repo's assets/
+os.environ.setdefault("ASSET_STORAGE_DIR", tempfile.mkdtemp(prefix="parqr_bench_assets_"))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ["DB_HOST"] = ""
+
+from app.models.user import User  # noqa: F401 - relationship targets must be mapped before building ORM rows
+from app.models.car import Car  # noqa: F401
+from app.models.parking_session import ParkingSession  # noqa: F401
+from app.models.user_tier import UserTier  # noqa: F401
+from app.models.chat_message import ChatMessage
+from app.models.move_request import MoveRequest  # noqa: F401
+from app.schemas.chat_schema import ChatConversationResponse, ChatMessageResponse
+from app.responses import FastJSONResponse
+from app.routes.move_requests import HISTORY_ITEM_COLUMNS
+from app.schemas.move_request_schema import MoveRequestResponse
+from app.services.phone_validation import normalize_phone_number
+from app.services.qr_service import QRCodeService
+from app.services.user_code_service import generate_qr_code_id, generate_user_code
+
+SHORT_MESSAGE = "Could you move your car please?"
+LONG_MESSAGE = "차를 빼주실 수 있나요? " * 40
+NOW = datetime.now(timezone.utc)
+
+def chat_message_kwargs(i: int = 1) -> dict:
+    return {
+        "id": i,
+        "sender_user_code": "ABCD1234",
+        "recipient_user_code": "WXYZ9876",
+        "message_content": SHORT_MESSAGE,
+        "message_type": "text",
+        "is_read": False,
+        "created_at": NOW,
+        "read_at": None
+    }
+
+def history_items(count: int) -> List[dict]:
+    """Projection dicts shaped like the history route's row._asdict() results"""
+    keys = [column.key for column in HISTORY_ITEM_COLUMNS]
+    return [
+        dict(zip(keys, (i, "12가3456", "Blue sedan owner", i % 3 == 0, NOW - timedelta(minutes=i), None)))
+        for i in range(count)
+    ]
+
+def build_benchmarks() -> Dict[str, Callable[[], object]]:
+    encrypted_short, short_key = ChatMessage.simple_encrypt(SHORT_MESSAGE)
+    encrypted_long, long_key = ChatMessage.simple_encrypt(LONG_MESSAGE)
+    items = history_items(50)
+    last_message = ChatMessageResponse(**chat_message_kwargs())
+
+    return {
+        "crypto.simple_encrypt[short]": lambda: ChatMessage.simple_encrypt(SHORT_MESSAGE),
+        "crypto.simple_encrypt[1KB]": lambda: ChatMessage.simple_encrypt(LONG_MESSAGE),
+        "crypto.simple_decrypt[short]": lambda: ChatMessage.simple_decrypt(encrypted_short, short_key),
+        "crypto.simple_decrypt[1KB]": lambda: ChatMessage.simple_decrypt(encrypted_long, long_key),
+        "codes.generate_user_code": generate_user_code,
+        "codes.generate_qr_code_id": lambda: generate_qr_code_id("ABCD1234", "+821012345678"),
+        "qr.generate_profile_qr_image": lambda: QRCodeService.generate_profile_qr_image(
+            "ABCD1234", "QR_1A2B3C4D", "https://parqr.app/profile/ABCD1234"
+        ),
+        "schema.ChatMessageResponse": lambda: ChatMessageResponse(**chat_message_kwargs()),
+        "schema.ChatConversationResponse": lambda: ChatConversationResponse(
+            participant_user_code="WXYZ9876",
+            participant_display_name="WXYZ9876",
+            last_message=last_message,
+            unread_count=2,
+            last_activity=NOW
+        ),
+        "schema.MoveRequestResponse": lambda: MoveRequestResponse(
+            id=1, target_user_code="ABCD1234", license_plate="12가3456", requester_info="Blue sedan owner",
+            is_read=False, created_at=NOW, read_at=None
+        ),
+        # What GET /move_requests/history/{user_code} does per page: no response_model, orjson render
+        "render.MoveRequestHistory[50]": lambda: FastJSONResponse({
+            "target_user_code": "ABCD1234",
+            "requests": items,
+            "total_count": 50,
+            "unread_count": 17,
+            "total_is_estimate": False,
+            "next_cursor": None
+        }).body,
+        "phone.normalize[KR national]": lambda: normalize_phone_number("01012345678", "KR"),
+        "phone.normalize[KR international]": lambda: normalize_phone_number("+82 10-1234-5678", "KR"),
+    }
+
+def measure(func: Callable[[], object], repeat: int) -> Tuple[float, float]:
+    """Median and best seconds per call over `repeat` auto-calibrated runs"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    per_call = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    return statistics.median(per_call), min(per_call)
+
+def format_duration(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.2f} ms"
+    if seconds >= 1e-6:
+        return f"{seconds * 1e6:8.2f} µs"
+    return f"{seconds * 1e9:8.0f} ns"
+
+def previous_results(history: List[dict]) -> Dict[str, dict]:
+    """Most recent recorded result per benchmark (--filter runs only record a subset)"""
+    latest = {}
+    for entry in history:
+        latest.update(entry["results"])
+    return latest
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for backend hot paths")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="Append results to this JSON history file and compare with the last recorded results")
+    parser.add_argument("--label", default="", help="Label stored with the results (e.g. git sha)")
+    parser.add_argument("--max-regression", type=float, help="Exit non-zero if any median is this much slower than its last recorded result (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    history = json.loads(args.output.read_text()) if args.output and args.output.exists() else []
+    previous = previous_results(history)
+
+    benchmarks = {name: func for name, func in build_benchmarks().items() if args.filter in name}
+    print(f"⏱️  Running {len(benchmarks)} benchmarks (median of {args.repeat})...")
+
+    results, regressions = {}, []
+    for name, func in benchmarks.items():
+        median, best = measure(func, args.repeat)
+        results[name] = {"median_ns": round(median * 1e9, 1), "min_ns": round(best * 1e9, 1)}
+
+        change = ""
+        if name in previous:
+            ratio = median * 1e9 / previous[name]["median_ns"] - 1
+            change = f"   {ratio:+7.1%} vs last"
+            if args.max_regression is not None and ratio > args.max_regression:
+                regressions.append(f"{name}: {ratio:+.1%}")
+        print(f"   {name:<40} {format_duration(median)}  (min {format_duration(best).strip()}){change}")
+
+    if args.output:
+        history.append({
+            "label": args.label,
+            "measured_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        })
+        args.output.write_text(json.dumps(history, indent=2))
+        print(f"💾 Appended results to {args.output}")
+
+    if regressions:
+        print(f"❌ Slower than the last recorded result by more than {args.max_regression:.0%}:")
+        for regression in regressions:
+            print(f"   - {regression}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
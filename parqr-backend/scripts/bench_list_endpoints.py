@@ -0,0 +1,172 @@
+"""
+Benchmark list endpoints serving 200-item pages.
+
+Seeds a throwaway SQLite database with one premium user that owns --items
+cars, ended parking sessions, received move requests and chat messages, then
+calls each list endpoint in-process and reports the median and p95 latency
+of the whole request (query, ORM/row handling, validation, JSON rendering).
+
+    cars        GET /api/v01/car/my-cars
+    parking     GET /api/v01/parking/history?limit=N
+    active      GET /api/v01/parking/active
+    moves       GET /api/v01/move_requests/history/{user_code}?limit=N
+    chat        GET /api/v01/chat/messages/{user_code}?limit=N
+
+Run it on two commits to compare; --output keeps a JSON history and prints
+the change against the last recorded run. --accept-encoding gzip/br measures
+the compressed path; "wire" is the number of bytes actually transferred.
+
+Usage:
+    python scripts/bench_list_endpoints.py
+    python scripts/bench_list_endpoints.py --items 200 --requests 300 --output list_bench.json --label after
+    python scripts/bench_list_endpoints.py --accept-encoding br
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+def configure_environment(database_path: str):
+    """Point the app at a private SQLite database before it is imported"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    os.environ["DB_HOST"] = ""
+    os.environ["DATABASE_REPLICA_URL"] = ""
+    os.environ["NOTIFICATIONS_ENABLED"] = "false"
+    os.environ["RETENTION_ENABLED"] = "false"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("PARKING_ARCHIVE_DIR", tempfile.mkdtemp(prefix="parqr_bench_archive_"))
+
+def seed(items: int) -> tuple[str, str]:
+    """Create the benchmark user, a chat partner and `items` rows per list"""
+    from app.db.base import Base
+    from app.db.session import SessionLocal, get_engine
+    from app.models.user import User
+    from app.models.car import Car
+    from app.models.chat_message import ChatMessage
+    from app.models.move_request import MoveRequest
+    from app.models.parking_session import ParkingSession
+    from app.models.user_tier import UserTier
+
+    Base.metadata.create_all(get_engine())
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    db = SessionLocal()
+    try:
+        owner = User(signup_country_iso="KR", phone_number="+821000000001", user_code="BENCH001", qr_code_id="QR_BENCH001", created_at=now)
+        partner = User(signup_country_iso="KR", phone_number="+821000000002", user_code="BENCH002", qr_code_id="QR_BENCH002", created_at=now)
+        db.add_all([owner, partner])
+        db.flush()
+        db.add(UserTier(user_id=owner.id, tier="premium"))
+
+        cars = [Car(owner_id=owner.id, license_plate=f"{100 + i % 900}가{i:04d}", car_brand="Hyundai",
+                    car_model="Sonata", created_at=now - timedelta(days=i)) for i in range(items)]
+        db.add_all(cars)
+        db.flush()
+        db.add_all([
+            ParkingSession(user_id=owner.id, car_id=cars[i % len(cars)].id,
+                           start_time=now - timedelta(hours=3 * i + 2), end_time=now - timedelta(hours=3 * i),
+                           note_location=f"B{i % 4 + 1} level, pillar {i % 30}", public_message="Call me if I block you",
+                           latitude=37.5 + i / 1e4, longitude=127.0 + i / 1e4)
+            for i in range(items)
+        ])
+        # One active session for /parking/active
+        db.add(ParkingSession(user_id=owner.id, car_id=cars[0].id, start_time=now - timedelta(minutes=30),
+                              note_location="Lobby", latitude=37.5, longitude=127.0))
+        db.add_all([
+            MoveRequest(target_user_id=owner.id, ip_address="203.0.113.7", license_plate=cars[i % len(cars)].license_plate,
+                        requester_info="Blue sedan owner", is_read=i % 3 == 0, created_at=now - timedelta(minutes=7 * i),
+                        viewed_at=now - timedelta(minutes=7 * i - 1) if i % 3 == 0 else None)
+            for i in range(items)
+        ])
+        for i in range(items):
+            content, key = ChatMessage.simple_encrypt(f"Message number {i}, could you move your car please?")
+            sender, recipient = (owner, partner) if i % 2 else (partner, owner)
+            db.add(ChatMessage(sender_id=sender.id, recipient_id=recipient.id, message_content=content,
+                               encryption_key=key, message_type="text", is_read=i % 2 == 0,
+                               created_at=now - timedelta(minutes=i)))
+        db.commit()
+        return owner.user_code, partner.user_code
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list endpoints with large pages")
+    parser.add_argument("--items", type=int, default=200, help="Rows per list (and page size)")
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--output", type=Path, help="Append results to this JSON history file and compare with the last run")
+    parser.add_argument("--label", default="", help="Label stored with the results (e.g. git sha)")
+    parser.add_argument("--accept-encoding", default="identity", help="Accept-Encoding sent with every request (e.g. 'gzip', 'br')")
+    args = parser.parse_args()
+
+    database_path = Path(tempfile.mkdtemp(prefix="parqr_bench_lists_")) / "bench.db"
+    configure_environment(str(database_path))
+
+    from fastapi.testclient import TestClient
+    import main as app_main
+
+    print(f"🌱 Seeding {args.items} rows per list...")
+    user_code, partner_code = seed(args.items)
+    headers = {"X-User-Code": user_code, "Accept-Encoding": args.accept_encoding}
+    endpoints = {
+        "cars": "/api/v01/car/my-cars",
+        "parking": f"/api/v01/parking/history?limit={args.items}",
+        "active": "/api/v01/parking/active",
+        "moves": f"/api/v01/move_requests/history/{user_code}?limit={args.items}",
+        "chat": f"/api/v01/chat/messages/{partner_code}?limit={args.items}",
+    }
+
+    results = {}
+    with TestClient(app_main.app) as client:
+        print(f"⏱️  {args.requests} requests per endpoint...")
+        for name, url in endpoints.items():
+            for _ in range(args.warmup):
+                client.get(url, headers=headers)
+            timings = []
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                response = client.get(url, headers=headers)
+                timings.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    print(f"❌ {name}: HTTP {response.status_code} {response.text[:200]}")
+                    sys.exit(1)
+            timings.sort()
+            results[name] = {
+                "median_ms": round(statistics.median(timings) * 1e3, 3),
+                "p95_ms": round(timings[int(len(timings) * 0.95) - 1] * 1e3, 3),
+                "bytes": len(response.content),
+                "wire_bytes": response.num_bytes_downloaded
+            }
+
+    history = json.loads(args.output.read_text()) if args.output and args.output.exists() else []
+    previous = history[-1]["results"] if history else {}
+    for name, result in results.items():
+        change = ""
+        if name in previous:
+            change = f"   {result['median_ms'] / previous[name]['median_ms'] - 1:+7.1%} vs last"
+        print(f"   {name:<8} median {result['median_ms']:7.2f} ms   p95 {result['p95_ms']:7.2f} ms   "
+              f"{result['bytes']:>7,} bytes ({result['wire_bytes']:,} wire){change}")
+
+    if args.output:
+        history.append({
+            "label": args.label,
+            "measured_at": datetime.now(timezone.utc).isoformat(),
+            "items": args.items,
+            "accept_encoding": args.accept_encoding,
+            "results": results
+        })
+        args.output.write_text(json.dumps(history, indent=2))
+        print(f"💾 Appended results to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark per-request logging overhead.
+
+Drives authenticated requests through the full app (TestClient, SQLite) and
+compares request latency with:
+  - off:   root level WARNING (INFO calls return early)
+  - sync:  JSON StreamHandler writing to a file on the request thread
+  - queue: app.logging_config pipeline (QueueHandler -> listener thread)
+
+Also times a disabled logger.info call with an f-string vs lazy %-args.
+
+--sink-delay-us emulates a slow log sink (e.g. a stdout pipe under
+back-pressure) by sleeping on every write; that is where the queue pays off.
+
+Usage:
+    python scripts/bench_logging.py
+    python scripts/bench_logging.py --requests 5000 --sink-delay-us 200
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+import timeit
+
+_workdir = Path(tempfile.mkdtemp(prefix="parqr_bench_logging_"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir / 'bench.db'}"
+os.environ["DB_HOST"] = ""
+os.environ["DATABASE_REPLICA_URL"] = ""
+os.environ["NOTIFICATIONS_ENABLED"] = "false"
+os.environ["DB_CREATE_ALL"] = "true"
+
+from fastapi.testclient import TestClient
+
+import main
+from app.logging_config import JsonFormatter, configure_logging, shutdown_logging
+
+class SlowSink:
+    """File wrapper that blocks for delay seconds on every write"""
+
+    def __init__(self, stream, delay: float):
+        self.stream = stream
+        self.delay = delay
+
+    def write(self, data: str) -> int:
+        if self.delay:
+            time.sleep(self.delay)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+def reset_root(level: int) -> logging.Logger:
+    shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(level)
+    return root
+
+def run_requests(client: TestClient, user_code: str, count: int) -> list[float]:
+    headers = {"X-User-Code": user_code}
+    timings = []
+    for _ in range(count):
+        started = time.perf_counter()
+        client.get("/api/v01/car/my-cars", headers=headers)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def report(name: str, timings: list[float], baseline: float = None) -> float:
+    median = statistics.median(timings) * 1e6
+    p99 = statistics.quantiles(timings, n=100)[98] * 1e6
+    overhead = f"  (+{median - baseline:6.1f} µs vs off)" if baseline is not None else ""
+    print(f"   {name:<6} median {median:8.1f} µs   p99 {p99:8.1f} µs{overhead}")
+    return median
+
+def bench_disabled_call() -> None:
+    logger = logging.getLogger("bench.disabled")
+    logger.setLevel(logging.WARNING)
+    user_code, count, plate = "ABCD1234", 3, "12가3456"
+    number = 500_000
+    eager = min(timeit.repeat(lambda: logger.info(f"Found {count} cars for {user_code}, plate {plate}"), number=number, repeat=5)) / number
+    lazy = min(timeit.repeat(lambda: logger.info("Found %s cars for %s, plate %s", count, user_code, plate), number=number, repeat=5)) / number
+    print("⏱️  Disabled logger.info call:")
+    print(f"   f-string  {eager * 1e9:7.0f} ns")
+    print(f"   lazy %s   {lazy * 1e9:7.0f} ns")
+
+def main_bench(request_count: int, sink_delay: float) -> None:
+    sink_path = _workdir / "log.jsonl"
+    # Client-side request logs would otherwise dominate the sink
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    with TestClient(main.app) as client, open(sink_path, "w") as sink_file:
+        sink = SlowSink(sink_file, sink_delay)
+        user_code = client.post("/api/v01/user/register", json={"phone_number": "01012345678", "signup_country_iso": "KR"}).json()["user_code"]
+        client.post("/api/v01/car/register", headers={"X-User-Code": user_code},
+                    json={"license_plate": "12가3456", "car_brand": "Hyundai", "car_model": "Sonata"})
+        run_requests(client, user_code, 200)  # warm up
+
+        print(f"\n⏱️  GET /api/v01/car/my-cars x {request_count:,} (4 INFO lines per request, sink delay {sink_delay * 1e6:.0f} µs/write):")
+        reset_root(logging.WARNING)
+        baseline = report("off", run_requests(client, user_code, request_count))
+
+        root = reset_root(logging.INFO)
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(JsonFormatter())
+        root.addHandler(handler)
+        report("sync", run_requests(client, user_code, request_count), baseline)
+
+        reset_root(logging.INFO)
+        configure_logging(stream=sink)
+        report("queue", run_requests(client, user_code, request_count), baseline)
+        shutdown_logging()
+
+    print(f"\n📄 Log sink: {sink_path} ({sink_path.stat().st_size / 1024:.0f} KiB)")
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark per-request logging overhead")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--sink-delay-us", type=float, default=0.0)
+    args = parser.parse_args()
+    bench_disabled_call()
+    main_bench(args.requests, args.sink_delay_us / 1e6)
+
+if __name__ == "__main__":
+    main_cli()
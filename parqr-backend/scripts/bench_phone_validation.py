@@ -0,0 +1,102 @@
+"""
+Benchmark phone/country validation.
+
+Compares the legacy linear country scan and inline KR checks with the
+precompiled lookup tables in app/services/phone_validation.py, for single
+calls and for batch validation of a bulk-import-sized list.
+
+Usage:
+    python scripts/bench_phone_validation.py
+    python scripts/bench_phone_validation.py --batch-size 100000 --repeat 5
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+import argparse
+import random
+import time
+import timeit
+
+from app.services.phone_validation import normalize_phone_number, validate_phone_numbers, PhoneValidationError
+from scripts.country_codes import ALL_COUNTRIES, is_valid_country_iso
+
+def legacy_is_valid_country_iso(country_iso: str) -> bool:
+    """Pre-lookup-table implementation: linear any() scan"""
+    return any(info["country_iso"] == country_iso.upper() for info in ALL_COUNTRIES.values())
+
+def legacy_normalize_kr(phone_number: str) -> str:
+    """Pre-engine inline register_user logic for KR"""
+    if len(phone_number) != 11:
+        raise ValueError("Phone number must be 11 digits")
+    if not phone_number.isdigit():
+        raise ValueError("Phone number must contain only digits")
+    if not phone_number.startswith("010"):
+        raise ValueError("Invalid mobile phone number format")
+    return f"+82{phone_number[1:]}"
+
+def make_batch(size: int, seed: int = 42) -> tuple[list[str], list[str]]:
+    rng = random.Random(seed)
+    isos = [info["country_iso"] for info in ALL_COUNTRIES.values()]
+    numbers, countries = [], []
+    for _ in range(size):
+        if rng.random() < 0.7:
+            numbers.append(f"010{rng.randint(10000000, 99999999)}")
+            countries.append("KR")
+        else:
+            numbers.append(f"0{rng.randint(100000000, 9999999999)}")
+            countries.append(rng.choice(isos))
+    return numbers, countries
+
+def run(batch_size: int, repeat: int) -> None:
+    number = 200_000
+    print("⏱️  Single-call latency (best of 5):")
+    cases = [
+        ("legacy is_valid_country_iso('AE')", lambda: legacy_is_valid_country_iso("AE")),
+        ("lookup is_valid_country_iso('KR')", lambda: is_valid_country_iso("KR")),
+        ("legacy KR normalize", lambda: legacy_normalize_kr("01012345678")),
+        ("engine KR normalize", lambda: normalize_phone_number("01012345678", "KR")),
+        ("engine KR normalize (+82 10-1234-5678)", lambda: normalize_phone_number("+82 10-1234-5678", "KR")),
+    ]
+    for name, fn in cases:
+        best = min(timeit.repeat(fn, number=number, repeat=5)) / number
+        print(f"   {name:<42} {best * 1e9:8.0f} ns")
+
+    numbers, countries = make_batch(batch_size)
+
+    def loop_single():
+        valid = 0
+        for phone, iso in zip(numbers, countries):
+            try:
+                normalize_phone_number(phone, iso)
+                valid += 1
+            except PhoneValidationError:
+                pass
+        return valid
+
+    def batch():
+        return sum(1 for result in validate_phone_numbers(numbers, countries) if result.e164)
+
+    print(f"\n⏱️  Batch of {batch_size:,} mixed-country numbers (best of {repeat}):")
+    for name, fn in [("loop normalize_phone_number", loop_single), ("validate_phone_numbers", batch)]:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            valid = fn()
+            timings.append(time.perf_counter() - started)
+        best = min(timings)
+        print(f"   {name:<28} {best * 1000:8.1f} ms  {batch_size / best:12,.0f} numbers/s  ({valid:,} valid)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark phone/country validation")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.batch_size, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark application cold start.
+
+Each run starts a fresh interpreter, so nothing is shared between runs:
+  - import: `import main` (module imports + create_app()) measured in-process
+  - first response: wall time from spawning uvicorn until GET /api/health returns 200
+
+Results can be appended to a JSON file to track the numbers across commits,
+and --max-first-response-ms turns the script into a regression gate.
+
+Usage:
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --runs 10 --output startup_baseline.json
+    python scripts/bench_startup.py --max-first-response-ms 1500
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+
+IMPORT_PROBE = (
+    "import time; started = time.perf_counter(); import main; "
+    "print(time.perf_counter() - started)"
+)
+
+def bench_env() -> dict:
+    env = dict(os.environ)
+    # Default to a throwaway SQLite file so the benchmark never needs MySQL; startup must not touch it anyway
+    if not env.get("DB_HOST"):
+        env.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.gettempdir()) / 'parqr_bench_startup.db'}")
+    env.setdefault("NOTIFICATIONS_ENABLED", "false")
+    return env
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def measure_import(env: dict) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=parent_dir, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+def measure_first_response(env: dict, timeout: float = 30.0) -> float:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/api/health"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=parent_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+        raise TimeoutError(f"No response from {url} within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+def summarize(samples: list[float]) -> dict:
+    ms = [sample * 1000 for sample in samples]
+    return {
+        "median_ms": round(statistics.median(ms), 1),
+        "min_ms": round(min(ms), 1),
+        "max_ms": round(max(ms), 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark application cold start")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="Append results to this JSON file")
+    parser.add_argument("--label", default="", help="Label stored with the results (e.g. git sha)")
+    parser.add_argument("--max-first-response-ms", type=float, help="Exit non-zero if the median exceeds this")
+    args = parser.parse_args()
+
+    env = bench_env()
+
+    # Warm the bytecode cache once so every run measures the same (deployed-image-like) state
+    measure_import(env)
+
+    print(f"🚀 Measuring cold start over {args.runs} runs...")
+    import_samples, response_samples = [], []
+    for run in range(1, args.runs + 1):
+        import_samples.append(measure_import(env))
+        response_samples.append(measure_first_response(env))
+        print(f"   run {run}: import {import_samples[-1] * 1000:7.1f} ms   first response {response_samples[-1] * 1000:7.1f} ms")
+
+    result = {
+        "label": args.label,
+        "measured_at": datetime.now(timezone.utc).isoformat(),
+        "runs": args.runs,
+        "import": summarize(import_samples),
+        "first_response": summarize(response_samples),
+    }
+    print(f"\n📊 import main:           median {result['import']['median_ms']} ms (min {result['import']['min_ms']}, max {result['import']['max_ms']})")
+    print(f"📊 time to first response: median {result['first_response']['median_ms']} ms (min {result['first_response']['min_ms']}, max {result['first_response']['max_ms']})")
+
+    if args.output:
+        history = json.loads(args.output.read_text()) if args.output.exists() else []
+        history.append(result)
+        args.output.write_text(json.dumps(history, indent=2))
+        print(f"💾 Appended results to {args.output}")
+
+    if args.max_first_response_ms is not None and result["first_response"]["median_ms"] > args.max_first_response_ms:
+        print(f"❌ Median time to first response exceeds {args.max_first_response_ms} ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
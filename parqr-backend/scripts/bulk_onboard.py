@@ -0,0 +1,64 @@
+"""
+Bulk user + car onboarding from a partner CSV.
+
+CLI counterpart of POST /api/v01/onboarding/bulk_import for large files that
+should not go through an HTTP upload.
+
+Usage:
+    python -m scripts.bulk_onboard partners/apt_complex.csv --report report.csv --chunk-size 1000
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+import argparse
+import csv
+import time
+
+from app.db.session import SessionLocal
+from app.services.onboarding_service import BulkOnboardingService
+from app.services.qr_render_queue import qr_render_queue
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk onboard users and cars from CSV")
+    parser.add_argument("csv_path", type=Path, help="CSV with phone_number, signup_country_iso, license_plate, car_brand, car_model")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Rows per validation/insert transaction")
+    parser.add_argument("--report", type=Path, default=None, help="Write the per-row report to this CSV")
+    args = parser.parse_args()
+
+    print(f"🚀 Importing {args.csv_path}...")
+    started = time.perf_counter()
+
+    db = SessionLocal()
+    try:
+        with open(args.csv_path, newline="", encoding="utf-8-sig") as f:
+            result = BulkOnboardingService.import_rows(
+                db, BulkOnboardingService.iter_csv_rows(f), chunk_size=args.chunk_size
+            )
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    summary = result["summary"]
+    print("\n📊 Import Summary:")
+    for status, count in summary.items():
+        print(f"   {status}: {count}")
+    print(f"   elapsed: {elapsed:.1f}s ({summary['total'] / elapsed if elapsed else 0:.0f} rows/s)")
+
+    if args.report:
+        with open(args.report, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["row", "status", "user_code", "error"])
+            writer.writeheader()
+            writer.writerows(result["rows"])
+        print(f"📝 Report written to {args.report}")
+
+    print("⏳ Waiting for queued QR renders to finish...")
+    qr_render_queue.shutdown(wait=True)
+    print("✅ Bulk onboarding completed!")
+
+if __name__ == "__main__":
+    main()
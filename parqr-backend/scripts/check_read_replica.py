@@ -0,0 +1,174 @@
+"""
+Check read/write routing on a local primary + replica pair of SQLite files.
+
+Builds a RoutingSession factory over two SQLite databases (the same setup as
+DATABASE_URL / DATABASE_REPLICA_URL pointing at two files) and asserts:
+
+    replica reads      read-only sessions read from the replica, others from the primary
+    read-your-writes   a write pins the session, and the client, to the primary
+    lag fallback       too much (or unknown) replica lag sends reads to the primary
+
+"Replication" is an explicit file copy (replicate()), so every check controls
+exactly what the replica has seen. sqlite_replica_sessionmaker() is reusable
+from tests or other scripts.
+
+Usage:
+    python scripts/check_read_replica.py
+    python scripts/check_read_replica.py --dir /tmp/parqr_replica
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+import argparse
+import shutil
+import tempfile
+from typing import Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.routing import ReadYourWritesTracker, ReplicaLagMonitor, RoutingSession
+from app.models.user import User
+from app.models.car import Car  # noqa: F401 - relationship targets must be mapped
+from app.models.user_tier import UserTier  # noqa: F401
+from app.models.move_request import MoveRequest  # noqa: F401
+
+class SQLiteReplicaPair:
+    """Primary and replica SQLite files with a RoutingSession factory over both"""
+
+    def __init__(self, directory: Path, lag_monitor: Optional[ReplicaLagMonitor] = None):
+        self.primary_path = directory / "primary.db"
+        self.replica_path = directory / "replica.db"
+        self.primary: Engine = create_engine(f"sqlite:///{self.primary_path}")
+        Base.metadata.create_all(self.primary)
+        self.replica: Engine = create_engine(f"sqlite:///{self.replica_path}")
+        self.replicate()
+        self.lag_monitor = lag_monitor or ReplicaLagMonitor()
+        self.Session = sessionmaker(
+            class_=RoutingSession,
+            bind=self.primary,
+            replica_bind=self.replica,
+            lag_monitor=self.lag_monitor,
+            autoflush=False
+        )
+
+    def replicate(self) -> None:
+        """Bring the replica up to date with the primary"""
+        self.primary.dispose()
+        self.replica.dispose()
+        shutil.copyfile(self.primary_path, self.replica_path)
+
+    def session(self, read_only: bool, on_write=None) -> RoutingSession:
+        """Session opened the way get_db opens one"""
+        db = self.Session()
+        db.info["read_only"] = read_only
+        if on_write is not None:
+            db.info["on_write"] = on_write
+        return db
+
+    def dispose(self) -> None:
+        self.primary.dispose()
+        self.replica.dispose()
+
+def sqlite_replica_sessionmaker(directory: Path, lag_monitor: Optional[ReplicaLagMonitor] = None) -> SQLiteReplicaPair:
+    """Fresh primary/replica pair in directory, schema created and replicated"""
+    directory.mkdir(parents=True, exist_ok=True)
+    return SQLiteReplicaPair(directory, lag_monitor)
+
+def add_user(db, user_code: str) -> None:
+    db.add(User(signup_country_iso="KR", phone_number=f"+8210{abs(hash(user_code)) % 10**8:08d}",
+                user_code=user_code, qr_code_id=f"QR_{user_code}"))
+    db.commit()
+
+def visible(db, user_code: str) -> bool:
+    return db.query(User.id).filter(User.user_code == user_code).first() is not None
+
+def check_replica_reads(pair: SQLiteReplicaPair) -> None:
+    writer = pair.session(read_only=False)
+    add_user(writer, "REPLICA1")
+    writer.close()
+    pair.replicate()
+    writer = pair.session(read_only=False)
+    add_user(writer, "PRIMARY1")  # written after the last replication
+    writer.close()
+
+    reader = pair.session(read_only=True)
+    assert visible(reader, "REPLICA1") and not visible(reader, "PRIMARY1"), "read-only session should read the replica"
+    reader.close()
+    primary_reader = pair.session(read_only=False)
+    assert visible(primary_reader, "PRIMARY1"), "read-write session should read the primary"
+    primary_reader.close()
+
+def check_read_your_writes(pair: SQLiteReplicaPair) -> None:
+    tracker = ReadYourWritesTracker(window_seconds=5.0)
+    marked = []
+    db = pair.session(read_only=True, on_write=lambda: marked.append(tracker.mark("WRITER01")))
+    add_user(db, "RYW00001")
+    assert marked, "a write should call on_write (which sets the read-your-writes cookie)"
+    assert not db.info["read_only"], "a write should switch the session to the primary"
+    assert visible(db, "RYW00001"), "the writing session should read its own write"
+    db.close()
+
+    # The client's next GET: get_db skips the replica while the tracker remembers it
+    assert tracker.is_recent("WRITER01"), "the writer should be pinned to the primary"
+    follow_up = pair.session(read_only=not tracker.is_recent("WRITER01"))
+    assert visible(follow_up, "RYW00001"), "follow-up reads should see the write before replication"
+    follow_up.close()
+    assert tracker.is_recent(None, f"{marked[0]:.3f}"), "the cookie alone should pin anonymous clients"
+
+def check_lag_fallback(pair: SQLiteReplicaPair) -> None:
+    writer = pair.session(read_only=False)
+    add_user(writer, "LAGGED01")
+    writer.close()
+
+    for lag, label in ((30.0, "lag above DB_REPLICA_MAX_LAG"), (None, "unknown lag")):
+        pair.lag_monitor.probe = lambda lag=lag: lag
+        pair.lag_monitor._checked_at = 0.0
+        reader = pair.session(read_only=True)
+        assert visible(reader, "LAGGED01"), f"{label} should send reads to the primary"
+        reader.close()
+
+    pair.lag_monitor.probe = lambda: 0.1
+    pair.lag_monitor._checked_at = 0.0
+    reader = pair.session(read_only=True)
+    assert not visible(reader, "LAGGED01"), "a healthy replica should serve reads again"
+    reader.close()
+
+CHECKS = {
+    "replica reads": check_replica_reads,
+    "read-your-writes": check_read_your_writes,
+    "lag fallback": check_lag_fallback,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Check replica routing on two local SQLite files")
+    parser.add_argument("--dir", type=Path, help="Directory for primary.db and replica.db (default: a temp dir)")
+    args = parser.parse_args()
+
+    directory = args.dir or Path(tempfile.mkdtemp(prefix="parqr_replica_"))
+    failed = False
+    for name, check in CHECKS.items():
+        pair = sqlite_replica_sessionmaker(directory / name.replace(" ", "_"),
+                                           ReplicaLagMonitor(max_lag_seconds=2.0, check_interval=0.0))
+        try:
+            check(pair)
+            print(f"   ✅ {name}")
+        except AssertionError as e:
+            failed = True
+            print(f"   ❌ {name}: {e}")
+        finally:
+            pair.dispose()
+
+    if failed:
+        sys.exit(1)
+    print(f"✅ Replica routing checks passed ({directory})")
+
+if __name__ == "__main__":
+    main()
@@ -60,6 +60,9 @@ ALL_COUNTRIES = {
     "United Arab Emirates": {"country_iso": "AE", "country_code": "+971"},
 }
 
+# ISO -> country name lookup for servicing countries, built once at import
+_SERVICING_NAME_BY_ISO = {info["country_iso"]: name for name, info in SERVICING_COUNTRIES.items()}
+
 def get_country_info(country_name: str) -> dict:
     """
     Get country information by country name.
@@ -92,10 +95,10 @@ def get_country_by_iso(country_iso: str) -> str:
     Raises:
         KeyError: If ISO code is not found
     """
-    for country_name, info in SERVICING_COUNTRIES.items():
-        if info["country_iso"] == country_iso.upper():
-            return country_name
-    raise KeyError(f"Country with ISO code '{country_iso}' not found")
+    country_name = _SERVICING_NAME_BY_ISO.get(country_iso.upper())
+    if country_name is None:
+        raise KeyError(f"Country with ISO code '{country_iso}' not found")
+    return country_name
 
 def is_valid_country_iso(country_iso: str) -> bool:
     """
@@ -107,7 +110,7 @@ def is_valid_country_iso(country_iso: str) -> bool:
     Returns:
         True if country is serviced, False otherwise
     """
-    return any(info["country_iso"] == country_iso.upper() for info in SERVICING_COUNTRIES.values())
+    return country_iso.upper() in _SERVICING_NAME_BY_ISO
 
 def get_servicing_countries_list() -> list[str]:
     """
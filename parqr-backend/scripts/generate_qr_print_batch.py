@@ -0,0 +1,174 @@
+"""
+Batch QR card generation for physical sticker print runs.
+
+Streams users from the database in id-ordered chunks, renders their profile QR
+codes on a process pool across all cores and packs each chunk into one zip
+archive. Progress is checkpointed after every archive, so an interrupted run
+picks up where it left off when started again with the same --output-dir.
+
+Usage:
+    python -m scripts.generate_qr_print_batch --output-dir print_runs/2025-10 --size 600 --ec H
+    python -m scripts.generate_qr_print_batch --output-dir print_runs/2025-10 --start-id 50000 --limit 20000
+"""
+
+import sys
+import os
+from pathlib import Path
+
+# Add parent directory to Python path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+import argparse
+import json
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.services.qr_render_service import QRRenderService
+
+CHECKPOINT_FILENAME = "checkpoint.json"
+
+def render_card(job: tuple[str, str, int, str]) -> tuple[str, bytes]:
+    """Worker-process entry point: render one card as PNG bytes"""
+    user_code, payload, size, error_correction = job
+    return user_code, QRRenderService.render(payload, fmt="png", size=size, error_correction=error_correction)
+
+def stream_user_chunks(chunk_size: int, after_id: int, max_users: Optional[int]) -> Iterator[list[tuple[int, str, str]]]:
+    """Yield (id, user_code, payload) chunks using keyset pagination on users.id"""
+    db = SessionLocal()
+    remaining = max_users
+    try:
+        while remaining is None or remaining > 0:
+            batch_limit = chunk_size if remaining is None else min(chunk_size, remaining)
+            rows = db.query(User.id, User.user_code, User.profile_deep_link).filter(
+                User.id > after_id
+            ).order_by(User.id).limit(batch_limit).all()
+
+            if not rows:
+                return
+
+            yield [
+                (row.id, row.user_code, row.profile_deep_link or f"https://parqr.app/profile/{row.user_code}")
+                for row in rows
+            ]
+
+            after_id = rows[-1].id
+            if remaining is not None:
+                remaining -= len(rows)
+    finally:
+        db.close()
+
+def load_checkpoint(output_dir: Path) -> dict:
+    checkpoint_path = output_dir / CHECKPOINT_FILENAME
+    if checkpoint_path.exists():
+        return json.loads(checkpoint_path.read_text())
+    return {"last_user_id": 0, "parts_written": 0, "cards_written": 0}
+
+def save_checkpoint(output_dir: Path, checkpoint: dict) -> None:
+    # Atomic replace so a crash never leaves a truncated checkpoint
+    checkpoint_path = output_dir / CHECKPOINT_FILENAME
+    tmp_path = checkpoint_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(checkpoint, indent=2))
+    os.replace(tmp_path, checkpoint_path)
+
+def write_part(output_dir: Path, part_number: int, cards: list[tuple[str, bytes]]) -> Path:
+    """Pack one chunk of rendered cards into a zip archive"""
+    part_path = output_dir / f"qr_cards_part_{part_number:05d}.zip"
+    tmp_path = part_path.with_suffix(".zip.tmp")
+    # PNGs are already deflate-compressed; storing avoids burning CPU for no gain
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for user_code, png_bytes in cards:
+            archive.writestr(f"qr_{user_code}.png", png_bytes)
+    os.replace(tmp_path, part_path)
+    return part_path
+
+def run_print_batch(
+    output_dir: Path,
+    chunk_size: int = 5000,
+    size: int = 600,
+    error_correction: str = "H",
+    workers: Optional[int] = None,
+    start_id: Optional[int] = None,
+    limit: Optional[int] = None
+) -> dict:
+    """
+    Render QR cards for all users after the checkpoint into zip parts.
+
+    Returns:
+        Throughput report dictionary
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint = load_checkpoint(output_dir)
+    after_id = start_id if start_id is not None else checkpoint["last_user_id"]
+    workers = workers or os.cpu_count() or 1
+
+    print(f"🚀 Starting QR print batch: workers={workers}, chunk_size={chunk_size}, size={size}px, EC={error_correction}")
+    if checkpoint["parts_written"]:
+        print(f"↪️  Resuming after user_id {after_id} ({checkpoint['cards_written']} cards already written)")
+
+    started = time.perf_counter()
+    cards_this_run = 0
+    bytes_this_run = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in stream_user_chunks(chunk_size, after_id, limit):
+            jobs = [(user_code, payload, size, error_correction) for _, user_code, payload in chunk]
+            # chunksize amortizes IPC overhead across many small renders
+            cards = list(pool.map(render_card, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+            part_number = checkpoint["parts_written"] + 1
+            part_path = write_part(output_dir, part_number, cards)
+
+            checkpoint["last_user_id"] = chunk[-1][0]
+            checkpoint["parts_written"] = part_number
+            checkpoint["cards_written"] += len(cards)
+            save_checkpoint(output_dir, checkpoint)
+
+            cards_this_run += len(cards)
+            bytes_this_run += part_path.stat().st_size
+            elapsed = time.perf_counter() - started
+            print(f"📦 {part_path.name}: {len(cards)} cards (total {cards_this_run}, {cards_this_run / elapsed:.0f} cards/s)")
+
+    elapsed = time.perf_counter() - started
+    report = {
+        "cards_rendered": cards_this_run,
+        "parts_written": checkpoint["parts_written"],
+        "bytes_written": bytes_this_run,
+        "elapsed_seconds": round(elapsed, 2),
+        "cards_per_second": round(cards_this_run / elapsed, 1) if elapsed > 0 else 0.0,
+        "workers": workers,
+        "last_user_id": checkpoint["last_user_id"]
+    }
+
+    print("\n📊 Throughput Report:")
+    for name, value in report.items():
+        print(f"   {name}: {value}")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate packed QR cards for print runs")
+    parser.add_argument("--output-dir", type=Path, required=True, help="Directory for zip parts and checkpoint")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Users per DB chunk and zip part")
+    parser.add_argument("--size", type=int, default=600, help="Card QR edge length in pixels")
+    parser.add_argument("--ec", choices=["L", "M", "Q", "H"], default="H", help="Error correction level")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: all cores)")
+    parser.add_argument("--start-id", type=int, default=None, help="Override checkpoint and start after this user id")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of users to render this run")
+    args = parser.parse_args()
+
+    run_print_batch(
+        output_dir=args.output_dir,
+        chunk_size=args.chunk_size,
+        size=args.size,
+        error_correction=args.ec,
+        workers=args.workers,
+        start_id=args.start_id,
+        limit=args.limit
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,466 @@
+"""
+High-volume synthetic dataset generator for capacity testing.
+
+Unlike generate_mock_data.py (a handful of ORM objects for local
+development), this fills a database at production-like scale:
+
+    users            10M   (KR phone numbers, a share on the premium tier)
+    cars             12M   (one per user, extra cars for some users)
+    parking_sessions 200M
+    move_requests    20M   (targets Zipf-distributed: a few hot users get most)
+    chat_messages    20M   (recipients Zipf-distributed)
+
+Rows are generated in fixed-size chunks by a pool of worker processes. Every
+chunk has its own RNG seeded from (--seed, table, chunk), and ids, user codes,
+QR ids, phone numbers and plates are derived from the row id with bijective
+permutations, so the output is identical for any worker count and needs no
+uniqueness lookups. Pass --end-date as well for fully reproducible timestamps.
+
+Insert methods:
+    core       SQLAlchemy Core executemany per chunk (any database)
+    load-data  per-chunk TSV + LOAD DATA LOCAL INFILE (MySQL, local_infile=1)
+    files      only write TSV chunks and a load.sql next to them
+
+Usage:
+    python scripts/generate_synthetic_data.py --scale 0.001                # 10k users, 200k sessions
+    python scripts/generate_synthetic_data.py --workers 8 --method load-data --disable-checks
+    python scripts/generate_synthetic_data.py --method files --out-dir /data/parqr_synthetic
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+import argparse
+import hashlib
+import multiprocessing
+import os
+import random
+import string
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+TABLE_ORDER = [
+    # Tables in one phase are generated concurrently; later phases reference earlier ones
+    ["users"],
+    ["cars", "user_tiers"],
+    ["parking_sessions", "move_requests", "chat_messages"],
+]
+
+USER_CODE_ALPHABET = string.ascii_uppercase + string.digits
+USER_CODE_SPACE = 36 ** 8
+QR_CODE_SPACE = 16 ** 8
+PLATE_HANGUL = ['가', '나', '다', '라', '마', '거', '너', '더', '러', '머', '버', '서', '어', '저',
+                '고', '노', '도', '로', '모', '보', '소', '오', '조', '구', '누', '두', '루', '무',
+                '부', '수', '우', '주', '하', '허', '호', '바', '사', '아']
+PLATE_SPACE = 1000 * len(PLATE_HANGUL) * 10000
+
+CAR_MODELS = {
+    "Hyundai": ["Avante", "Sonata", "Grandeur", "Tucson", "Santa Fe", "Ioniq 5"],
+    "Kia": ["K3", "K5", "K8", "Sportage", "Sorento", "EV6"],
+    "Genesis": ["G70", "G80", "GV70", "GV80"],
+    "Toyota": ["Camry", "Corolla", "RAV4"],
+    "BMW": ["320i", "520d", "X3", "X5"],
+    "Mercedes Benz": ["C220d", "E300", "GLC300"],
+    "Tesla": ["Model 3", "Model Y"],
+}
+CAR_BRANDS = list(CAR_MODELS)
+
+PARKING_NOTES = ["Level B3", "B2 pillar 14", "Near elevator", "Section C, Row 5", "Ground floor", "Visitor parking", "Level P1, near exit"]
+PUBLIC_MESSAGES = ["Call me if I'm blocking you", "Back in 10 minutes", "Text me anytime"]
+REQUESTER_INFO = ["Blue sedan owner", "Neighbor in 302", "Delivery driver", "White SUV", None]
+CHAT_MESSAGES = [
+    "Could you move your car please?",
+    "I'm blocked in, are you nearby?",
+    "On my way down now",
+    "Thanks, moved it!",
+    "Sorry, 5 minutes",
+]
+
+# Multipliers coprime with their modulus make (i * m + offset) % modulus a bijection
+USER_CODE_MULTIPLIER = 1_000_000_007
+QR_CODE_MULTIPLIER = 2_654_435_761
+PLATE_MULTIPLIER = 1_000_000_007
+HOT_USER_MULTIPLIER = 2_654_435_761
+
+# Seoul metropolitan area
+LAT_RANGE = (37.4, 37.7)
+LNG_RANGE = (126.8, 127.2)
+
+def chunk_rng(seed: int, table: str, chunk: int) -> random.Random:
+    """Independent, reproducible RNG per (seed, table, chunk)"""
+    digest = hashlib.sha256(f"{seed}:{table}:{chunk}".encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+@lru_cache(maxsize=None)
+def _permutation_offset(seed: int, modulus: int) -> int:
+    return chunk_rng(seed, "offset", modulus).randrange(modulus)
+
+def permuted(value: int, modulus: int, multiplier: int, seed: int) -> int:
+    return (value * multiplier + _permutation_offset(seed, modulus)) % modulus
+
+def user_code_for(user_id: int, seed: int) -> str:
+    n = permuted(user_id, USER_CODE_SPACE, USER_CODE_MULTIPLIER, seed)
+    chars = []
+    for _ in range(8):
+        n, digit = divmod(n, 36)
+        chars.append(USER_CODE_ALPHABET[digit])
+    return "".join(chars)
+
+def qr_code_id_for(user_id: int, seed: int) -> str:
+    return f"QR_{permuted(user_id, QR_CODE_SPACE, QR_CODE_MULTIPLIER, seed):08X}"
+
+def phone_number_for(user_id: int) -> str:
+    # +82 10 XXXX XXXX; 100M numbers, enough for the 10M-user target
+    return f"+8210{user_id % 100_000_000:08d}"
+
+def license_plate_for(car_id: int, seed: int) -> str:
+    n = permuted(car_id, PLATE_SPACE, PLATE_MULTIPLIER, seed)
+    n, suffix = divmod(n, 10000)
+    prefix, hangul = divmod(n, len(PLATE_HANGUL))
+    return f"{prefix:03d}{PLATE_HANGUL[hangul]}{suffix:04d}"
+
+def zipf_rank(rng: random.Random, n: int, s: float) -> int:
+    """Rank in [0, n) from a bounded continuous Zipf/Pareto inverse CDF; rank 0 is the hottest"""
+    u = rng.random()
+    if abs(s - 1.0) < 1e-9:
+        x = n ** u
+    else:
+        x = ((n ** (1 - s) - 1) * u + 1) ** (1 / (1 - s))
+    return min(int(x) - 1, n - 1)
+
+def encrypt_with_key(message: str, key: str) -> str:
+    """ChatMessage.simple_encrypt with a caller-chosen key (so generated rows are reproducible)"""
+    import base64
+    message_bytes = message.encode("utf-8")
+    key_bytes = key.encode("utf-8")[:len(message_bytes)]
+    return base64.b64encode(bytes(a ^ b for a, b in zip(message_bytes, key_bytes))).decode("utf-8")
+
+class Plan:
+    """Row counts, id ranges and time window shared by the coordinator and the workers"""
+
+    def __init__(self, args, start_ids: Dict[str, int]):
+        scale = args.scale
+        self.counts = {
+            "users": int(args.users * scale),
+            "cars": int(args.cars * scale),
+            "parking_sessions": int(args.sessions * scale),
+            "move_requests": int(args.move_requests * scale),
+            "chat_messages": int(args.chat_messages * scale),
+        }
+        self.counts["user_tiers"] = int(self.counts["users"] * args.premium_ratio)
+        self.start_ids = start_ids
+        self.seed = args.seed
+        self.zipf_s = args.zipf_s
+        self.chunk_size = args.chunk_size
+        self.end = args.end_date
+        self.start = args.end_date - timedelta(days=args.days)
+        self.window_seconds = args.days * 86400
+
+    def user_id(self, index: int) -> int:
+        return self.start_ids["users"] + index
+
+    def primary_car_id(self, user_index: int) -> int:
+        # Car i belongs to user i for the first min(users, cars) cars
+        return self.start_ids["cars"] + user_index
+
+    def hot_user_index(self, rng: random.Random) -> int:
+        # Spread hot ranks over the id space so the hottest users are not simply the lowest ids
+        users = self.counts["users"]
+        return permuted(zipf_rank(rng, users, self.zipf_s), users, HOT_USER_MULTIPLIER, self.seed) if users > 1 else 0
+
+    def timestamp(self, rng: random.Random) -> datetime:
+        return self.start + timedelta(seconds=rng.random() * self.window_seconds)
+
+    def chunks(self, table: str) -> Iterator[Tuple[str, int, int, int]]:
+        total = self.counts[table]
+        for chunk, begin in enumerate(range(0, total, self.chunk_size)):
+            yield table, chunk, begin, min(begin + self.chunk_size, total)
+
+# Row generators: (plan, rng, begin, end) -> (columns, rows); begin/end are 0-based row indexes
+
+def generate_users(plan: Plan, rng: random.Random, begin: int, end: int):
+    from app.services.user_code_service import build_profile_deep_link
+    columns = ("id", "signup_country_iso", "phone_number", "user_code", "profile_deep_link",
+               "profile_display_name", "qr_code_id", "created_at")
+    rows = []
+    for index in range(begin, end):
+        user_id = plan.user_id(index)
+        user_code = user_code_for(user_id, plan.seed)
+        rows.append((user_id, "KR", phone_number_for(user_id), user_code, build_profile_deep_link(user_code),
+                     user_code, qr_code_id_for(user_id, plan.seed), plan.timestamp(rng)))
+    return columns, rows
+
+def generate_cars(plan: Plan, rng: random.Random, begin: int, end: int):
+    columns = ("id", "owner_id", "license_plate", "car_brand", "car_model", "created_at")
+    users = plan.counts["users"]
+    rows = []
+    for index in range(begin, end):
+        car_id = plan.start_ids["cars"] + index
+        owner_index = index if index < users else rng.randrange(users)
+        brand = rng.choice(CAR_BRANDS)
+        rows.append((car_id, plan.user_id(owner_index), license_plate_for(car_id, plan.seed), brand,
+                     rng.choice(CAR_MODELS[brand]), plan.timestamp(rng)))
+    return columns, rows
+
+def generate_user_tiers(plan: Plan, rng: random.Random, begin: int, end: int):
+    columns = ("id", "user_id", "tier", "expires_at", "created_at")
+    users = plan.counts["users"]
+    rows = []
+    for index in range(begin, end):
+        # Premium users are spread evenly over the id range
+        user_index = index * users // max(plan.counts["user_tiers"], 1)
+        created_at = plan.timestamp(rng)
+        rows.append((plan.start_ids["user_tiers"] + index, plan.user_id(user_index), "premium",
+                     created_at + timedelta(days=365), created_at))
+    return columns, rows
+
+def generate_parking_sessions(plan: Plan, rng: random.Random, begin: int, end: int):
+    columns = ("id", "user_id", "car_id", "start_time", "end_time", "note_location", "public_message", "longitude", "latitude")
+    owners = min(plan.counts["users"], plan.counts["cars"])
+    rows = []
+    for index in range(begin, end):
+        user_index = rng.randrange(owners)
+        start_time = plan.timestamp(rng)
+        # Only sessions started in the last half day may still be running
+        active = plan.end - start_time < timedelta(hours=12) and rng.random() < 0.5
+        end_time = None if active else min(start_time + timedelta(minutes=rng.randint(10, 600)), plan.end)
+        rows.append((
+            plan.start_ids["parking_sessions"] + index, plan.user_id(user_index), plan.primary_car_id(user_index),
+            start_time, end_time,
+            rng.choice(PARKING_NOTES) if rng.random() < 0.4 else None,
+            rng.choice(PUBLIC_MESSAGES) if rng.random() < 0.1 else None,
+            round(rng.uniform(*LNG_RANGE), 6), round(rng.uniform(*LAT_RANGE), 6)
+        ))
+    return columns, rows
+
+def generate_move_requests(plan: Plan, rng: random.Random, begin: int, end: int):
+    columns = ("id", "target_user_id", "ip_address", "created_at", "viewed_at", "license_plate", "is_read", "requester_info")
+    owners = min(plan.counts["users"], plan.counts["cars"])
+    rows = []
+    for index in range(begin, end):
+        target_index = plan.hot_user_index(rng) % owners
+        created_at = plan.timestamp(rng)
+        is_read = rng.random() < 0.8
+        rows.append((
+            plan.start_ids["move_requests"] + index, plan.user_id(target_index),
+            f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+            created_at, created_at + timedelta(seconds=rng.randint(5, 3600)) if is_read else None,
+            license_plate_for(plan.primary_car_id(target_index), plan.seed), is_read, rng.choice(REQUESTER_INFO)
+        ))
+    return columns, rows
+
+def generate_chat_messages(plan: Plan, rng: random.Random, begin: int, end: int):
+    columns = ("id", "sender_id", "recipient_id", "message_content", "message_type", "encryption_key", "is_read", "created_at", "read_at")
+    users = plan.counts["users"]
+    key_alphabet = string.ascii_letters + string.digits + "-_"
+    rows = []
+    for index in range(begin, end):
+        recipient_index = plan.hot_user_index(rng)
+        sender_index = rng.randrange(users)
+        if sender_index == recipient_index:
+            sender_index = (sender_index + 1) % users
+        message = rng.choice(CHAT_MESSAGES)
+        key = "".join(rng.choices(key_alphabet, k=43))
+        created_at = plan.timestamp(rng)
+        is_read = rng.random() < 0.7
+        rows.append((
+            plan.start_ids["chat_messages"] + index, plan.user_id(sender_index), plan.user_id(recipient_index),
+            encrypt_with_key(message, key), "text", key, is_read, created_at,
+            created_at + timedelta(seconds=rng.randint(5, 7200)) if is_read else None
+        ))
+    return columns, rows
+
+GENERATORS: Dict[str, Callable] = {
+    "users": generate_users,
+    "cars": generate_cars,
+    "user_tiers": generate_user_tiers,
+    "parking_sessions": generate_parking_sessions,
+    "move_requests": generate_move_requests,
+    "chat_messages": generate_chat_messages,
+}
+
+# TSV in MySQL LOAD DATA default escaping
+
+def tsv_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+def write_tsv(path: Path, rows: List[tuple]) -> None:
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for row in rows:
+            f.write("\t".join(tsv_value(value) for value in row) + "\n")
+
+def load_data_sql(path: Path, table: str, columns: tuple) -> str:
+    return (
+        f"LOAD DATA LOCAL INFILE '{path.as_posix()}' INTO TABLE {table} CHARACTER SET utf8mb4 "
+        f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({', '.join(columns)})"
+    )
+
+# Workers
+
+_worker_state: dict = {}
+
+def _init_worker(plan: Plan, method: str, out_dir: Optional[str], disable_checks: bool) -> None:
+    _worker_state.update(plan=plan, method=method, out_dir=Path(out_dir) if out_dir else None, disable_checks=disable_checks)
+    if method == "files":
+        return
+
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.pool import NullPool
+    from app.db.base import Base
+    from app.db.session import DATABASE_URL
+    import app.models.user, app.models.car, app.models.parking_session  # noqa: E401,F401 - register tables
+    import app.models.user_tier, app.models.move_request, app.models.chat_message  # noqa: E401,F401
+
+    connect_args = {"local_infile": 1} if method == "load-data" else {}
+    engine = create_engine(DATABASE_URL, poolclass=NullPool, connect_args=connect_args)
+    _worker_state.update(engine=engine, tables=Base.metadata.tables, text=text)
+
+def _run_chunk(task: Tuple[str, int, int, int]) -> Tuple[str, int]:
+    table, chunk, begin, end = task
+    plan: Plan = _worker_state["plan"]
+    columns, rows = GENERATORS[table](plan, chunk_rng(plan.seed, table, chunk), begin, end)
+    method = _worker_state["method"]
+
+    if method == "files":
+        directory = _worker_state["out_dir"] / table
+        directory.mkdir(parents=True, exist_ok=True)
+        write_tsv(directory / f"{chunk:06d}.tsv", rows)
+        return table, len(rows)
+
+    text = _worker_state["text"]
+    with _worker_state["engine"].begin() as conn:
+        if _worker_state["disable_checks"] and conn.dialect.name == "mysql":
+            conn.execute(text("SET SESSION foreign_key_checks = 0, unique_checks = 0"))
+        if method == "core":
+            conn.execute(_worker_state["tables"][table].insert(), [dict(zip(columns, row)) for row in rows])
+        else:
+            with tempfile.NamedTemporaryFile("w", suffix=".tsv", delete=False) as tmp:
+                path = Path(tmp.name)
+            try:
+                write_tsv(path, rows)
+                conn.exec_driver_sql(load_data_sql(path, table, columns))
+            finally:
+                path.unlink(missing_ok=True)
+    return table, len(rows)
+
+# Coordinator
+
+def next_ids(database_url: Optional[str]) -> Dict[str, int]:
+    """First free id per table, so repeated runs append instead of colliding"""
+    tables = [table for phase in TABLE_ORDER for table in phase]
+    if database_url is None:
+        return {table: 1 for table in tables}
+    from sqlalchemy import create_engine, text
+    engine = create_engine(database_url)
+    ids = {}
+    with engine.connect() as conn:
+        for table in tables:
+            ids[table] = (conn.execute(text(f"SELECT MAX(id) FROM {table}")).scalar() or 0) + 1
+    engine.dispose()
+    return ids
+
+class Progress:
+    """Periodic per-table progress for one phase"""
+
+    def __init__(self, counts: Dict[str, int], tables: List[str], interval: float = 2.0):
+        self.counts = counts
+        self.tables = tables
+        self.done = {table: 0 for table in tables}
+        self.interval = interval
+        self.started = time.perf_counter()
+        self._last_print = self.started
+
+    def update(self, table: str, rows: int) -> None:
+        self.done[table] += rows
+        if time.perf_counter() - self._last_print >= self.interval:
+            self.report()
+
+    def report(self) -> None:
+        self._last_print = time.perf_counter()
+        elapsed = self._last_print - self.started
+        rate = sum(self.done.values()) / elapsed if elapsed else 0.0
+        remaining = sum(self.counts[table] - self.done[table] for table in self.tables)
+        eta = timedelta(seconds=int(remaining / rate)) if rate else "?"
+        parts = [f"{table} {self.done[table]:,}/{self.counts[table]:,}" for table in self.tables]
+        print(f"   {'  '.join(parts)}  {rate:,.0f} rows/s  ETA {eta}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a high-volume synthetic dataset")
+    parser.add_argument("--users", type=int, default=10_000_000)
+    parser.add_argument("--cars", type=int, default=12_000_000)
+    parser.add_argument("--sessions", type=int, default=200_000_000)
+    parser.add_argument("--move-requests", type=int, default=20_000_000)
+    parser.add_argument("--chat-messages", type=int, default=20_000_000)
+    parser.add_argument("--premium-ratio", type=float, default=0.05)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every row count (e.g. 0.001 for a quick run)")
+    parser.add_argument("--zipf-s", type=float, default=1.1, help="Zipf exponent for move-request/chat targets")
+    parser.add_argument("--days", type=int, default=365, help="Length of the generated history")
+    parser.add_argument("--end-date", type=lambda s: datetime.fromisoformat(s).replace(tzinfo=None),
+                        default=datetime.now(timezone.utc).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0),
+                        help="End of the history window, ISO date (default: today 00:00 UTC)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--method", choices=["core", "load-data", "files"], default="core")
+    parser.add_argument("--out-dir", type=Path, default=Path("synthetic_data"), help="Output directory for --method files")
+    parser.add_argument("--disable-checks", action="store_true", help="MySQL: turn off foreign_key_checks/unique_checks per session")
+    args = parser.parse_args()
+
+    database_url = None
+    if args.method != "files":
+        from app.db.session import DATABASE_URL
+        database_url = DATABASE_URL
+        if database_url.startswith("sqlite") and args.workers > 1:
+            print("⚠️  SQLite allows one writer at a time; using a single worker")
+            args.workers = 1
+        if args.method == "load-data" and not database_url.startswith("mysql"):
+            parser.error("--method load-data requires a MySQL database")
+
+    plan = Plan(args, next_ids(database_url))
+    print("🚀 Generating synthetic dataset (seed %d, %d workers, %s):" % (args.seed, args.workers, args.method))
+    for table, count in plan.counts.items():
+        print(f"   {table:<17} {count:>13,} rows from id {plan.start_ids[table]:,}")
+
+    started = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(args.workers, initializer=_init_worker,
+                      initargs=(plan, args.method, str(args.out_dir) if args.method == "files" else None, args.disable_checks)) as pool:
+        for phase in TABLE_ORDER:
+            tasks = [task for table in phase for task in plan.chunks(table)]
+            print(f"\n📦 {', '.join(phase)}")
+            progress = Progress(plan.counts, phase)
+            for table, rows in pool.imap_unordered(_run_chunk, tasks):
+                progress.update(table, rows)
+            progress.report()
+
+    if args.method == "files":
+        load_script = args.out_dir / "load.sql"
+        with open(load_script, "w", encoding="utf-8") as f:
+            f.write("SET foreign_key_checks = 0;\nSET unique_checks = 0;\n")
+            for phase in TABLE_ORDER:
+                for table in phase:
+                    columns, _ = GENERATORS[table](plan, random.Random(0), 0, 0)
+                    for path in sorted((args.out_dir / table).glob("*.tsv")):
+                        f.write(load_data_sql(path.resolve(), table, columns) + ";\n")
+            f.write("SET unique_checks = 1;\nSET foreign_key_checks = 1;\n")
+        print(f"\n📝 Load script written to {load_script} (run with mysql --local-infile=1)")
+
+    elapsed = time.perf_counter() - started
+    total = sum(plan.counts.values())
+    print(f"\n✅ Generated {total:,} rows in {timedelta(seconds=int(elapsed))} ({total / elapsed if elapsed else 0:,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
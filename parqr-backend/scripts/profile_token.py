@@ -0,0 +1,41 @@
+"""
+Generate a signed X-Profile header for profiling a single request.
+
+Requires the same PROFILING_SECRET as the server (read from the environment / .env).
+
+Usage:
+    python scripts/profile_token.py --mode cprofile --ttl 300
+    curl -H "X-Profile: $(python scripts/profile_token.py)" https://.../api/v01/user/public/ABCD1234 -i
+    # then download via GET /api/v01/admin/profiling/results/<X-Profile-Id>
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+import argparse
+import os
+import time
+
+from dotenv import load_dotenv
+
+from app.services.profiling_service import PROFILE_MODES, sign_profile_request
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Generate a signed X-Profile header value")
+    parser.add_argument("--mode", choices=PROFILE_MODES, default="cprofile")
+    parser.add_argument("--ttl", type=int, default=300, help="Seconds until the header expires")
+    args = parser.parse_args()
+
+    secret = os.getenv("PROFILING_SECRET")
+    if not secret:
+        print("❌ PROFILING_SECRET is not set", file=sys.stderr)
+        sys.exit(1)
+    print(sign_profile_request(args.mode, int(time.time()) + args.ttl, secret))
+
+if __name__ == "__main__":
+    main()
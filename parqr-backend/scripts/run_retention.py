@@ -0,0 +1,76 @@
+"""
+Run data retention policies once from the command line.
+
+Same chunked, throttled purge/anonymize logic as the in-process scheduler
+(app/services/retention_service.py), for cron jobs or one-off backfills.
+
+Usage:
+    python scripts/run_retention.py --list
+    python scripts/run_retention.py --dry-run
+    python scripts/run_retention.py --policy move_request_ip --policy chat_messages
+    python scripts/run_retention.py --batch-size 5000 --max-runtime 3600
+    python scripts/run_retention.py --backfill --policy move_request_ip
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+import argparse
+
+from app.models.user import User  # noqa: F401 - relationship targets must be mapped
+from app.models.car import Car  # noqa: F401
+from app.models.user_tier import UserTier  # noqa: F401
+from app.services.retention_service import RetentionRunner
+
+def main():
+    parser = argparse.ArgumentParser(description="Purge or anonymize rows past their retention period")
+    parser.add_argument("--policy", action="append", help="Run only this policy (repeatable)")
+    parser.add_argument("--list", action="store_true", help="Show configured policies and exit")
+    parser.add_argument("--dry-run", action="store_true", help="Count matching rows without changing them")
+    parser.add_argument("--backfill", action="store_true",
+                        help="Walk resumable policies from their oldest row instead of RETENTION_LOOKBACK_DAYS before the cutoff")
+    parser.add_argument("--batch-size", type=int, help="Rows per chunk (default: RETENTION_BATCH_SIZE or 1000)")
+    parser.add_argument("--chunk-pause", type=float, help="Minimum seconds between chunks")
+    parser.add_argument("--max-runtime", type=float, help="Seconds per policy before stopping (default: RETENTION_MAX_RUNTIME or 300)")
+    args = parser.parse_args()
+
+    runner = RetentionRunner(batch_size=args.batch_size, chunk_pause=args.chunk_pause, max_runtime=args.max_runtime)
+
+    if args.list:
+        print("📋 Retention policies:")
+        for policy in runner.policies:
+            state = f"{policy.retention_days} days" if policy.enabled else "disabled"
+            column = f"{policy.model.__tablename__}.{policy.timestamp_column}"
+            print(f"   {policy.name:<22} {policy.action:<10} {column:<32} {state}")
+        return
+
+    unknown = set(args.policy or []) - {policy.name for policy in runner.policies}
+    if unknown:
+        parser.error(f"Unknown policy: {', '.join(sorted(unknown))}")
+
+    print(f"🧹 Running retention{' (dry run)' if args.dry_run else ''}...")
+    results = runner.run_all(names=args.policy, dry_run=args.dry_run, backfill=args.backfill)
+    if not results:
+        print("⏭️  Nothing ran (no enabled policies, or another instance holds the retention lock)")
+        return
+
+    failed = False
+    for result in results:
+        if "error" in result:
+            failed = True
+            print(f"   ❌ {result['policy']}: {result['error']}")
+            continue
+        verb = "would " + result["action"] if args.dry_run else result["action"]
+        status = "" if result["complete"] else "  (stopped at max runtime, rerun to continue)"
+        print(f"   {result['policy']:<22} {verb} {result['rows']:,} rows in {result['chunks']} chunks, {result['seconds']:.1f}s{status}")
+
+    if failed:
+        sys.exit(1)
+    print("✅ Retention run completed!")
+
+if __name__ == "__main__":
+    main()